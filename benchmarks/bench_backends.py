@@ -0,0 +1,41 @@
+# import libs
+import argparse
+# locals
+from pythermodb_settings.references.yaml_backends import available_backends, get_backend
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+from corpus import build_reference, best_of
+
+# --------------------------------------------------------------
+# SECTION: parse throughput per YAML backend
+# --------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare YAML parser backends on valid and invalid reference documents.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    print("available backends:", ", ".join(backends))
+    print("auto backend:", get_backend("auto").name)
+    for name in backends:
+        print(f"  {name}: {get_backend(name).capabilities()}")
+
+    print(f"\n{'rows':>8} {'KB':>8} {'backend':>10} {'case':>14} {'seconds':>10} {'MB/s':>8}")
+    for rows in args.rows:
+        text = build_reference(rows)
+        # an unterminated flow sequence on the last row: the parser fails at the end
+        broken = text.rstrip("\n")[:-1] + "\n"
+        size_mb = len(text.encode("utf-8")) / 1e6
+
+        for name in backends:
+            extractor = YAMLExtractor(backend=name)
+            cases = {
+                "parse": lambda: extractor._safe_yaml_parse(text),
+                "parse_error": lambda: extractor._safe_yaml_parse(broken),
+                "validate": lambda: extractor.validate_yaml(text),
+            }
+            for case, func in cases.items():
+                elapsed = best_of(args.repeat, func)
+                print(f"{rows:>8} {size_mb * 1e3:>8.1f} {name:>10} {case:>14} "
+                      f"{elapsed:>10.4f} {size_mb / elapsed:>8.2f}")
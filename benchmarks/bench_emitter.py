@@ -0,0 +1,59 @@
+# import libs
+import argparse
+import yaml
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from corpus import build_reference, best_of
+
+# --------------------------------------------------------------
+# SECTION: reference with an equation table
+# --------------------------------------------------------------
+
+
+def build_equation_reference(rows: int) -> dict:
+    """Parsed synthetic reference with data tables and an equation table."""
+    reference = yaml.safe_load(build_reference(rows))
+    tables = reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]
+    tables["vapor-pressure"]["EQUATIONS"] = {
+        "EQ-1": {
+            "BODY": [
+                "parms['A'] = args['A'] / 1",
+                "parms['B'] = args['B'] / 1",
+                "res['vapor-pressure | VaPr | Pa'] = math.exp(parms['A'] + parms['B'] / args['T'])",
+            ],
+            "BODY-INTEGRAL": None,
+            "BODY-FIRST-DERIVATIVE": None,
+            "BODY-SECOND-DERIVATIVE": None,
+            "ARGS": {"T": {"name": "temperature", "symbol": "T", "unit": "K"}},
+            "RETURNS": {"VaPr": {"name": "vapor-pressure", "symbol": "VaPr", "unit": "Pa"}},
+        }
+    }
+    return reference
+
+
+# --------------------------------------------------------------
+# SECTION: fast emitter vs YAML dumper
+# --------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare ReferenceEmitter with the flow-sequence YAML dumper.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fast = ComponentExtractor()
+    legacy = ComponentExtractor(fast_emitter=False)
+    print(f"{'rows':>8} {'KB':>10} {'dumper s':>10} {'emitter s':>10} {'speedup':>8} {'identical':>10}")
+    for rows in args.rows:
+        reference = build_equation_reference(rows)
+        # every table whole: only the dump is measured
+        filtered = fast._copy_table_path(reference)
+
+        expected = legacy._dump_yaml(filtered)
+        output = fast._dump_yaml(filtered)
+        size_mb = len(output.encode("utf-8")) / 1e6
+
+        dumper_s = best_of(args.repeat, lambda: legacy._dump_yaml(filtered))
+        emitter_s = best_of(args.repeat, lambda: fast._dump_yaml(filtered))
+        print(f"{rows:>8} {size_mb * 1e3:>10.1f} {dumper_s:>10.4f} {emitter_s:>10.4f} "
+              f"{dumper_s / emitter_s:>8.1f} {str(output == expected):>10}")
@@ -0,0 +1,91 @@
+# import libs
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+# locals
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+from corpus import SIZES, build_corpus
+
+# --------------------------------------------------------------
+# SECTION: strategies
+# --------------------------------------------------------------
+
+
+def strategies(extractor: YAMLExtractor) -> Dict[str, Callable[[str], Any]]:
+    """Benchmarked calls, each returning something whose length is the section count."""
+    return {
+        "extract/heuristic": lambda text: extractor.extract_yaml_sections(text, engine="heuristic"),
+        "extract/linear": lambda text: extractor.extract_yaml_sections(text, engine="linear"),
+        "extract/lazy": lambda text: extractor.extract_yaml_sections(text, lazy=True),
+        "extract_and_validate": lambda text: extractor.extract_and_validate(text)["sections"],
+        "validate_yaml": lambda text: [] if not extractor.validate_yaml(text)[0] else [text],
+    }
+
+
+def run_timed(func: Callable[[str], Any], text: str, repeat: int) -> Tuple[float, int]:
+    """Best wall-clock time over ``repeat`` runs and the number of sections found."""
+    best = float("inf")
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(func(text))
+        best = min(best, time.perf_counter() - start)
+    return best, found
+
+
+def peak_memory(func: Callable[[str], Any], text: str) -> float:
+    """Peak Python heap allocated during one run, in MB (input text excluded)."""
+    tracemalloc.start()
+    try:
+        func(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+# --------------------------------------------------------------
+# SECTION: throughput and memory per size and strategy
+# --------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Throughput (MB/s, sections/s) and peak memory of YAMLExtractor "
+                    "strategies on a deterministic mixed-format corpus.")
+    parser.add_argument("--sizes", nargs="+", default=["1KB", "10KB", "100KB", "1MB"],
+                        choices=list(SIZES), help="corpus sizes to run (up to 100MB)")
+    parser.add_argument("--strategies", nargs="+", default=None,
+                        help="subset of strategies to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=30.0,
+                        help="skip larger sizes for a strategy once one run takes longer")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the (slower) tracemalloc peak-memory run")
+    args = parser.parse_args()
+
+    extractor = YAMLExtractor()
+    funcs = strategies(extractor)
+    if args.strategies:
+        funcs = {name: funcs[name] for name in args.strategies}
+    too_slow = set()
+
+    print(f"{'size':>6} {'MB':>8} {'strategy':>22} {'seconds':>10} {'MB/s':>8} "
+          f"{'sections':>9} {'sections/s':>11} {'peak MB':>9}")
+    for label in args.sizes:
+        text = build_corpus(SIZES[label], seed=args.seed)
+        size_mb = len(text.encode("utf-8")) / 1e6
+        for name, func in funcs.items():
+            if name in too_slow:
+                print(f"{label:>6} {size_mb:>8.2f} {name:>22} {'skipped (exceeded --max-seconds)':>50}")
+                continue
+
+            # large inputs are timed once; repeating them only adds wall time
+            repeat = args.repeat if size_mb < 10 else 1
+            elapsed, found = run_timed(func, text, repeat)
+            peak = "-" if args.no_memory else f"{peak_memory(func, text):.1f}"
+            print(f"{label:>6} {size_mb:>8.2f} {name:>22} {elapsed:>10.4f} "
+                  f"{size_mb / elapsed:>8.2f} {found:>9} {found / elapsed:>11.0f} {peak:>9}")
+
+            if elapsed > args.max_seconds:
+                too_slow.add(name)
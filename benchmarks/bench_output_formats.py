@@ -0,0 +1,39 @@
+# import libs
+import argparse
+import yaml
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_formats import OUTPUT_FORMATS, load_reference_output
+from corpus import build_reference, best_of
+
+# --------------------------------------------------------------
+# SECTION: dump and load throughput per output format
+# --------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare dump and load throughput of filtered-reference output formats.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    extractor = ComponentExtractor()
+    print(f"{'rows':>8} {'format':>8} {'KB':>10} {'dump s':>10} {'load s':>10} "
+          f"{'dump MB/s':>10} {'load MB/s':>10}")
+    for rows in args.rows:
+        reference = yaml.safe_load(build_reference(rows))
+        # keep every other component so the filter itself is part of the dump
+        keys = [f"component {i}" for i in range(1, rows + 1, 2)]
+
+        for output_format in OUTPUT_FORMATS:
+            def dump():
+                return extractor.filter_components_from_data(
+                    reference, keys, output_format=output_format)
+
+            field = "yaml" if output_format == "yaml" else "output"
+            output = dump()[field]
+            size_mb = len(output if isinstance(output, bytes) else output.encode("utf-8")) / 1e6
+
+            dump_s = best_of(args.repeat, dump)
+            load_s = best_of(args.repeat, lambda: load_reference_output(output, output_format))
+            print(f"{rows:>8} {output_format:>8} {size_mb * 1e3:>10.1f} {dump_s:>10.4f} "
+                  f"{load_s:>10.4f} {size_mb / dump_s:>10.2f} {size_mb / load_s:>10.2f}")
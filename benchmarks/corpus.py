@@ -0,0 +1,162 @@
+# import libs
+import random
+import time
+from typing import Callable, Dict, List
+
+# --------------------------------------------------------------
+# SECTION: deterministic mixed-format corpus
+# --------------------------------------------------------------
+
+WORDS = (
+    "the model returns vapor pressure data for each component and the table "
+    "below lists the coefficients used in the correlation note that units are "
+    "given per column while the reference id must match the databook entry"
+).split()
+
+# NOTE: size labels accepted on the command line
+SIZES = {
+    "1KB": 1 << 10,
+    "10KB": 10 << 10,
+    "100KB": 100 << 10,
+    "1MB": 1 << 20,
+    "10MB": 10 << 20,
+    "100MB": 100 << 20,
+}
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(6, 18))
+    sentence = " ".join(words).capitalize()
+    # prose with colons is what trips the key/value heuristics
+    if rng.random() < 0.3:
+        sentence = sentence.replace(" ", ": ", 1)
+    return sentence + "."
+
+
+def _prose(rng: random.Random) -> List[str]:
+    return [" ".join(_sentence(rng) for _ in range(rng.randint(1, 4))), ""]
+
+
+def _markdown(rng: random.Random) -> List[str]:
+    lines = [f"## {_sentence(rng)[:-1]}", ""]
+    lines += [f"- {_sentence(rng)}" for _ in range(rng.randint(2, 5))]
+    lines += ["", "| Name | Value |", "|------|-------|"]
+    lines += [f"| item{i} | {rng.randint(1, 999)} |" for i in range(rng.randint(2, 4))]
+    return lines + [""]
+
+
+def _mapping(rng: random.Random, indent: str = "") -> List[str]:
+    lines = [f"{indent}settings_{rng.randint(0, 9999)}:"]
+    for i in range(rng.randint(2, 6)):
+        lines.append(f"{indent}  key_{i}: {rng.choice(['true', rng.randint(0, 99), 'text value'])}")
+    lines.append(f"{indent}  items: [{', '.join(str(rng.randint(0, 9)) for _ in range(4))}]")
+    return lines
+
+
+def _fenced(rng: random.Random) -> List[str]:
+    if rng.random() < 0.2:
+        return ["```python", "def f(x):", "    return x * 2", "```", ""]
+    tag = rng.choice(["yaml", "yml", ""])
+    return [f"```{tag}"] + _mapping(rng) + ["```", ""]
+
+
+def _markers(rng: random.Random) -> List[str]:
+    lines = ["---"] + _mapping(rng)
+    if rng.random() < 0.5:
+        lines.append("...")
+    return lines + [""]
+
+
+def _reference(rng: random.Random) -> List[str]:
+    lines = [
+        "REFERENCES:",
+        f"  CUSTOM-REF-{rng.randint(1, 99)}:",
+        f"    DATABOOK-ID: {rng.randint(1, 9)}",
+        "    TABLES:",
+        "      general-data:",
+        f"        TABLE-ID: {rng.randint(1, 9)}",
+        "        STRUCTURE:",
+        "          COLUMNS: [No.,Name,Formula,State,MW]",
+        "          SYMBOL: [None,None,None,None,MW]",
+        "          UNIT: [None,None,None,None,g/mol]",
+        "        VALUES:",
+    ]
+    for i in range(1, rng.randint(3, 30)):
+        lines.append(
+            f"          - [{i},'component {i}','C{i}H{2 * i + 2}','g',{rng.uniform(10, 500):.3f}]")
+    return lines + [""]
+
+
+# NOTE: segment generators and their relative weights
+SEGMENTS: Dict[str, Callable[[random.Random], List[str]]] = {
+    "prose": _prose,
+    "markdown": _markdown,
+    "fenced": _fenced,
+    "markers": _markers,
+    "block": lambda rng: _mapping(rng) + [""],
+    "reference": _reference,
+}
+WEIGHTS = (40, 15, 15, 8, 12, 10)
+
+
+def build_corpus(size: int, seed: int = 0) -> str:
+    """
+    Build a deterministic mixed-format document of roughly ``size`` characters.
+
+    The same ``size`` and ``seed`` always produce the same text. Segments mix
+    prose (some with colons), markdown, fenced blocks, ``---``/``...`` documents,
+    bare YAML blocks and reference-shaped YAML.
+    """
+    rng = random.Random(seed)
+    names = list(SEGMENTS)
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        segment = "\n".join(SEGMENTS[rng.choices(names, weights=WEIGHTS)[0]](rng)) + "\n"
+        parts.append(segment)
+        total += len(segment)
+    return "".join(parts)
+
+
+# --------------------------------------------------------------
+# SECTION: synthetic reference document
+# --------------------------------------------------------------
+
+
+def build_reference(rows: int) -> str:
+    """Build a reference-shaped YAML document with ``rows`` rows per table."""
+    lines: List[str] = [
+        "REFERENCES:",
+        "  CUSTOM-REF-1:",
+        "    DATABOOK-ID: 1",
+        "    TABLES:",
+    ]
+    for table_id, table_name in enumerate(("general-data", "vapor-pressure"), start=1):
+        lines += [
+            f"      {table_name}:",
+            f"        TABLE-ID: {table_id}",
+            "        DESCRIPTION:",
+            f"          Synthetic {table_name} table.",
+            "        STRUCTURE:",
+            "          COLUMNS: [No.,Name,Formula,State,A,B,C]",
+            "          SYMBOL: [None,None,None,None,A,B,C]",
+            "          UNIT: [None,None,None,None,1,1,1]",
+            "        VALUES:",
+        ]
+        for i in range(1, rows + 1):
+            lines.append(
+                f"          - [{i},'component {i}','C{i}H{2 * i}','g',"
+                f"{i * 1.5:.3f},{i * 0.25:.4f},{i % 7}]"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Return the best wall-clock time of ``repeat`` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
@@ -1,6 +1,16 @@
 from .main import extract_reference_components, check_reference_component_availability
+from .reference_cache import ReferenceCache, shared_reference_cache, configure_reference_cache
+from .sqlite_store import SQLiteReferenceStore, import_reference_to_sqlite
+from .reference_formats import load_reference_output, read_reference_output
 
 __all__ = [
     "extract_reference_components",
     "check_reference_component_availability",
+    "ReferenceCache",
+    "shared_reference_cache",
+    "configure_reference_cache",
+    "SQLiteReferenceStore",
+    "import_reference_to_sqlite",
+    "load_reference_output",
+    "read_reference_output",
 ]
@@ -1,13 +1,39 @@
 # import libs
 import logging
+import os
 import yaml
+from contextlib import closing
 from copy import deepcopy
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple, Set, Union, Literal
+from typing import List, Dict, Any, Optional, Tuple, Set, Union, Literal, Iterable
 from pythermodb_settings.utils import measure_time, set_component_id
 # locals
 from ..models import ComponentKey, Component
 from .yaml_extractor import YAMLExtractor
+from .extraction_cache import ExtractionCache, estimate_size, freeze, thaw
+from .reference_cache import ReferenceCache, bytes_digest
+from .reference_snapshot import SnapshotError, compiled_path, is_fresh, read_snapshot, write_snapshot
+from .sqlite_store import SQLiteReferenceStore, import_reference_to_sqlite
+from .reference_writer import LazyResult, atomic_open, write_atomic
+from .reference_formats import FORMAT_SUFFIXES, OutputFormat, check_output_format, dump_reference
+from .reference_emitter import (
+    BODY_KEYS,
+    YAML_WIDTH,
+    BlockSeq,
+    QuotedString,
+    ReferenceEmitter,
+    UnsupportedLayout,
+)
+from .reference_index import (
+    KEY_FIELDS,
+    ReferenceIndex,
+    build_key,
+    column_lookup,
+    get_column_value,
+    join_parts,
+    normalize_key,
+    row_fields,
+)
 
 # Prefer C-accelerated YAML loaders/dumpers when available
 try:
@@ -18,28 +44,40 @@ except ImportError:  # pragma: no cover - fallback when libyaml not present
 # NOTE: logger
 logger = logging.getLogger(__name__)
 
-# NOTE: custom sequence type to force block-style YAML for certain lists
-
-
-class BlockSeq(list):
-    """Marker list that should be emitted in block style (dash-prefixed lines)."""
-    pass
-
-# NOTE: helper type to force double-quoted scalars
-class QuotedString(str):
-    """Scalar that will be emitted with double quotes."""
-    pass
-
 
 class ComponentExtractor:
     """
     Extract component data from YAML reference text and rebuild a trimmed reference.
     """
 
-    def __init__(self, extractor: Optional[YAMLExtractor] = None):
+    def __init__(
+        self,
+        extractor: Optional[YAMLExtractor] = None,
+        cache: Optional[ExtractionCache] = None,
+        reference_cache: Optional[ReferenceCache] = None,
+        fast_emitter: bool = True
+    ):
+        """
+        Args:
+            extractor: YAML extractor used to locate the reference block.
+            cache: Memoize ``filter_components`` results in this cache, keyed by a
+                digest of the reference text and the filter options. Cached
+                ``data`` is read-only (see ``extraction_cache.freeze``).
+            reference_cache: Keep references read from files, with their
+                indexes, in this cache (e.g. ``shared_reference_cache()``) so a
+                file is only parsed again once it changes on disk.
+            fast_emitter: Write YAML output with ``ReferenceEmitter``, which
+                produces the same bytes as the YAML dumper several times faster
+                and falls back to the dumper for layouts it does not handle.
+        """
         self.extractor = extractor or YAMLExtractor()
+        self.cache = cache
+        self.reference_cache = reference_cache
         self._yaml_dumper = self._build_flow_seq_dumper()
+        self._emitter = ReferenceEmitter(self._yaml_dumper) if fast_emitter else None
         self._reference_data: Optional[Dict[str, Any]] = None
+        # NOTE: index of the most recently filtered reference
+        self._index: Optional[ReferenceIndex] = None
 
     @measure_time
     def filter_components_from_file(
@@ -54,40 +92,151 @@ class ComponentExtractor:
         renumber: bool = True,
         save_reference: bool = False,
         output_path: Optional[Union[str, Path]] = None,
+        stream: bool = False,
+        copy: bool = True,
+        stream_output: bool = False,
+        fsync: bool = False,
+        output_format: OutputFormat = 'yaml',
         **kwargs
     ) -> Dict[str, Any]:
         """
         Read a YAML reference file, filter components, and rebuild a smaller YAML string.
+
+        With ``stream=True`` the file is scanned line by line through
+        ``YAMLExtractor.iter_yaml_sections`` and reading stops at the first section
+        with a ``REFERENCES`` root, so the whole file is never held in memory.
+        With a ``reference_cache`` the parsed reference is taken from the cache
+        while the file is unchanged; ``data`` is then always a deep copy, since
+        the cached reference is shared by every caller. Without one the file is
+        parsed for this call and ``data`` is never copied (see ``copy`` in
+        ``filter_components``). ``stream_output``, ``fsync`` and
+        ``output_format`` have the same meaning as in ``filter_components``.
         """
         file_path = Path(path)
-        text = file_path.read_text(encoding="utf-8")
 
         # If save_reference is requested without an explicit path, auto-name alongside the source.
         derived_output = output_path
-        if save_reference and not derived_output:
+        if (save_reference or stream_output) and not derived_output:
+            suffix = FORMAT_SUFFIXES[check_output_format(output_format)]
             derived_output = file_path.with_name(
-                f"{file_path.stem}-filtered.yaml")
+                f"{file_path.stem}-filtered{suffix}")
+
+        if stream or self.reference_cache is not None:
+            key_inputs = self._collect_keys(
+                component_keys=component_keys,
+                components=components,
+                component_key=component_key,
+                separator_symbol=separator_symbol,
+                case=case
+            )
 
-        result = self.filter_components(
-            text,
-            component_keys=component_keys,
-            components=components,
-            component_key=component_key,
-            separator_symbol=separator_symbol,
-            case=case,
-            renumber=renumber,
-            save_reference=save_reference,
-            output_path=derived_output
-        )
+            reference_dict = self._reference_from_file(file_path, stream=stream)
+
+            result = self._build_filtered_result(
+                reference_dict,
+                key_inputs,
+                component_key,
+                separator_symbol=separator_symbol,
+                case=case,
+                renumber=renumber,
+                save_reference=save_reference,
+                output_path=derived_output,
+                # a cached reference is shared: never hand out its subtrees;
+                # one parsed for this call is not held by anyone else
+                copy=self.reference_cache is not None,
+                stream_output=stream_output,
+                fsync=fsync,
+                output_format=output_format
+            )
+        else:
+            text = file_path.read_text(encoding="utf-8")
+            result = self.filter_components(
+                text,
+                component_keys=component_keys,
+                components=components,
+                component_key=component_key,
+                separator_symbol=separator_symbol,
+                case=case,
+                renumber=renumber,
+                save_reference=save_reference,
+                output_path=derived_output,
+                copy=copy,
+                stream_output=stream_output,
+                fsync=fsync,
+                output_format=output_format
+            )
         result["source_path"] = str(file_path)
         return result
 
-    def load_ref(self, ref: Union[str, Path, Dict[str, Any]]) -> Dict[str, Any]:
+    def _reference_from_file(self, file_path: Path, stream: bool = False) -> Dict[str, Any]:
+        """Read the reference payload of a file, through ``reference_cache`` when set."""
+        if self.reference_cache is None:
+            return self._read_reference_file(file_path, stream=stream)
+
+        index = self.reference_cache.get(
+            file_path, lambda cached_path: self._read_reference_file(cached_path, stream=stream))
+        # reuse the cached index for the filtering that follows
+        self._index = index
+        return index.reference
+
+    def _read_reference_file(self, file_path: Path, stream: bool = False) -> Dict[str, Any]:
+        """
+        Parse the reference payload of a file.
+
+        With ``stream=True`` the file is scanned line by line and reading stops at
+        the first section with a ``REFERENCES`` root.
+        """
+        if not stream:
+            return self._find_reference_section(file_path.read_text(encoding="utf-8"))
+
+        with file_path.open("r", encoding="utf-8") as handle:
+            section = self.extractor.find_section(handle, root_key="REFERENCES")
+            if section is not None:
+                reference_dict = section["content"]
+            else:
+                handle.seek(0)
+                reference_dict = self._pick_reference_section(
+                    self.extractor.iter_yaml_sections(handle)
+                )
+        if reference_dict is None:
+            raise ValueError(
+                "No YAML section with a 'REFERENCES' root was found.")
+        return reference_dict
+
+    def load_ref(
+        self,
+        ref: Union[str, Path, Dict[str, Any]],
+        *,
+        use_mmap: bool = False,
+        use_compiled: bool = True
+    ) -> Dict[str, Any]:
         """
         Load and cache a reference from a path, YAML string, or already-parsed dict.
+
+        With ``use_mmap=True`` the reference must be a file path; the file is
+        memory-mapped, scanned for YAML blocks by byte offset, and only the block
+        holding the ``REFERENCES`` root is decoded and parsed.
+
+        With ``use_compiled=True`` (default) a file path that has a compiled
+        snapshot next to it (see ``compile_reference``) is loaded from the
+        snapshot, which is rebuilt first if the YAML changed since. Snapshots
+        are marshal payloads; one declaring another serializer (e.g. pickle) is
+        never decoded and is rebuilt from the YAML instead.
         """
         if isinstance(ref, dict):
             parsed = ref
+        elif (
+            use_compiled and not use_mmap
+            and (isinstance(ref, Path) or self._is_existing_path(ref))
+            and compiled_path(ref).exists()
+        ):
+            return self.load_compiled_reference(ref)
+        elif use_mmap:
+            with closing(self.extractor.iter_file_sections(ref)) as sections:
+                parsed = self._pick_reference_section(sections)
+            if parsed is None:
+                raise ValueError(
+                    "No YAML section with a 'REFERENCES' root was found.")
         else:
             if isinstance(ref, Path):
                 text = ref.read_text(encoding="utf-8")
@@ -104,8 +253,170 @@ class ComponentExtractor:
             raise ValueError("Loaded reference is not a mapping/dict.")
 
         self._reference_data = parsed
+        self._index = None
         return parsed
 
+    def compile_reference(
+        self,
+        src: Union[str, Path],
+        dst: Optional[Union[str, Path]] = None,
+        *,
+        variants: Optional[Iterable[Tuple[str, str, Optional[str]]]] = None
+    ) -> Path:
+        """
+        Parse a reference YAML file once and write a compiled binary snapshot.
+
+        The snapshot holds the parsed reference and its ``ReferenceIndex`` (row
+        fields and key postings) behind a versioned header that records the
+        source's modification time, size and digest. Loading it with
+        ``load_compiled_reference`` or ``load_ref`` skips YAML parsing entirely.
+
+        Args:
+            src: Reference YAML file.
+            dst: Snapshot path; defaults to ``<src>.refc`` next to the source.
+            variants: (component key, separator, case) combinations whose postings
+                are precomputed; defaults to every ``ComponentKey`` with separator
+                "-" and no case transformation.
+
+        Returns:
+            Path of the written snapshot.
+
+        Raises:
+            SnapshotError: The reference holds values a snapshot cannot store
+                (e.g. YAML dates).
+        """
+        src = Path(src)
+        dst = Path(dst) if dst else compiled_path(src)
+        self._compile_reference(src, dst, variants)
+        return dst
+
+    def load_compiled_reference(
+        self,
+        src: Union[str, Path],
+        dst: Optional[Union[str, Path]] = None,
+        *,
+        rebuild: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load a reference from its compiled snapshot and cache it like ``load_ref``.
+
+        Args:
+            src: Reference YAML file the snapshot was compiled from.
+            dst: Snapshot path; defaults to ``<src>.refc`` next to the source.
+            rebuild: Recompile the snapshot when it is missing, stale (the YAML
+                changed) or unreadable; otherwise raise ``SnapshotError``. A
+                reference that cannot be compiled (e.g. it holds YAML dates) is
+                then loaded from the YAML without writing a snapshot.
+
+        Returns:
+            Parsed reference dict.
+        """
+        src = Path(src)
+        dst = Path(dst) if dst else compiled_path(src)
+
+        index = None
+        if is_fresh(src, dst):
+            try:
+                reference, state = read_snapshot(dst)
+                index = ReferenceIndex.from_state(reference, state)
+            except ValueError as e:
+                if not rebuild:
+                    raise
+                logger.warning("Rebuilding compiled reference %s: %s", dst, e)
+        elif not rebuild:
+            raise SnapshotError(f"Compiled reference {dst} is missing or stale.")
+
+        if index is None:
+            index = self._compile_reference(src, dst, strict=False)
+
+        self._reference_data = index.reference
+        self._index = index
+        return index.reference
+
+    def _compile_reference(
+        self,
+        src: Path,
+        dst: Path,
+        variants: Optional[Iterable[Tuple[str, str, Optional[str]]]] = None,
+        strict: bool = True
+    ) -> ReferenceIndex:
+        """
+        Parse ``src``, index it and write the snapshot to ``dst``.
+
+        With ``strict=False`` a reference the snapshot cannot store is indexed
+        and returned without writing ``dst``.
+        """
+        stat = os.stat(src)
+        data = src.read_bytes()
+        reference = self._parse_reference_text(data.decode("utf-8"))
+
+        index = ReferenceIndex(reference)
+        if variants is None:
+            variants = [(component_key, "-", None) for component_key in KEY_FIELDS]
+        for component_key, separator_symbol, case in variants:
+            index.postings(component_key, separator_symbol, case)
+
+        try:
+            write_snapshot(
+                dst,
+                reference,
+                index.export_state(),
+                (stat.st_mtime_ns, stat.st_size),
+                bytes_digest(data)
+            )
+        except SnapshotError as e:
+            if strict:
+                raise
+            logger.warning("Loading %s without a compiled snapshot: %s", src, e)
+        return index
+
+    def import_to_sqlite(
+        self,
+        src: Union[str, Path],
+        db_path: Union[str, Path],
+        *,
+        variants: Optional[Iterable[Tuple[str, str, Optional[str]]]] = None
+    ) -> SQLiteReferenceStore:
+        """
+        Load a reference YAML file into a SQLite database and open it as a store.
+
+        The returned ``SQLiteReferenceStore`` can be passed to
+        ``filter_components_from_data`` and ``check_component_availability`` in
+        place of a parsed reference (see ``import_reference_to_sqlite``).
+
+        Args:
+            src: Reference YAML file.
+            db_path: Database file to create (replaced if it exists).
+            variants: (component key, separator, case) combinations to index.
+        """
+        src = Path(src)
+        reference = self._parse_reference_text(src.read_text(encoding="utf-8"))
+        import_reference_to_sqlite(reference, db_path, variants=variants)
+        return SQLiteReferenceStore(db_path)
+
+    def _parse_reference_text(self, text: str) -> Dict[str, Any]:
+        """Parse a reference document, locating the REFERENCES block if the text is not plain YAML."""
+        try:
+            parsed = yaml.load(text, Loader=BaseSafeLoader)
+        except yaml.YAMLError:
+            parsed = None
+        if isinstance(parsed, dict) and "REFERENCES" in parsed:
+            return parsed
+        return self._find_reference_section(text)
+
+    def index_reference(self, reference: Dict[str, Any]) -> ReferenceIndex:
+        """
+        Return the key index of a parsed reference, building it on first use.
+
+        The index of the last reference seen is kept, so repeated calls with the
+        same dict (e.g. the one cached by ``load_ref``) reuse it. A reference
+        mutated in place after indexing must be indexed again by passing a new
+        dict or calling ``load_ref``.
+        """
+        if self._index is None or self._index.reference is not reference:
+            self._index = ReferenceIndex(reference)
+        return self._index
+
     def filter_components(
         self,
         reference_text: str,
@@ -117,7 +428,11 @@ class ComponentExtractor:
         case: Literal['lower', 'upper', None] = None,
         renumber: bool = True,
         save_reference: bool = False,
-        output_path: Optional[Union[str, Path]] = None
+        output_path: Optional[Union[str, Path]] = None,
+        copy: bool = True,
+        stream_output: bool = False,
+        fsync: bool = False,
+        output_format: OutputFormat = 'yaml'
     ) -> Dict[str, Any]:
         """
         Filter the reference by component identifiers and rebuild a smaller YAML string.
@@ -132,6 +447,22 @@ class ComponentExtractor:
             renumber: If True, re-number the ``No.`` column after filtering.
             save_reference: If True, write the rebuilt YAML to ``output_path``.
             output_path: Destination path to save the YAML when ``save_reference`` is True.
+            copy: Return ``data`` as an independent copy the caller owns
+                (default) when it would otherwise share subtrees with a
+                reference kept by ``cache``. The reference parsed from
+                ``reference_text`` for this call is held by no one else, so its
+                filtered ``data`` is returned without copying either way. With
+                False, cached results share one read-only ``data`` mapping.
+            stream_output: Dump the YAML straight into ``output_path`` (implies
+                saving) instead of building the string first. The result is then
+                a ``LazyResult`` whose ``yaml`` and ``data`` are only built when read.
+            fsync: Flush the saved file to disk before returning. Saved files are
+                always written to a temporary file and renamed into place.
+            output_format: 'yaml' (default), 'json', 'jsonl' (one VALUES row per
+                line) or 'binary' (versioned marshal payload). For formats other than
+                YAML the rendering is returned under ``output`` instead of
+                ``yaml``, with a ``format`` field; read it back with
+                ``load_reference_output`` / ``read_reference_output``.
 
         Returns:
             Dict with the filtered data, rendered YAML string, and match bookkeeping.
@@ -144,61 +475,83 @@ class ComponentExtractor:
             case=case
         )
 
-        sections = self.extractor.extract_yaml_sections(reference_text)
-        if not sections:
-            raise ValueError(
-                "No YAML sections were found in the provided text.")
-
-        reference_dict = self._pick_reference_section(sections)
-        if reference_dict is None:
-            raise ValueError(
-                "No YAML section with a 'REFERENCES' root was found.")
-
-        filtered, found = self._filter_reference_dict(
-            reference_dict,
-            key_inputs,
-            component_key,
-            separator_symbol=separator_symbol,
-            case_mode=case,
-            renumber=renumber
-        )
-
-        formatted = self._format_for_dump(filtered)
+        if self.cache is None:
+            reference_dict = self._find_reference_section(reference_text)
+
+            # the reference was parsed for this call: its subtrees are not shared
+            return self._build_filtered_result(
+                reference_dict,
+                key_inputs,
+                component_key,
+                separator_symbol=separator_symbol,
+                case=case,
+                renumber=renumber,
+                save_reference=save_reference,
+                output_path=output_path,
+                copy=False,
+                stream_output=stream_output,
+                fsync=fsync,
+                output_format=output_format
+            )
 
-        yaml_str = yaml.dump(
-            formatted,
-            Dumper=self._yaml_dumper,
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            width=10_000  # keep long flow-style sequences on a single line
+        check_output_format(output_format)
+        field = self._output_field(output_format)
+        key = self.cache.make_key(
+            'filter',
+            reference_text,
+            (
+                tuple(key_inputs), component_key, separator_symbol, case, renumber, output_format,
+                self.extractor._cache_options(None)
+            )
         )
+        entry = self.cache.get(key)
+        if entry is None:
+            result = self._build_filtered_result(
+                self._find_reference_section(reference_text),
+                key_inputs,
+                component_key,
+                separator_symbol=separator_symbol,
+                case=case,
+                renumber=renumber,
+                save_reference=False,
+                output_path=None,
+                output_format=output_format
+            )
+            entry = freeze({
+                name: result[name] for name in ("data", field, "matched", "missing")
+            })
+            self.cache.put(key, entry, estimate_size(entry))
 
-        requested = {
-            self._normalize_key(cid, separator_symbol, case) for cid in key_inputs
-        }
-        missing = requested - found
-
-        saved_to = None
-        if save_reference:
+        if stream_output:
             if not output_path:
-                raise ValueError("save_reference=True requires output_path.")
-            path = Path(output_path)
-            path.write_text(yaml_str, encoding="utf-8")
-            saved_to = str(path)
+                raise ValueError("stream_output=True requires output_path.")
+            saved_to = self._save_output(entry[field], True, output_path, fsync=fsync)
+            return LazyResult(
+                self._result_fields(
+                    output_format,
+                    {field: entry[field]},
+                    list(entry["matched"]),
+                    list(entry["missing"]),
+                    saved_to
+                ),
+                {"data": lambda: thaw(entry["data"]) if copy else entry["data"]}
+            )
 
-        return {
-            "data": filtered,
-            "yaml": yaml_str,
-            "matched": sorted(found),
-            "missing": sorted(missing),
-            "saved_to": saved_to
-        }
+        return self._result_fields(
+            output_format,
+            {
+                "data": thaw(entry["data"]) if copy else entry["data"],
+                field: entry[field]
+            },
+            list(entry["matched"]),
+            list(entry["missing"]),
+            self._save_output(entry[field], save_reference, output_path, fsync=fsync)
+        )
 
     @measure_time
     def check_component_availability(
         self,
-        reference: Union[str, Path, Dict[str, Any]],
+        reference: Union[str, Path, Dict[str, Any], SQLiteReferenceStore],
         *,
         component_keys: Optional[List[str]] = None,
         components: Optional[List[Component]] = None,
@@ -212,7 +565,8 @@ class ComponentExtractor:
         Check whether requested components exist in a reference and return a summary.
 
         Args:
-            reference: YAML text, path to a YAML file, or already-parsed reference dict.
+            reference: YAML text, path to a YAML file, already-parsed reference dict,
+                or a ``SQLiteReferenceStore`` (checked with indexed queries).
             component_keys/components/component_key/etc: Same semantics as filter_components.
             renumber: Passed through to _filter_reference_dict when building matches (defaults to False to avoid rewriting IDs).
 
@@ -228,26 +582,14 @@ class ComponentExtractor:
             case=case
         )
 
-        # Load reference data from dict, YAML text, or file path.
-        if isinstance(reference, dict):
-            reference_dict = deepcopy(reference)
+        # Load reference data from dict, YAML text, or file path. A dict is not
+        # copied: filtering copies it and the component lookup only reads it.
+        if isinstance(reference, (dict, SQLiteReferenceStore)):
+            reference_dict = reference
+        elif isinstance(reference, Path) or self._is_existing_path(reference):
+            reference_dict = self._reference_from_file(Path(reference))
         else:
-            if isinstance(reference, Path):
-                text = reference.read_text(encoding="utf-8")
-            else:
-                ref_path = Path(reference)
-                text = ref_path.read_text(
-                    encoding="utf-8") if ref_path.exists() else str(reference)
-
-            sections = self.extractor.extract_yaml_sections(text)
-            if not sections:
-                raise ValueError(
-                    "No YAML sections were found in the provided text.")
-
-            reference_dict = self._pick_reference_section(sections)
-            if reference_dict is None:
-                raise ValueError(
-                    "No YAML section with a 'REFERENCES' root was found.")
+            reference_dict = self._find_reference_section(str(reference))
 
         filtered_reference, found = self._filter_reference_dict(
             reference_dict,
@@ -293,7 +635,7 @@ class ComponentExtractor:
     @measure_time
     def filter_components_from_data(
         self,
-        reference_data: Optional[Union[Dict[str, Any], str]] = None,
+        reference_data: Optional[Union[Dict[str, Any], str, SQLiteReferenceStore]] = None,
         component_keys: Optional[List[str]] = None,
         *,
         components: Optional[List[Component]] = None,
@@ -303,14 +645,25 @@ class ComponentExtractor:
         renumber: bool = True,
         save_reference: bool = False,
         output_path: Optional[Union[str, Path]] = None,
+        copy: bool = True,
+        stream_output: bool = False,
+        fsync: bool = False,
+        output_format: OutputFormat = 'yaml',
         **kwargs
     ) -> Dict[str, Any]:
         """
         Fast-path filtering when the reference is already loaded/parsed (API-friendly).
 
         Args:
-            reference_data: Parsed reference dict (preferred) or YAML string. If None, use cached reference from load_ref().
+            reference_data: Parsed reference dict (preferred), ``SQLiteReferenceStore`` or YAML string. If None, use cached reference from load_ref().
             component_keys/components/component_key/etc: Same semantics as filter_components.
+            copy: Return ``data`` as a deep copy (default); False shares untouched
+                subtrees (STRUCTURE, EQUATIONS, and the rows when ``renumber``
+                is False) with ``reference_data``, so mutating ``data`` changes
+                it. A YAML string is parsed for this call and never copied.
+            stream_output/fsync: Stream the YAML to ``output_path`` and return a
+                ``LazyResult`` (see filter_components).
+            output_format: 'yaml', 'json', 'jsonl' or 'binary' (see filter_components).
         """
         key_inputs = self._collect_keys(
             component_keys=component_keys,
@@ -320,6 +673,91 @@ class ComponentExtractor:
             case=case
         )
 
+        parsed_reference = self._resolve_reference_data(reference_data)
+
+        return self._build_filtered_result(
+            parsed_reference,
+            key_inputs,
+            component_key,
+            separator_symbol=separator_symbol,
+            case=case,
+            renumber=renumber,
+            save_reference=save_reference,
+            output_path=output_path,
+            copy=copy and not isinstance(reference_data, str),
+            stream_output=stream_output,
+            fsync=fsync,
+            output_format=output_format
+        )
+
+    @measure_time
+    def filter_components_batch(
+        self,
+        reference_data: Optional[Union[Dict[str, Any], str, SQLiteReferenceStore]],
+        queries: Iterable[Iterable[Union[str, Component]]],
+        *,
+        component_key: ComponentKey = "Name",
+        separator_symbol: str = "-",
+        case: Literal['lower', 'upper', None] = None,
+        renumber: bool = True,
+        copy: bool = True,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter one reference for many component sets (e.g. mixtures) at once.
+
+        The reference is indexed once and every query is answered by key lookups,
+        so the total work grows with the reference rows plus the matches rather
+        than rows times queries. With ``copy=False`` results share row objects
+        with each other and with the reference wherever the output is
+        identical; with ``renumber=True`` each result gets its own renumbered rows.
+
+        Args:
+            reference_data: Parsed reference dict, ``SQLiteReferenceStore`` or YAML
+                string. If None, use cached reference from load_ref().
+            queries: Component sets; each is an iterable of component keys
+                (str) and/or Component objects.
+            component_key/separator_symbol/case/renumber/copy: Same semantics
+                as filter_components, applied to every query.
+
+        Returns:
+            One result per query, in order, shaped like ``filter_components_from_data``.
+        """
+        parsed_reference = self._resolve_reference_data(reference_data)
+        if not isinstance(parsed_reference, SQLiteReferenceStore):
+            self.index_reference(parsed_reference)
+
+        # quoted rows and styled equations, reused by every result of the batch
+        format_memo: Dict[int, Tuple[Any, Any]] = {}
+        results = []
+        for query in queries:
+            items = list(query)
+            key_inputs = self._collect_keys(
+                component_keys=[item for item in items if isinstance(item, str)],
+                components=[item for item in items if isinstance(item, Component)],
+                component_key=component_key,
+                separator_symbol=separator_symbol,
+                case=case
+            )
+            results.append(self._build_filtered_result(
+                parsed_reference,
+                key_inputs,
+                component_key,
+                separator_symbol=separator_symbol,
+                case=case,
+                renumber=renumber,
+                save_reference=False,
+                output_path=None,
+                copy=copy,
+                format_memo=format_memo
+            ))
+        return results
+
+    def _resolve_reference_data(
+        self,
+        reference_data: Optional[Union[Dict[str, Any], str, SQLiteReferenceStore]]
+    ) -> Union[Dict[str, Any], SQLiteReferenceStore]:
+        """Return the reference to filter: given, parsed from YAML, or cached by load_ref()."""
         if reference_data is None:
             if self._reference_data is None:
                 raise ValueError(
@@ -330,12 +768,40 @@ class ComponentExtractor:
         else:
             parsed_reference = reference_data
 
-        if not isinstance(parsed_reference, dict):
+        if not isinstance(parsed_reference, (dict, SQLiteReferenceStore)):
             raise ValueError(
-                "reference_data must be a dict or YAML string yielding a dict.")
+                "reference_data must be a dict, a SQLiteReferenceStore or YAML string yielding a dict.")
+        return parsed_reference
 
+    def _build_filtered_result(
+        self,
+        reference_dict: Dict[str, Any],
+        key_inputs: List[str],
+        component_key: ComponentKey,
+        *,
+        separator_symbol: str,
+        case: Literal['lower', 'upper', None],
+        renumber: bool,
+        save_reference: bool,
+        output_path: Optional[Union[str, Path]],
+        copy: bool = False,
+        format_memo: Optional[Dict[int, Tuple[Any, Any]]] = None,
+        stream_output: bool = False,
+        fsync: bool = False,
+        output_format: OutputFormat = 'yaml'
+    ) -> Dict[str, Any]:
+        """
+        Filter a parsed reference, render it in ``output_format`` and optionally save it.
+
+        ``data`` shares every untouched subtree with ``reference_dict`` unless
+        ``copy`` is True; ``format_memo`` is passed on to ``_format_for_dump``
+        when the YAML dumper is used.
+        With ``stream_output`` the output is dumped straight into ``output_path``
+        and a ``LazyResult`` is returned. YAML formatting hints (quoted names,
+        block-style equation bodies) are only applied for 'yaml'.
+        """
         filtered, found = self._filter_reference_dict(
-            parsed_reference,
+            reference_dict,
             key_inputs,
             component_key,
             separator_symbol=separator_symbol,
@@ -343,56 +809,186 @@ class ComponentExtractor:
             renumber=renumber
         )
 
-        formatted = self._format_for_dump(filtered)
-
-        yaml_str = yaml.dump(
-            formatted,
-            Dumper=self._yaml_dumper,
-            sort_keys=False,
-            default_flow_style=False,
-            allow_unicode=True,
-            width=10_000
-        )
+        check_output_format(output_format)
+        field = self._output_field(output_format)
 
         requested = {
             self._normalize_key(cid, separator_symbol, case) for cid in key_inputs
         }
         missing = requested - found
 
-        saved_to = None
-        if save_reference:
+        if stream_output:
             if not output_path:
-                raise ValueError("save_reference=True requires output_path.")
+                raise ValueError("stream_output=True requires output_path.")
             path = Path(output_path)
-            path.write_text(yaml_str, encoding="utf-8")
-            saved_to = str(path)
+            mode = 'wb' if output_format == 'binary' else 'w'
+            with atomic_open(path, mode, fsync=fsync) as handle:
+                self._render(filtered, output_format, handle, format_memo)
+            return LazyResult(
+                self._result_fields(
+                    output_format, {}, sorted(found), sorted(missing), str(path)),
+                {
+                    "data": lambda: deepcopy(filtered) if copy else filtered,
+                    field: lambda: self._render(filtered, output_format)
+                }
+            )
 
-        return {
-            "data": filtered,
-            "yaml": yaml_str,
-            "matched": sorted(found),
-            "missing": sorted(missing),
-            "saved_to": saved_to
-        }
+        output = self._render(filtered, output_format, format_memo=format_memo)
+
+        return self._result_fields(
+            output_format,
+            {
+                "data": deepcopy(filtered) if copy else filtered,
+                field: output
+            },
+            sorted(found),
+            sorted(missing),
+            self._save_output(output, save_reference, output_path, fsync=fsync)
+        )
+
+    @staticmethod
+    def _output_field(output_format: OutputFormat) -> str:
+        """Result field holding the rendered reference ('yaml' keeps its historical name)."""
+        return "yaml" if output_format == 'yaml' else "output"
+
+    @staticmethod
+    def _result_fields(
+        output_format: OutputFormat,
+        fields: Dict[str, Any],
+        matched: List[str],
+        missing: List[str],
+        saved_to: Optional[str]
+    ) -> Dict[str, Any]:
+        """Complete a filter result; non-YAML results also record their ``format``."""
+        result = dict(fields)
+        if output_format != 'yaml':
+            result["format"] = output_format
+        result.update({"matched": matched, "missing": missing, "saved_to": saved_to})
+        return result
+
+    def _render(
+        self,
+        reference: Dict[str, Any],
+        output_format: OutputFormat,
+        stream: Optional[Any] = None,
+        format_memo: Optional[Dict[int, Tuple[Any, Any]]] = None
+    ) -> Optional[Union[str, bytes]]:
+        """Serialize a filtered reference, into ``stream`` when given."""
+        if output_format == 'yaml':
+            return self._dump_yaml(reference, stream, format_memo)
+        return dump_reference(reference, output_format, stream)
+
+    def _dump_yaml(
+        self,
+        reference: Dict[str, Any],
+        stream: Optional[Any] = None,
+        format_memo: Optional[Dict[int, Tuple[Any, Any]]] = None
+    ) -> Optional[str]:
+        """
+        Render a filtered reference to YAML, into ``stream`` when given.
 
-    def _pick_reference_section(self, sections: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Return the first parsed section that looks like a reference payload."""
+        ``ReferenceEmitter`` is tried first; references it does not handle are
+        formatted with ``_format_for_dump`` and dumped with the flow-sequence dumper.
+        """
+        if self._emitter is not None:
+            try:
+                return self._emitter.emit(reference, stream)
+            except UnsupportedLayout as e:
+                logger.debug(f"Falling back to the YAML dumper: {e}")
+
+        return yaml.dump(
+            self._format_for_dump(reference, format_memo),
+            stream,
+            Dumper=self._yaml_dumper,
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=YAML_WIDTH  # keep long flow-style sequences on a single line
+        )
+
+    def _save_output(
+        self,
+        output: Union[str, bytes],
+        save_reference: bool,
+        output_path: Optional[Union[str, Path]],
+        fsync: bool = False
+    ) -> Optional[str]:
+        """Write the rendered reference (atomically) when requested and return the saved path."""
+        if not save_reference:
+            return None
+        if not output_path:
+            raise ValueError("save_reference=True requires output_path.")
+        path = write_atomic(output_path, output, fsync=fsync)
+        return str(path)
+
+    def _find_reference_section(self, text: str) -> Dict[str, Any]:
+        """
+        Locate the reference payload in text.
+
+        The first block with a top-level ``REFERENCES`` key is returned as soon
+        as it is found; failing that all sections are extracted and the first
+        mapping is used as a fallback.
+        """
+        section = self.extractor.find_section(text, root_key="REFERENCES")
+        if section is not None:
+            return section["content"]
+
+        sections = self.extractor.extract_yaml_sections(text, lazy=True)
+        if not sections:
+            raise ValueError(
+                "No YAML sections were found in the provided text.")
+
+        reference_dict = self._pick_reference_section(sections)
+        if reference_dict is None:
+            raise ValueError(
+                "No YAML section with a 'REFERENCES' root was found.")
+        return reference_dict
+
+    def _is_existing_path(self, value: str) -> bool:
+        """Check if a string names an existing file (long YAML text is not a path)."""
+        try:
+            return Path(value).exists()
+        except (OSError, ValueError):
+            return False
+
+    def _pick_reference_section(self, sections: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Return the first parsed section that looks like a reference payload.
+
+        Sections are consumed in a single pass, so a lazy iterator stops at the
+        first ``REFERENCES`` section. Lazy sections whose peeked root keys lack
+        ``REFERENCES`` are only parsed if the fallback is needed. The content is
+        freshly parsed per call, so it is returned without copying.
+        """
+        fallback = None
+        deferred: List[Any] = []
         for section in sections:
+            root_keys = getattr(section, "root_keys", None)
+            if root_keys is not None and "REFERENCES" not in root_keys:
+                if fallback is None:
+                    deferred.append(section)
+                continue
+
             content = section.get("content")
-            if isinstance(content, dict) and "REFERENCES" in content:
-                return deepcopy(content)
+            if not isinstance(content, dict):
+                continue
+            if "REFERENCES" in content:
+                return content
+            if fallback is None:
+                fallback = content
+                deferred.append(section)
 
         # Fallback: return first dict content if nothing matches the expected shape
-        for section in sections:
+        for section in deferred:
             content = section.get("content")
             if isinstance(content, dict):
-                return deepcopy(content)
+                return content
 
         return None
 
     def _filter_reference_dict(
         self,
-        reference: Dict[str, Any],
+        reference: Union[Dict[str, Any], SQLiteReferenceStore],
         component_keys: List[str],
         component_key: ComponentKey,
         *,
@@ -400,51 +996,49 @@ class ComponentExtractor:
         case_mode: Literal['lower', 'upper', None],
         renumber: bool = True
     ) -> Tuple[Dict[str, Any], Set[str]]:
-        """Filter all table VALUE rows to only keep requested components."""
+        """
+        Filter all table VALUE rows to only keep requested components.
+
+        Matching rows are looked up in the reference's ``ReferenceIndex``, so the
+        match cost grows with the number of requested keys, not the table sizes.
+        The reference is not copied: only the REFERENCES/TABLES containers and
+        the VALUES lists are new, everything else is shared with ``reference``.
+        A ``SQLiteReferenceStore`` is queried instead, reading only matched rows.
+        """
         normalized_targets = {
             self._normalize_key(cid, separator_symbol, case_mode) for cid in component_keys
         }
-        filtered = deepcopy(reference)
-        found: Set[str] = set()
+        if isinstance(reference, SQLiteReferenceStore):
+            index = reference
+            filtered = reference.skeleton()
+        else:
+            index = self.index_reference(reference)
+            filtered = self._copy_table_path(reference)
+        matches, found = index.match(
+            normalized_targets, component_key, separator_symbol, case_mode)
 
         references = filtered.get("REFERENCES", {})
-        for ref_name, ref_body in references.items():
-            tables = ref_body.get("TABLES", {})
-            for table_name, table in tables.items():
-                values = table.get("VALUES")
-                structure = table.get("STRUCTURE", {}) or {}
-                columns = structure.get("COLUMNS") or []
+        for table_id in index.tables:
+            ref_name, table_name = table_id
+            table = references[ref_name]["TABLES"][table_name]
+            columns = index.columns(table_id)
 
-                if not values or not isinstance(values, list):
-                    continue
+            filtered_rows: List[Any] = index.rows(table_id, matches.get(table_id, ()))
 
-                filtered_rows: List[Any] = []
-                for row in values:
-                    match_key = self._build_component_key(
-                        row,
-                        columns,
-                        component_key,
-                        separator_symbol,
-                        case_mode
-                    )
-                    if match_key and match_key in normalized_targets:
-                        filtered_rows.append(row)
-                        found.add(match_key)
-
-                if renumber:
-                    filtered_rows = self._renumber_rows(filtered_rows, columns)
-
-                table["VALUES"] = filtered_rows
-                logger.debug(
-                    "Table %s/%s filtered to %d rows using key %s",
-                    ref_name, table_name, len(filtered_rows), component_key
-                )
+            if renumber:
+                filtered_rows = self._renumber_rows(filtered_rows, columns)
+
+            table["VALUES"] = filtered_rows
+            logger.debug(
+                "Table %s/%s filtered to %d rows using key %s",
+                ref_name, table_name, len(filtered_rows), component_key
+            )
 
         return filtered, found
 
     def _collect_components_by_key(
         self,
-        reference: Dict[str, Any],
+        reference: Union[Dict[str, Any], SQLiteReferenceStore],
         *,
         matched_keys: Set[str],
         requested_keys: List[str],
@@ -455,34 +1049,19 @@ class ComponentExtractor:
         """Build Component objects for rows matching the requested keys."""
         components_by_key: Dict[str, Component] = {}
 
-        references = reference.get("REFERENCES", {}) or {}
-        for ref_body in references.values():
-            tables = ref_body.get("TABLES", {}) or {}
-            for table in tables.values():
-                structure = table.get("STRUCTURE", {}) or {}
-                columns = structure.get("COLUMNS") or []
-                values = table.get("VALUES") or []
-
-                if not values or not isinstance(values, list):
-                    continue
-
-                column_lookup = {str(col).lower(): idx for idx,
-                                 col in enumerate(columns)}
-
-                for row in values:
-                    key = self._build_component_key(
-                        row,
-                        columns,
-                        component_key,
-                        separator_symbol,
-                        case_mode
-                    )
-                    if not key or key not in matched_keys or key in components_by_key:
-                        continue
-
-                    component = self._row_to_component(row, column_lookup)
-                    if component:
-                        components_by_key[key] = component
+        index = (
+            reference if isinstance(reference, SQLiteReferenceStore)
+            else self.index_reference(reference)
+        )
+        postings = index.lookup(matched_keys, component_key, separator_symbol, case_mode)
+        for key, hits in postings.items():
+            # first row (in document order) that yields a valid Component
+            for posting in hits:
+                component = self._row_to_component(
+                    index.row(posting), index.column_lookup(posting[:2]))
+                if component:
+                    components_by_key[key] = component
+                    break
 
         ordered_components: List[Component] = []
         for req_key in requested_keys:
@@ -539,43 +1118,16 @@ class ComponentExtractor:
         case_mode: Literal['lower', 'upper', None]
     ) -> Optional[str]:
         """Construct a comparable component key from a VALUES row."""
-        column_lookup = {str(col).lower(): idx for idx,
-                         col in enumerate(columns)}
-        name = self._get_column_value(row, column_lookup.get("name"))
-        formula = self._get_column_value(row, column_lookup.get("formula"))
-        state = self._get_column_value(row, column_lookup.get("state"))
-
-        builders = {
-            "Name": lambda: name,
-            "Formula": lambda: formula,
-            "Name-State": lambda: self._join_parts([name, state], separator_symbol),
-            "Formula-State": lambda: self._join_parts([formula, state], separator_symbol),
-            "Name-Formula": lambda: self._join_parts([name, formula], separator_symbol),
-            "Name-Formula-State": lambda: self._join_parts([name, formula, state], separator_symbol),
-            "Formula-Name-State": lambda: self._join_parts([formula, name, state], separator_symbol),
-        }
-
-        builder = builders.get(component_key)
-        if not builder:
-            return None
-
-        result = builder()
-        return self._normalize_key(result, separator_symbol, case_mode) if result else None
+        fields = row_fields(row, column_lookup(columns))
+        return build_key(fields, component_key, separator_symbol, case_mode)
 
     def _get_column_value(self, row: Any, idx: Optional[int]) -> Optional[str]:
         """Safely read a cell value from a VALUES row."""
-        if idx is None:
-            return None
-
-        try:
-            return str(row[idx])
-        except (TypeError, IndexError):
-            return None
+        return get_column_value(row, idx)
 
     def _join_parts(self, parts: List[Optional[str]], sep: str) -> Optional[str]:
         """Join non-empty components with the provided separator."""
-        cleaned = [p.strip() for p in parts if p]
-        return sep.join(cleaned) if cleaned else None
+        return join_parts(parts, sep)
 
     def _renumber_rows(self, rows: List[Any], columns: List[str]) -> List[Any]:
         """Rewrite the No. column so filtered tables stay sequential."""
@@ -607,20 +1159,7 @@ class ComponentExtractor:
         case_mode: Literal['lower', 'upper', None] = None
     ) -> str:
         """Normalize identifiers for comparison (case-insensitive by default)."""
-        if value is None:
-            return ""
-        normalized = str(value).strip().replace("|", sep)
-        parts = [p.strip() for p in normalized.split(sep)]
-        normalized = sep.join(parts)
-        normalized = " ".join(normalized.split())
-
-        target_case = case_mode if case_mode is not None else 'lower'
-        if target_case == 'lower':
-            normalized = normalized.lower()
-        elif target_case == 'upper':
-            normalized = normalized.upper()
-
-        return normalized
+        return normalize_key(value, sep, case_mode)
 
     def _collect_keys(
         self,
@@ -688,32 +1227,96 @@ class ComponentExtractor:
         )
         return FlowSeqDumper
 
-    def _format_for_dump(self, reference: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply formatting hints (e.g., block lists) before YAML dumping."""
-        self._apply_block_style_to_equations(reference)
-        self._quote_component_fields(reference)
-        return reference
+    def _copy_table_path(self, reference: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Shallow-copy the REFERENCES -> reference -> TABLES -> table containers.
 
-    def _apply_block_style_to_equations(self, reference: Dict[str, Any]) -> None:
-        """Force equation BODY fields to use block-style YAML output."""
+        Table dicts in the copy can be given new entries (e.g. filtered VALUES)
+        without touching ``reference``; their values are shared with it.
+        """
+        copied = dict(reference)
+        references = reference.get("REFERENCES")
+        if not isinstance(references, dict):
+            return copied
+
+        copied_refs = {}
+        for ref_name, ref_body in references.items():
+            if isinstance(ref_body, dict) and isinstance(ref_body.get("TABLES"), dict):
+                ref_body = {
+                    **ref_body,
+                    "TABLES": {
+                        table_name: dict(table) if isinstance(table, dict) else table
+                        for table_name, table in ref_body["TABLES"].items()
+                    }
+                }
+            copied_refs[ref_name] = ref_body
+        copied["REFERENCES"] = copied_refs
+        return copied
+
+    def _format_for_dump(
+        self,
+        reference: Dict[str, Any],
+        memo: Optional[Dict[int, Tuple[Any, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply formatting hints (e.g., block lists) before YAML dumping.
+
+        Returns a copy of the table path; rows and equations that need a hint are
+        copied, so ``reference`` and the subtrees it shares are left unchanged.
+        ``memo`` maps ``id()`` of source rows and EQUATIONS to (source, formatted)
+        so calls sharing it also share the formatted copies.
+        """
+        memo = {} if memo is None else memo
+        formatted = self._copy_table_path(reference)
+        self._apply_block_style_to_equations(formatted, memo)
+        self._quote_component_fields(formatted, memo)
+        return formatted
+
+    def _apply_block_style_to_equations(
+        self,
+        reference: Dict[str, Any],
+        memo: Optional[Dict[int, Tuple[Any, Any]]] = None
+    ) -> None:
+        """Force equation BODY fields to use block-style YAML output (table dicts must be owned)."""
+        memo = {} if memo is None else memo
         references = reference.get("REFERENCES", {}) or {}
         for ref_body in references.values():
             tables = ref_body.get("TABLES", {}) or {}
             for table in tables.values():
                 equations = table.get("EQUATIONS", {}) or {}
-                for equation in equations.values():
-                    if not isinstance(equation, dict):
-                        continue
-                    for key in ("BODY", "BODY-INTEGRAL", "BODY-FIRST-DERIVATIVE", "BODY-SECOND-DERIVATIVE"):
-                        seq = equation.get(key)
-                        if isinstance(seq, list) and not isinstance(seq, BlockSeq):
-                            equation[key] = BlockSeq(seq)
+                cached = memo.get(id(equations))
+                if cached is not None and cached[0] is equations:
+                    table["EQUATIONS"] = cached[1]
+                    continue
 
-    def _quote_component_fields(self, reference: Dict[str, Any]) -> None:
+                styled = {}
+                changed = False
+                for name, equation in equations.items():
+                    if isinstance(equation, dict):
+                        bodies = {
+                            key: BlockSeq(equation[key]) for key in BODY_KEYS
+                            if isinstance(equation.get(key), list)
+                            and not isinstance(equation[key], BlockSeq)
+                        }
+                        if bodies:
+                            equation = {**equation, **bodies}
+                            changed = True
+                    styled[name] = equation
+                if changed:
+                    table["EQUATIONS"] = styled
+                memo[id(equations)] = (equations, table.get("EQUATIONS", {}))
+
+    def _quote_component_fields(
+        self,
+        reference: Dict[str, Any],
+        memo: Optional[Dict[int, Tuple[Any, Any]]] = None
+    ) -> None:
         """
         Force the first four component fields (Name, Formula, State, Formula-Raw)
         to be emitted with quotes to preserve spacing and capitalization.
+        Rows are copied before quoting (table dicts must be owned).
         """
+        memo = {} if memo is None else memo
         references = reference.get("REFERENCES", {}) or {}
         for ref_body in references.values():
             tables = ref_body.get("TABLES", {}) or {}
@@ -722,9 +1325,25 @@ class ComponentExtractor:
                 if not values or not isinstance(values, list):
                     continue
 
-                for row in values:
-                    if not isinstance(row, list):
-                        continue
-                    for idx in range(min(4, len(row))):
-                        if isinstance(row[idx], str):
-                            row[idx] = QuotedString(row[idx])
+                table["VALUES"] = [self._quote_row(row, memo) for row in values]
+
+    def _quote_row(self, row: Any, memo: Optional[Dict[int, Tuple[Any, Any]]] = None) -> Any:
+        """Return a row whose first four string cells are ``QuotedString``."""
+        if not isinstance(row, list):
+            return row
+        if memo is not None:
+            cached = memo.get(id(row))
+            if cached is not None and cached[0] is row:
+                return cached[1]
+            quoted = self._quote_row(row)
+            memo[id(row)] = (row, quoted)
+            return quoted
+
+        quoted = None
+        for idx in range(min(4, len(row))):
+            cell = row[idx]
+            if isinstance(cell, str) and not isinstance(cell, QuotedString):
+                if quoted is None:
+                    quoted = list(row)
+                quoted[idx] = QuotedString(cell)
+        return row if quoted is None else quoted
@@ -0,0 +1,182 @@
+# import libs
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Optional
+
+# NOTE: default limits of an ExtractionCache
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def freeze(value: Any) -> Any:
+    """
+    Return a read-only version of parsed YAML: mappings become ``MappingProxyType``
+    views and lists become tuples, recursively. Scalars are returned as is.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a value built by ``freeze`` (dicts and lists)."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a nested value, counting shared objects once."""
+    total = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (dict, MappingProxyType)):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return total
+
+
+class ExtractionCache:
+    """
+    Thread-safe LRU cache of extraction results keyed by a digest of the input text.
+
+    Entries are evicted least recently used first once either ``max_entries`` or
+    ``max_bytes`` is exceeded; an entry larger than ``max_bytes`` is not stored.
+    Stored values should be immutable (see ``freeze``) since every hit returns
+    the same object.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Args:
+            max_entries: Most entries kept at once.
+            max_bytes: Approximate memory budget of all entries together.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[bytes, Any]' = OrderedDict()
+        self._sizes: Dict[bytes, int] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, text: str, options: Hashable = ()) -> bytes:
+        """
+        Digest an input text together with the options that shape its result.
+
+        Args:
+            namespace: Kind of cached result (e.g. 'sections' or 'filter').
+            text: Input text.
+            options: Extractor options; their ``repr`` is part of the key.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        header = f"{namespace}\0{options!r}\0".encode('utf-8', 'surrogatepass')
+        digest.update(header)
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value and mark it recently used, or None on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: bytes, value: Any, size: Optional[int] = None) -> bool:
+        """
+        Store a value, evicting older entries as needed.
+
+        Args:
+            key: Key from ``make_key``.
+            value: Immutable result to store (not None).
+            size: Approximate memory held by the value; estimated when omitted.
+
+        Returns:
+            False when the value alone exceeds ``max_bytes`` and was not stored.
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+                self._evictions += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop every entry; statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # worker processes receive an empty cache with the same limits
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"ExtractionCache(entries={len(self._entries)}/{self.max_entries}, "
+            f"bytes={self._bytes}/{self.max_bytes})"
+        )
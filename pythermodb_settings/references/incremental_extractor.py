@@ -0,0 +1,142 @@
+# import libs
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional
+# locals
+from .yaml_extractor import SectionAssembler, YAMLExtractor
+
+
+class IncrementalYAMLExtractor:
+    """
+    Extract YAML sections from text that arrives in chunks (e.g. streamed model output).
+
+    Every complete line is classified exactly once; only the trailing partial
+    line and the lines of the currently open block are kept between chunks.
+    Sections are emitted as soon as the line that closes them arrives. The
+    extractor's ``time_budget`` covers the time spent processing chunks, not
+    the time spent waiting for them.
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[YAMLExtractor] = None,
+        deduplicate: bool = True,
+        root_key: Optional[str] = None
+    ):
+        """
+        Args:
+            extractor: Extractor used to parse closed blocks. Defaults to a new ``YAMLExtractor``.
+            deduplicate: Skip sections whose content fingerprint was already emitted.
+            root_key: Only emit blocks whose top-level mapping has this key.
+        """
+        self.extractor = extractor or YAMLExtractor()
+        # the clock only runs inside feed/close
+        self._tracker = self.extractor.budget.start()
+        self._tracker.pause()
+        self._assembler = SectionAssembler(
+            self.extractor, deduplicate=deduplicate, root_key=root_key, tracker=self._tracker)
+        # pieces of the current (not yet terminated) line
+        self._partial: List[str] = []
+        self.closed = False
+
+    @property
+    def line_count(self) -> int:
+        """Number of complete lines processed so far."""
+        return self._assembler.line_count
+
+    @property
+    def truncated(self) -> Optional[str]:
+        """Budget that cut the output short ('truncate' mode), else None."""
+        return self._tracker.truncated
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Process a chunk of text.
+
+        Args:
+            chunk: Next piece of the input; it may end in the middle of a line.
+
+        Returns:
+            Sections closed by the lines completed in this chunk.
+        """
+        if self.closed:
+            raise ValueError("Cannot feed a closed IncrementalYAMLExtractor.")
+
+        if '\n' not in chunk:
+            if chunk:
+                self._partial.append(chunk)
+            return []
+
+        lines = chunk.split('\n')
+        if self._partial:
+            self._partial.append(lines[0])
+            lines[0] = ''.join(self._partial)
+        # the last piece is the start of the next, unterminated line
+        tail = lines.pop()
+        self._partial = [tail] if tail else []
+
+        return self._push_lines(lines)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Flush the trailing partial line and close the open block.
+
+        Returns:
+            Sections closed by the end of the input.
+        """
+        if self.closed:
+            return []
+        self.closed = True
+
+        lines = [''.join(self._partial)] if self._partial else []
+        self._partial = []
+        sections = self._push_lines(lines)
+
+        self._tracker.resume()
+        try:
+            section = self._assembler.finish() if self._tracker.check_time() else None
+        finally:
+            self._tracker.pause()
+        if section is not None:
+            sections.append(section)
+        return sections
+
+    def feed_all(self, chunks: Iterable[str]) -> List[Dict[str, Any]]:
+        """Feed every chunk of an iterable, close, and return all sections."""
+        sections: List[Dict[str, Any]] = []
+        for chunk in chunks:
+            sections.extend(self.feed(chunk))
+        sections.extend(self.close())
+        return sections
+
+    async def stream(self, chunks: AsyncIterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Consume an async chunk source and yield sections as soon as they close.
+
+        Args:
+            chunks: Async iterable of text chunks (e.g. a streaming model response).
+
+        Yields:
+            Section dictionaries with the same keys as ``YAMLExtractor.iter_yaml_sections``
+        """
+        async for chunk in chunks:
+            for section in self.feed(chunk):
+                yield section
+        for section in self.close():
+            yield section
+
+    def _push_lines(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """Advance the assembler over complete lines and collect closed sections."""
+        assembler = self._assembler
+        tracker = self._tracker
+        sections: List[Dict[str, Any]] = []
+        tracker.resume()
+        try:
+            for line in lines:
+                # out of time or sections: later lines are dropped
+                if not tracker.check_time():
+                    break
+                section = assembler.push(line.rstrip('\r'))
+                if section is not None:
+                    sections.append(section)
+        finally:
+            tracker.pause()
+        return sections
@@ -5,6 +5,7 @@ from pathlib import Path
 # locals
 from ..models import Component, ComponentKey
 from .component_extractor import ComponentExtractor
+from .reference_cache import shared_reference_cache
 from ..utils import measure_time
 
 # NOTE: logger setup
@@ -21,6 +22,10 @@ def extract_reference_components(
     renumber: bool = True,
     save_reference: bool = False,
     output_path: Optional[Union[str, Path]] = None,
+    use_cache: bool = True,
+    stream_output: bool = False,
+    fsync: bool = False,
+    output_format: Literal['yaml', 'json', 'jsonl', 'binary'] = 'yaml',
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -44,6 +49,20 @@ def extract_reference_components(
         Whether to save the filtered reference to a file. Default is False.
     output_path : Optional[Union[str, Path]], optional
         Path to save the filtered reference file if save_reference is True. Default is None.
+    use_cache : bool, optional
+        Whether to keep the parsed reference in the process-wide reference cache
+        (see ``shared_reference_cache``), re-parsing the file only when it changes.
+        Default is True.
+    stream_output : bool, optional
+        Whether to dump the filtered reference straight into the output file
+        instead of building the YAML string in memory; ``yaml`` and ``data`` of
+        the result are then only built when accessed. Default is False.
+    fsync : bool, optional
+        Whether to flush the saved file to disk before returning. Default is False.
+    output_format : Literal['yaml', 'json', 'jsonl', 'binary'], optional
+        Format of the filtered reference. Formats other than YAML are returned
+        under ``output`` (and saved with that format) instead of ``yaml``.
+        Default is 'yaml'.
     **kwargs
         Additional keyword arguments.
         - mode : Literal['silent', 'log', 'attach'], optional
@@ -51,10 +70,13 @@ def extract_reference_components(
 
     Returns:
         Dict[str, any]: Dictionary containing matched components, missing components, and saved path if applicable.
+        The filtered ``data`` is a deep copy owned by the caller; it never shares
+        objects with the parsed (or cached) reference.
     """
     try:
         # NOTE: extractor instance
-        ce = ComponentExtractor()
+        ce = ComponentExtractor(
+            reference_cache=shared_reference_cache() if use_cache else None)
 
         # filter components from file
         result = ce.filter_components_from_file(
@@ -66,6 +88,9 @@ def extract_reference_components(
             renumber=renumber,
             save_reference=save_reference,
             output_path=output_path,
+            stream_output=stream_output,
+            fsync=fsync,
+            output_format=output_format,
         )
         return result
     except Exception as e:
@@ -83,6 +108,7 @@ def check_reference_component_availability(
     separator_symbol: str = "-",
     case: Literal['lower', 'upper'] | None = None,
     renumber: bool = False,
+    use_cache: bool = True,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -104,6 +130,9 @@ def check_reference_component_availability(
         Case transformation for component keys. Default is None.
     renumber : bool, optional
         Whether to renumber component IDs. Default is False.
+    use_cache : bool, optional
+        Whether to read a reference file through the process-wide reference cache.
+        Default is True.
     **kwargs
         Additional keyword arguments.
 
@@ -113,7 +142,8 @@ def check_reference_component_availability(
     """
     try:
         # NOTE: extractor instance
-        ce = ComponentExtractor()
+        ce = ComponentExtractor(
+            reference_cache=shared_reference_cache() if use_cache else None)
 
         # check component availability
         result = ce.check_component_availability(
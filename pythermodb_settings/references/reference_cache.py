@@ -0,0 +1,240 @@
+# import libs
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from weakref import WeakValueDictionary
+# locals
+from .extraction_cache import estimate_size
+from .reference_index import ReferenceIndex
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: default memory budget of a ReferenceCache
+DEFAULT_REFERENCE_CACHE_BYTES = 512 << 20
+
+# NOTE: how a cached file is validated: (mtime_ns, size)
+FileStamp = Tuple[int, int]
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Hex blake2b digest of a file's bytes."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bytes_digest(data: bytes) -> str:
+    """Hex blake2b digest of bytes already read (same value as ``file_digest``)."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class _Entry:
+    """One cached reference with the stamp it was loaded under."""
+
+    __slots__ = ('stamp', 'digest', 'index', 'nbytes')
+
+    def __init__(self, stamp: FileStamp, digest: Optional[str], index: ReferenceIndex, nbytes: int):
+        self.stamp = stamp
+        self.digest = digest
+        self.index = index
+        self.nbytes = nbytes
+
+
+class _KeyLock:
+    """Per-key load lock; weak-referenceable so idle locks are collected."""
+
+    __slots__ = ('_lock', '__weakref__')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> bool:
+        return self._lock.acquire()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._lock.release()
+
+
+class ReferenceCache:
+    """
+    Thread-safe, process-wide cache of parsed reference files and their indexes.
+
+    Entries are keyed by resolved path and a loader name, and validated on every
+    access against the file's modification time and size (and, with
+    ``hash_content``, a digest of its bytes). Least recently used entries are
+    evicted once the estimated size of all parsed references exceeds
+    ``max_bytes``. Cached references are shared between callers and must not be
+    mutated.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_REFERENCE_CACHE_BYTES,
+        hash_content: bool = False
+    ):
+        """
+        Args:
+            max_bytes: Approximate memory budget of all cached references.
+            hash_content: Also compare a digest of the file bytes on every access.
+                This reads the file (but does not parse it) and catches changes
+                that keep the modification time and size; a file whose stamp
+                changed but whose bytes did not is kept without re-parsing.
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self._entries: 'OrderedDict[Tuple[str, str], _Entry]' = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        # NOTE: one lock per key so concurrent misses on a file parse it once;
+        # a lock lives only while a caller holds a reference to it
+        self._key_locks: 'WeakValueDictionary[Tuple[str, str], Any]' = WeakValueDictionary()
+
+    def get(
+        self,
+        path: Union[str, Path],
+        loader: Callable[[Path], Dict[str, Any]],
+        loader_name: str = 'reference'
+    ) -> ReferenceIndex:
+        """
+        Return the index of a cached reference file, loading it on a miss.
+
+        Args:
+            path: Reference file path.
+            loader: Callable parsing the file into a reference dict.
+            loader_name: Name of the loader; files loaded by different loaders
+                are cached separately.
+
+        Returns:
+            ``ReferenceIndex`` whose ``reference`` attribute is the parsed reference.
+        """
+        file_path = Path(path).resolve()
+        key = (str(file_path), loader_name)
+
+        with self._lock:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = self._key_locks[key] = _KeyLock()
+
+        with key_lock:
+            stamp = self._stamp(file_path)
+            digest = file_digest(file_path) if self.hash_content else None
+
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._is_fresh(entry, stamp, digest):
+                    entry.stamp = stamp
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.index
+                if entry is not None:
+                    self._reloads += 1
+                    self._drop(key)
+                self._misses += 1
+
+            index = ReferenceIndex(loader(file_path))
+            nbytes = estimate_size(index.reference) + index.memory_size()
+            if nbytes > self.max_bytes:
+                logger.debug("Reference %s (%d bytes) exceeds the cache budget", file_path, nbytes)
+                return index
+
+            with self._lock:
+                self._entries[key] = _Entry(stamp, digest, index, nbytes)
+                self._bytes += nbytes
+                while self._bytes > self.max_bytes:
+                    old_key = next(iter(self._entries))
+                    self._drop(old_key)
+                    self._evictions += 1
+            return index
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> int:
+        """
+        Drop the cached entries of one file, or every entry.
+
+        Returns:
+            Number of entries dropped.
+        """
+        with self._lock:
+            if path is None:
+                keys = list(self._entries)
+            else:
+                resolved = str(Path(path).resolve())
+                keys = [key for key in self._entries if key[0] == resolved]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/reload counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'reloads': self._reloads,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _stamp(self, path: Path) -> FileStamp:
+        """Modification time and size of a file."""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_fresh(self, entry: _Entry, stamp: FileStamp, digest: Optional[str]) -> bool:
+        """Whether an entry still matches the file on disk."""
+        if self.hash_content:
+            return digest == entry.digest
+        return stamp == entry.stamp
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        """Remove an entry (caller holds the lock)."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ReferenceCache(entries={len(self._entries)}, bytes={self._bytes}/{self.max_bytes})"
+
+
+# NOTE: cache shared by the module-level reference functions
+_SHARED_CACHE: Optional[ReferenceCache] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_reference_cache() -> ReferenceCache:
+    """Return the process-wide ``ReferenceCache``, creating it on first use."""
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = ReferenceCache()
+        return _SHARED_CACHE
+
+
+def configure_reference_cache(
+    max_bytes: int = DEFAULT_REFERENCE_CACHE_BYTES,
+    hash_content: bool = False
+) -> ReferenceCache:
+    """Replace the process-wide ``ReferenceCache`` with one using these settings."""
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        _SHARED_CACHE = ReferenceCache(max_bytes=max_bytes, hash_content=hash_content)
+        return _SHARED_CACHE
@@ -0,0 +1,346 @@
+# import libs
+import logging
+import re
+import yaml
+from typing import IO, Any, Callable, Dict, List, Optional, Set
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+
+# NOTE: custom sequence type to force block-style YAML for certain lists
+class BlockSeq(list):
+    """Marker list that should be emitted in block style (dash-prefixed lines)."""
+    pass
+
+
+# NOTE: helper type to force double-quoted scalars
+class QuotedString(str):
+    """Scalar that will be emitted with double quotes."""
+    pass
+
+
+# NOTE: equation fields emitted as block-style lists
+BODY_KEYS = ("BODY", "BODY-INTEGRAL", "BODY-FIRST-DERIVATIVE", "BODY-SECOND-DERIVATIVE")
+
+# NOTE: line width passed to the YAML dumper (long flow rows stay on one line)
+YAML_WIDTH = 10_000
+
+# NOTE: strings every YAML emitter writes as plain scalars in block and flow
+# context, unless an implicit resolver claims them (e.g. 'yes', '1e3', 'null')
+_PLAIN_SAFE = re.compile(r'[A-Za-z0-9_(](?:[A-Za-z0-9 _.()/+^*=\-]*[A-Za-z0-9_.()/+^*=\-])?\Z')
+
+# NOTE: strings written inside double quotes without escapes
+_DOUBLE_SAFE = re.compile(r'[ !#-\[\]-~]*\Z')
+
+# NOTE: simple keys must be shorter than this (longer keys use '? ' syntax)
+_MAX_SIMPLE_KEY = 128
+
+# layout kinds tracked while walking a reference
+_ROOT = 'root'
+_REFERENCES = 'references'
+_REFERENCE = 'reference'
+_TABLES = 'tables'
+_TABLE = 'table'
+_VALUES = 'values'
+_EQUATIONS = 'equations'
+_EQUATION = 'equation'
+_BODY = 'body'
+
+# NOTE: kind of a mapping value, by (kind of the mapping, key); None for any key
+_CHILD_KINDS: Dict[tuple, str] = {
+    (_ROOT, "REFERENCES"): _REFERENCES,
+    (_REFERENCES, None): _REFERENCE,
+    (_REFERENCE, "TABLES"): _TABLES,
+    (_TABLES, None): _TABLE,
+    (_TABLE, "VALUES"): _VALUES,
+    (_TABLE, "EQUATIONS"): _EQUATIONS,
+    (_EQUATIONS, None): _EQUATION,
+    **{(_EQUATION, key): _BODY for key in BODY_KEYS},
+}
+
+# NOTE: layout levels formatting expects to be mappings (may be empty for the plural ones)
+_MAPPING_KINDS = (_REFERENCES, _REFERENCE, _TABLES, _TABLE, _EQUATIONS)
+
+
+class UnsupportedLayout(ValueError):
+    """Raised when a value needs a YAML construct ``ReferenceEmitter`` does not write."""
+    pass
+
+
+class ReferenceEmitter:
+    """
+    Write filtered references as YAML without PyYAML's per-node representers.
+
+    The output is byte-identical to dumping the reference, after
+    ``ComponentExtractor._format_for_dump``, with the flow-sequence dumper:
+    scalar-only lists are flow rows, the first four string cells of every
+    VALUES row are double-quoted and equation ``BODY*`` lists are block lists.
+    These rules are applied while walking the plain reference, so no
+    ``QuotedString``/``BlockSeq`` wrappers are built.
+
+    Scalars are written directly when their YAML form is known (plain-safe
+    strings, numbers, booleans, null); other strings are rendered once per
+    document by the dumper itself. Anything that would change the layout
+    (aliases, multi-line scalars, over-long lines or keys, unknown types)
+    raises ``UnsupportedLayout`` so the caller can fall back to the dumper.
+    """
+
+    def __init__(self, dumper: type, width: int = YAML_WIDTH):
+        """
+        Args:
+            dumper: YAML dumper class whose output is reproduced; used for the
+                implicit resolvers and to render uncommon scalars.
+            width: Line width given to the dumper.
+        """
+        self.dumper = dumper
+        self.width = width
+        self._resolvers = dumper.yaml_implicit_resolvers
+        self._wildcard = tuple(self._resolvers.get(None, ()))
+        self._inf = float('inf')
+
+    def emit(self, reference: Dict[str, Any], stream: Optional[IO[str]] = None) -> Optional[str]:
+        """
+        Render a filtered reference to YAML.
+
+        The whole document is laid out before anything is written, so nothing
+        reaches ``stream`` when ``UnsupportedLayout`` is raised.
+
+        Args:
+            reference: Filtered reference (plain or already formatted).
+            stream: Text handle to write to instead of returning a string.
+
+        Raises:
+            UnsupportedLayout: The reference needs output this emitter does not
+                produce; dump it with ``dumper`` instead.
+        """
+        if type(reference) is not dict:
+            raise UnsupportedLayout("Only mappings are emitted.")
+        if not reference:
+            lines = ["{}"]
+        else:
+            state = _EmitState()
+            self._mapping(reference, 0, None, _ROOT, state)
+            lines = state.lines
+            if max(map(len, lines)) > self.width:
+                raise UnsupportedLayout("A line exceeds the dumper width.")
+
+        if stream is None:
+            lines.append("")
+            return "\n".join(lines)
+        for line in lines:
+            stream.write(line)
+            stream.write("\n")
+        return None
+
+    # --------------------------------------------------------------
+    # SECTION: containers
+    # --------------------------------------------------------------
+
+    def _mapping(
+        self,
+        mapping: Dict[Any, Any],
+        indent: int,
+        first_prefix: Optional[str],
+        kind: Optional[str],
+        state: '_EmitState'
+    ) -> None:
+        """Write a non-empty block mapping; the first key follows ``first_prefix``."""
+        state.enter(mapping)
+        pad = " " * indent
+        prefix = pad if first_prefix is None else first_prefix
+        for key, value in mapping.items():
+            head = prefix + self._key(key, state) + ":"
+            prefix = pad
+            child = None
+            if kind is not None:
+                child = _CHILD_KINDS.get((kind, key)) or _CHILD_KINDS.get((kind, None))
+
+            value_type = type(value)
+            if child in _MAPPING_KINDS and value_type is not dict and (
+                    value or child in (_REFERENCE, _TABLE)):
+                raise UnsupportedLayout(f"Unexpected {child} value.")
+
+            if value_type is dict:
+                if not value:
+                    state.enter(value)
+                    state.lines.append(head + " {}")
+                else:
+                    state.lines.append(head)
+                    self._mapping(value, indent + 2, None, child, state)
+            elif value_type is list or value_type is BlockSeq:
+                self._sequence(value, indent, head + " ", child, state)
+            else:
+                state.lines.append(head + " " + self._scalar(value, False, state))
+
+    def _sequence(
+        self,
+        sequence: List[Any],
+        indent: int,
+        head: str,
+        kind: Optional[str],
+        state: '_EmitState'
+    ) -> None:
+        """Write a list after ``head`` (ending in a space): flow style, or an indentless block."""
+        state.enter(sequence)
+        if not sequence:
+            state.lines.append(head + "[]")
+            return
+
+        block = (
+            type(sequence) is BlockSeq
+            or kind == _BODY
+            or any(isinstance(item, (list, dict)) for item in sequence)
+        )
+        if not block:
+            state.lines.append(head + self._flow(sequence, False, state))
+            return
+
+        state.lines.append(head[:-1])
+        quote_fields = kind == _VALUES
+        prefix = " " * indent + "- "
+        for item in sequence:
+            item_type = type(item)
+            if item_type is dict:
+                if not item:
+                    state.enter(item)
+                    state.lines.append(prefix + "{}")
+                else:
+                    self._mapping(item, indent + 2, prefix, None, state)
+            elif item_type is list or item_type is BlockSeq:
+                state.enter(item)
+                if not item:
+                    state.lines.append(prefix + "[]")
+                elif item_type is BlockSeq or any(isinstance(cell, (list, dict)) for cell in item):
+                    raise UnsupportedLayout("Nested block sequences are not emitted.")
+                else:
+                    state.lines.append(prefix + self._flow(item, quote_fields, state))
+            else:
+                state.lines.append(prefix + self._scalar(item, False, state))
+
+    def _flow(self, items: List[Any], quote_fields: bool, state: '_EmitState') -> str:
+        """Render a scalar-only list as a flow sequence."""
+        parts = []
+        for idx, item in enumerate(items):
+            if quote_fields and idx < 4 and isinstance(item, str):
+                parts.append(self._quoted(item, state))
+            else:
+                parts.append(self._scalar(item, True, state))
+        return "[" + ", ".join(parts) + "]"
+
+    # --------------------------------------------------------------
+    # SECTION: scalars
+    # --------------------------------------------------------------
+
+    def _scalar(self, value: Any, flow: bool, state: '_EmitState') -> str:
+        """Render a scalar in block or flow context."""
+        value_type = type(value)
+        if value_type is str:
+            if _PLAIN_SAFE.match(value) and not self._resolves(value):
+                return value
+            return state.slow(('flow' if flow else 'block', value), self._render_slow)
+        if value_type is int:
+            return str(value)
+        if value_type is float:
+            return self._float(value)
+        if value_type is bool:
+            return "true" if value else "false"
+        if value is None:
+            return "null"
+        if value_type is QuotedString:
+            return self._quoted(value, state)
+        raise UnsupportedLayout(f"Values of type {value_type.__name__} are not emitted.")
+
+    def _key(self, key: Any, state: '_EmitState') -> str:
+        """Render a simple mapping key."""
+        if type(key) is str:
+            if len(key) >= _MAX_SIMPLE_KEY:
+                raise UnsupportedLayout("Long keys are not emitted.")
+            if _PLAIN_SAFE.match(key) and not self._resolves(key):
+                return key
+            return state.slow(('key', key), self._render_slow)
+        if type(key) is QuotedString:
+            raise UnsupportedLayout("Quoted keys are not emitted.")
+        return self._scalar(key, False, state)
+
+    def _quoted(self, value: str, state: '_EmitState') -> str:
+        """Render a string as a double-quoted scalar."""
+        if _DOUBLE_SAFE.match(value):
+            return '"' + value + '"'
+        return state.slow(('quoted', str(value)), self._render_slow)
+
+    def _float(self, value: float) -> str:
+        """Render a float exactly like ``SafeRepresenter.represent_float``."""
+        if value != value:
+            return ".nan"
+        if value == self._inf:
+            return ".inf"
+        if value == -self._inf:
+            return "-.inf"
+        text = repr(value).lower()
+        if "." not in text and "e" in text:
+            text = text.replace("e", ".0e", 1)
+        return text
+
+    def _resolves(self, value: str) -> bool:
+        """Whether an implicit resolver would read the plain string as another type."""
+        for _, regexp in self._resolvers.get(value[0], ()):
+            if regexp.match(value):
+                return True
+        for _, regexp in self._wildcard:
+            if regexp.match(value):
+                return True
+        return False
+
+    def _render_slow(self, context: str, value: str) -> str:
+        """Render one uncommon string through the dumper in the given context."""
+        if context == 'key':
+            text = self._dump({value: 0})
+            rendered, ok = text[:-4], text.endswith(": 0\n") and not text.startswith("? ")
+        elif context == 'block':
+            text = self._dump({"k": value})
+            rendered, ok = text[3:-1], text.startswith("k: ")
+        else:
+            item = QuotedString(value) if context == 'quoted' else value
+            text = self._dump([item])
+            rendered, ok = text[1:-2], text.startswith("[") and text.endswith("]\n")
+
+        if not ok or "\n" in rendered:
+            raise UnsupportedLayout("Multi-line scalars are not emitted.")
+        return rendered
+
+    def _dump(self, data: Any) -> str:
+        """Dump with the options ``ComponentExtractor`` uses."""
+        return yaml.dump(
+            data,
+            Dumper=self.dumper,
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=self.width
+        )
+
+
+class _EmitState:
+    """Lines written so far, containers seen, and strings rendered by the dumper."""
+
+    __slots__ = ('lines', 'seen', 'rendered')
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.seen: Set[int] = set()
+        self.rendered: Dict[tuple, str] = {}
+
+    def enter(self, container: Any) -> None:
+        """Record a container; a second visit would be dumped as an alias."""
+        key = id(container)
+        if key in self.seen:
+            raise UnsupportedLayout("Shared containers are dumped as aliases.")
+        self.seen.add(key)
+
+    def slow(self, key: tuple, render: Callable[[str, str], str]) -> str:
+        """Render a scalar through the dumper once per document."""
+        rendered = self.rendered.get(key)
+        if rendered is None:
+            rendered = self.rendered[key] = render(*key)
+        return rendered
@@ -0,0 +1,345 @@
+# import libs
+import io
+import json
+import logging
+import marshal
+import struct
+import yaml
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, Literal, Optional, Union
+
+# Prefer the C-accelerated YAML loader when available
+try:
+    from yaml import CSafeLoader as BaseSafeLoader
+except ImportError:  # pragma: no cover - fallback when libyaml not present
+    from yaml import SafeLoader as BaseSafeLoader
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: output formats of a filtered reference
+OutputFormat = Literal['yaml', 'json', 'jsonl', 'binary']
+OUTPUT_FORMATS = ('yaml', 'json', 'jsonl', 'binary')
+
+# NOTE: file suffix used when an output path is derived from the source
+FORMAT_SUFFIXES: Dict[str, str] = {
+    'yaml': '.yaml',
+    'json': '.json',
+    'jsonl': '.jsonl',
+    'binary': '.refb',
+}
+
+# NOTE: binary layout: magic, format version, marshal version, flags, then a
+# marshal payload; marshal only rebuilds plain values, so loading never runs code
+BINARY_MAGIC = b'PTDBOUT\0'
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct('<8sHBB')
+
+# NOTE: header flag set when dates and timestamps in the payload are tagged
+BINARY_FLAG_TAGGED = 1
+
+# NOTE: first item of the tuple a date or timestamp is tagged as (YAML never yields tuples)
+_DATE_TAG = "\x00date"
+_DATETIME_TAG = "\x00datetime"
+
+
+def check_output_format(output_format: str) -> str:
+    """
+    Validate an output format name.
+
+    Raises:
+        ValueError: The format is not one of ``OUTPUT_FORMATS``.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"output_format must be one of {', '.join(OUTPUT_FORMATS)}, got {output_format!r}.")
+    return output_format
+
+
+# --------------------------------------------------------------
+# SECTION: writers
+# --------------------------------------------------------------
+
+
+def dump_reference(
+    reference: Dict[str, Any],
+    output_format: OutputFormat,
+    stream: Optional[IO[Any]] = None
+) -> Optional[Union[str, bytes]]:
+    """
+    Serialize a filtered reference as JSON, JSON Lines or binary.
+
+    YAML is rendered by ``ComponentExtractor``, which applies the reference
+    formatting hints; it is not handled here.
+
+    Args:
+        reference: Filtered reference with a ``REFERENCES`` root.
+        output_format: 'json', 'jsonl' or 'binary'.
+        stream: Text (json, jsonl) or binary handle to write to.
+
+    Returns:
+        The serialized reference (str, or bytes for 'binary'), or None when
+        written to ``stream``.
+
+    Raises:
+        ValueError: Unknown format, or 'yaml'.
+    """
+    check_output_format(output_format)
+    if output_format == 'json':
+        return dump_json(reference, stream)
+    if output_format == 'jsonl':
+        return dump_jsonl(reference, stream)
+    if output_format == 'binary':
+        return dump_binary(reference, stream)
+    raise ValueError("YAML output is rendered by ComponentExtractor.")
+
+
+def dump_json(reference: Dict[str, Any], stream: Optional[IO[str]] = None) -> Optional[str]:
+    """
+    Serialize a reference as one JSON document.
+
+    Scalars JSON has no type for (e.g. dates) are written as strings.
+    """
+    options = {'ensure_ascii': False, 'default': str}
+    if stream is None:
+        return json.dumps(reference, **options)
+    json.dump(reference, stream, **options)
+    return None
+
+
+def iter_jsonl(reference: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield the JSON Lines records of a reference (without newlines).
+
+    Records, in document order:
+        - ``{"kind": "document", "body": {...}}``: top-level keys other than REFERENCES
+        - ``{"kind": "reference", "name": ..., "body": {...}}``: a reference without TABLES
+        - ``{"kind": "table", "name": ..., "body": {...}}``: a table without VALUES
+        - ``[...]``: one VALUES row of the preceding table
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+    document = {key: value for key, value in reference.items() if key != "REFERENCES"}
+    if document:
+        yield encoder.encode({"kind": "document", "body": document})
+
+    references = reference.get("REFERENCES", {}) or {}
+    for ref_name, ref_body in references.items():
+        tables = ref_body.get("TABLES", {}) or {}
+        body = {key: value for key, value in ref_body.items() if key != "TABLES"}
+        yield encoder.encode({"kind": "reference", "name": ref_name, "body": body})
+
+        for table_name, table in tables.items():
+            values = table.get("VALUES")
+            rows = values if isinstance(values, list) and values else []
+            body = {
+                key: value for key, value in table.items()
+                if not (key == "VALUES" and rows)
+            }
+            yield encoder.encode({"kind": "table", "name": table_name, "body": body})
+            for row in rows:
+                yield encoder.encode(row)
+
+
+def dump_jsonl(reference: Dict[str, Any], stream: Optional[IO[str]] = None) -> Optional[str]:
+    """Serialize a reference as JSON Lines, one VALUES row per line (see ``iter_jsonl``)."""
+    if stream is None:
+        return "".join(f"{line}\n" for line in iter_jsonl(reference))
+    for line in iter_jsonl(reference):
+        stream.write(line)
+        stream.write("\n")
+    return None
+
+
+def dump_binary(reference: Dict[str, Any], stream: Optional[IO[bytes]] = None) -> Optional[bytes]:
+    """
+    Serialize a reference as a versioned marshal payload.
+
+    Dates and timestamps, which marshal cannot store, are tagged (and the
+    header flags it) so they load back as the same types.
+
+    Raises:
+        ValueError: The reference holds values other than plain YAML types.
+    """
+    flags = 0
+    try:
+        payload = marshal.dumps(reference)
+    except ValueError:
+        payload = marshal.dumps(_tag_dates(reference))
+        flags |= BINARY_FLAG_TAGGED
+
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, marshal.version, flags)
+    if stream is None:
+        return header + payload
+    stream.write(header)
+    stream.write(payload)
+    return None
+
+
+def _tag_dates(value: Any) -> Any:
+    """Copy of a value with dates and timestamps replaced by tagged tuples."""
+    if isinstance(value, dict):
+        return {_tag_dates(key): _tag_dates(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_tag_dates(item) for item in value]
+    if isinstance(value, datetime):
+        return (_DATETIME_TAG, value.isoformat())
+    if isinstance(value, date):
+        return (_DATE_TAG, value.isoformat())
+    return value
+
+
+def _untag_dates(value: Any) -> Any:
+    """Restore the dates and timestamps tagged by ``_tag_dates`` (in place for containers)."""
+    if isinstance(value, dict):
+        items = [(_untag_dates(key), _untag_dates(item)) for key, item in value.items()]
+        value.clear()
+        value.update(items)
+        return value
+    if isinstance(value, list):
+        value[:] = [_untag_dates(item) for item in value]
+        return value
+    if isinstance(value, tuple) and len(value) == 2:
+        if value[0] == _DATETIME_TAG:
+            return datetime.fromisoformat(value[1])
+        if value[0] == _DATE_TAG:
+            return date.fromisoformat(value[1])
+    return value
+
+
+# --------------------------------------------------------------
+# SECTION: readers
+# --------------------------------------------------------------
+
+
+def load_reference_output(content: Union[str, bytes], output_format: OutputFormat) -> Dict[str, Any]:
+    """
+    Parse a filtered reference serialized in ``output_format``.
+
+    Raises:
+        ValueError: Unknown format, or content that is not a serialized reference.
+    """
+    check_output_format(output_format)
+    if output_format == 'binary':
+        if not isinstance(content, (bytes, bytearray, memoryview)):
+            raise ValueError("Binary references must be loaded from bytes.")
+        return load_binary(content)
+
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        content = bytes(content).decode('utf-8')
+    if output_format == 'yaml':
+        reference = yaml.load(content, Loader=BaseSafeLoader)
+    elif output_format == 'json':
+        reference = json.loads(content)
+    else:
+        reference = load_jsonl(io.StringIO(content))
+
+    if not isinstance(reference, dict):
+        raise ValueError(f"{output_format} content does not hold a reference mapping.")
+    return reference
+
+
+def load_jsonl(lines: Iterator[str]) -> Dict[str, Any]:
+    """
+    Rebuild a reference from the records written by ``dump_jsonl``.
+
+    Raises:
+        ValueError: A row precedes any table, or a record is not recognized.
+    """
+    reference: Dict[str, Any] = {}
+    references: Dict[str, Any] = {}
+    ref_body: Optional[Dict[str, Any]] = None
+    table: Optional[Dict[str, Any]] = None
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, list):
+            if table is None:
+                raise ValueError(f"Line {line_no}: row outside of a table.")
+            table.setdefault("VALUES", []).append(record)
+            continue
+
+        kind = record.get("kind") if isinstance(record, dict) else None
+        if kind == "document":
+            reference.update(record["body"])
+        elif kind == "reference":
+            ref_body = dict(record["body"])
+            ref_body["TABLES"] = {}
+            references[record["name"]] = ref_body
+            table = None
+        elif kind == "table" and ref_body is not None:
+            table = dict(record["body"])
+            ref_body["TABLES"][record["name"]] = table
+        else:
+            raise ValueError(f"Line {line_no}: unexpected record.")
+
+    reference["REFERENCES"] = references
+    return reference
+
+
+def load_binary(content: Union[bytes, bytearray, memoryview]) -> Dict[str, Any]:
+    """
+    Rebuild a reference written by ``dump_binary``.
+
+    The payload is decoded with marshal, which only builds plain values, so
+    content from any source can be loaded without running code.
+
+    Raises:
+        ValueError: Wrong magic, format or marshal version, or a corrupt payload.
+    """
+    view = memoryview(content)
+    if len(view) < BINARY_HEADER.size:
+        raise ValueError("Binary reference is truncated.")
+    magic, version, marshal_version, flags = BINARY_HEADER.unpack(view[:BINARY_HEADER.size])
+    if magic != BINARY_MAGIC:
+        raise ValueError("Content is not a binary reference.")
+    if version != BINARY_VERSION:
+        raise ValueError(
+            f"Binary reference has format version {version}, expected {BINARY_VERSION}.")
+    if marshal_version > marshal.version:
+        raise ValueError(
+            f"Binary reference uses marshal version {marshal_version}, "
+            f"this Python reads up to {marshal.version}.")
+
+    try:
+        reference = marshal.loads(view[BINARY_HEADER.size:])
+    except (EOFError, ValueError, TypeError) as e:
+        raise ValueError(f"Binary reference is corrupt: {e}") from e
+    if not isinstance(reference, dict):
+        raise ValueError("Binary content does not hold a reference mapping.")
+    if flags & BINARY_FLAG_TAGGED:
+        _untag_dates(reference)
+    return reference
+
+
+def read_reference_output(
+    path: Union[str, Path],
+    output_format: Optional[OutputFormat] = None
+) -> Dict[str, Any]:
+    """
+    Read a filtered reference saved by ``ComponentExtractor``.
+
+    Args:
+        path: Saved file.
+        output_format: Format of the file; inferred from its suffix when None.
+
+    Raises:
+        ValueError: The format cannot be inferred or the content is invalid.
+    """
+    path = Path(path)
+    if output_format is None:
+        by_suffix = {suffix: name for name, suffix in FORMAT_SUFFIXES.items()}
+        by_suffix['.yml'] = 'yaml'
+        output_format = by_suffix.get(path.suffix.lower())
+        if output_format is None:
+            raise ValueError(f"Cannot infer the output format of {path}; pass output_format.")
+
+    check_output_format(output_format)
+    if output_format == 'binary':
+        return load_binary(path.read_bytes())
+    if output_format == 'jsonl':
+        with open(path, 'r', encoding='utf-8') as handle:
+            return load_jsonl(handle)
+    return load_reference_output(path.read_text(encoding='utf-8'), output_format)
@@ -0,0 +1,297 @@
+# import libs
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple
+
+# NOTE: row fields (0 name, 1 formula, 2 state) each ComponentKey is built from, in order
+KEY_FIELDS: Dict[str, Tuple[int, ...]] = {
+    "Name": (0,),
+    "Formula": (1,),
+    "Name-State": (0, 2),
+    "Formula-State": (1, 2),
+    "Name-Formula": (0, 1),
+    "Name-Formula-State": (0, 1, 2),
+    "Formula-Name-State": (1, 0, 2),
+}
+
+# Table id = (reference name, table name)
+TableId = Tuple[str, str]
+
+# Posting = (reference name, table name, row index in VALUES)
+Posting = Tuple[str, str, int]
+
+# Row fields = (name, formula, state) as strings, or None when the column is missing
+RowFields = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def normalize_key(
+    value: Optional[str],
+    sep: str,
+    case_mode: Literal['lower', 'upper', None] = None
+) -> str:
+    """Normalize identifiers for comparison (case-insensitive by default)."""
+    if value is None:
+        return ""
+    normalized = str(value).strip().replace("|", sep)
+    parts = [p.strip() for p in normalized.split(sep)]
+    normalized = sep.join(parts)
+    normalized = " ".join(normalized.split())
+
+    target_case = case_mode if case_mode is not None else 'lower'
+    if target_case == 'lower':
+        normalized = normalized.lower()
+    elif target_case == 'upper':
+        normalized = normalized.upper()
+
+    return normalized
+
+
+def join_parts(parts: List[Optional[str]], sep: str) -> Optional[str]:
+    """Join non-empty components with the provided separator."""
+    cleaned = [p.strip() for p in parts if p]
+    return sep.join(cleaned) if cleaned else None
+
+
+def column_lookup(columns: List[Any]) -> Dict[str, int]:
+    """Map lowercase column names to their position."""
+    return {str(col).lower(): idx for idx, col in enumerate(columns)}
+
+
+def get_column_value(row: Any, idx: Optional[int]) -> Optional[str]:
+    """Safely read a cell value from a VALUES row."""
+    if idx is None:
+        return None
+
+    try:
+        return str(row[idx])
+    except (TypeError, IndexError):
+        return None
+
+
+def row_fields(row: Any, lookup: Dict[str, int]) -> RowFields:
+    """Read the name, formula and state cells of a VALUES row."""
+    return (
+        get_column_value(row, lookup.get("name")),
+        get_column_value(row, lookup.get("formula")),
+        get_column_value(row, lookup.get("state")),
+    )
+
+
+def build_key(
+    fields: RowFields,
+    component_key: str,
+    sep: str,
+    case_mode: Literal['lower', 'upper', None]
+) -> Optional[str]:
+    """Construct a comparable component key from the fields of a row."""
+    positions = KEY_FIELDS.get(component_key)
+    if positions is None:
+        return None
+
+    if len(positions) == 1:
+        result = fields[positions[0]]
+    else:
+        result = join_parts([fields[pos] for pos in positions], sep)
+    return normalize_key(result, sep, case_mode) if result else None
+
+
+class ReferenceIndex:
+    """
+    Inverted index from normalized component keys to VALUES rows of a parsed reference.
+
+    The name, formula and state cells of every row are read once when the index
+    is built. Postings for a (component key, separator, case) combination are
+    built on first use and kept, so later lookups cost one dictionary access per
+    requested key. The index does not follow later changes to the reference.
+    """
+
+    def __init__(self, reference: Dict[str, Any]):
+        """
+        Args:
+            reference: Parsed reference with a ``REFERENCES`` root.
+        """
+        self.reference = reference
+        # tables with a non-empty VALUES list, in document order
+        self.tables: List[TableId] = []
+        self._values: Dict[TableId, List[Any]] = {}
+        self._columns: Dict[TableId, List[Any]] = {}
+        self._lookups: Dict[TableId, Dict[str, int]] = {}
+        self._fields: Dict[TableId, List[RowFields]] = {}
+        self._postings: Dict[Tuple[str, str, Optional[str]], Dict[str, List[Posting]]] = {}
+        self.num_rows = 0
+
+        for table_id, values, columns in self._iter_tables(reference):
+            lookup = column_lookup(columns)
+            self.tables.append(table_id)
+            self._values[table_id] = values
+            self._columns[table_id] = columns
+            self._lookups[table_id] = lookup
+            self._fields[table_id] = [row_fields(row, lookup) for row in values]
+            self.num_rows += len(values)
+
+    @staticmethod
+    def _iter_tables(reference: Dict[str, Any]) -> Iterator[Tuple[TableId, List[Any], List[Any]]]:
+        """Yield (table id, VALUES, COLUMNS) of every table with a non-empty VALUES list."""
+        references = reference.get("REFERENCES", {}) or {}
+        for ref_name, ref_body in references.items():
+            tables = ref_body.get("TABLES", {}) or {}
+            for table_name, table in tables.items():
+                values = table.get("VALUES")
+                if not values or not isinstance(values, list):
+                    continue
+
+                structure = table.get("STRUCTURE", {}) or {}
+                columns = structure.get("COLUMNS") or []
+                yield (ref_name, table_name), values, columns
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Return the row fields and postings built so far as plain containers.
+
+        The state holds only dicts, lists, tuples and strings, so it can be
+        serialized with ``marshal`` next to the reference it was built from.
+        """
+        return {
+            'tables': list(self.tables),
+            'fields': [self._fields[table_id] for table_id in self.tables],
+            'postings': dict(self._postings)
+        }
+
+    @classmethod
+    def from_state(cls, reference: Dict[str, Any], state: Dict[str, Any]) -> 'ReferenceIndex':
+        """
+        Rebuild an index from ``export_state`` without reading the rows again.
+
+        Raises:
+            ValueError: The state does not describe the tables of ``reference``.
+        """
+        index = cls.__new__(cls)
+        index.reference = reference
+        index.tables = []
+        index._values = {}
+        index._columns = {}
+        index._lookups = {}
+        index._fields = {}
+        index._postings = dict(state['postings'])
+        index.num_rows = 0
+
+        tables = list(cls._iter_tables(reference))
+        if [table_id for table_id, _, _ in tables] != [tuple(t) for t in state['tables']]:
+            raise ValueError("Index state does not match the reference tables.")
+
+        for (table_id, values, columns), fields in zip(tables, state['fields']):
+            if len(fields) != len(values):
+                raise ValueError(f"Index state does not match table {table_id}.")
+            index.tables.append(table_id)
+            index._values[table_id] = values
+            index._columns[table_id] = columns
+            index._lookups[table_id] = column_lookup(columns)
+            index._fields[table_id] = fields
+            index.num_rows += len(values)
+        return index
+
+    def postings(
+        self,
+        component_key: str,
+        sep: str,
+        case_mode: Literal['lower', 'upper', None]
+    ) -> Dict[str, List[Posting]]:
+        """
+        Map every normalized key of one key variant to its rows, in document order.
+
+        Args:
+            component_key: ``ComponentKey`` variant.
+            sep: Separator joining key parts.
+            case_mode: Case applied to keys ('lower', 'upper', or None for lower).
+        """
+        variant = (component_key, sep, case_mode)
+        postings = self._postings.get(variant)
+        if postings is not None:
+            return postings
+
+        postings = {}
+        for table_id in self.tables:
+            ref_name, table_name = table_id
+            for row_idx, fields in enumerate(self._fields[table_id]):
+                key = build_key(fields, component_key, sep, case_mode)
+                if key:
+                    postings.setdefault(key, []).append((ref_name, table_name, row_idx))
+
+        self._postings[variant] = postings
+        return postings
+
+    def match(
+        self,
+        keys: Iterable[str],
+        component_key: str,
+        sep: str,
+        case_mode: Literal['lower', 'upper', None]
+    ) -> Tuple[Dict[TableId, List[int]], Set[str]]:
+        """
+        Look up normalized keys.
+
+        Returns:
+            Tuple of (sorted matching row indices per table, keys found).
+        """
+        postings = self.postings(component_key, sep, case_mode)
+        rows: Dict[TableId, List[int]] = {}
+        found: Set[str] = set()
+        for key in set(keys):
+            hits = postings.get(key)
+            if not hits:
+                continue
+            found.add(key)
+            for ref_name, table_name, row_idx in hits:
+                rows.setdefault((ref_name, table_name), []).append(row_idx)
+
+        for indices in rows.values():
+            indices.sort()
+        return rows, found
+
+    def lookup(
+        self,
+        keys: Iterable[str],
+        component_key: str,
+        sep: str,
+        case_mode: Literal['lower', 'upper', None]
+    ) -> Dict[str, List[Posting]]:
+        """Postings (in document order) of the normalized keys that are present."""
+        postings = self.postings(component_key, sep, case_mode)
+        return {key: postings[key] for key in set(keys) if key in postings}
+
+    def rows(self, table_id: TableId, indices: Iterable[int]) -> List[Any]:
+        """VALUES rows of a table at the given positions."""
+        values = self._values[table_id]
+        return [values[idx] for idx in indices]
+
+    def row(self, posting: Posting) -> Any:
+        """Return the VALUES row a posting points to."""
+        ref_name, table_name, row_idx = posting
+        return self._values[(ref_name, table_name)][row_idx]
+
+    def values(self, table_id: TableId) -> List[Any]:
+        """VALUES rows of an indexed table."""
+        return self._values[table_id]
+
+    def columns(self, table_id: TableId) -> List[Any]:
+        """COLUMNS of an indexed table."""
+        return self._columns[table_id]
+
+    def column_lookup(self, table_id: TableId) -> Dict[str, int]:
+        """Lowercase column name to position map of an indexed table."""
+        return self._lookups[table_id]
+
+    def memory_size(self) -> int:
+        """Approximate memory held by the index itself (the reference excluded)."""
+        row_size = sys.getsizeof((None, None, None))
+        total = sum(
+            sys.getsizeof(fields) + row_size * len(fields) for fields in self._fields.values())
+        for postings in self._postings.values():
+            total += sys.getsizeof(postings)
+            total += sum(
+                sys.getsizeof(key) + sys.getsizeof(hits) + row_size * len(hits)
+                for key, hits in postings.items()
+            )
+        return total
+
+    def __repr__(self) -> str:
+        return f"ReferenceIndex(tables={len(self.tables)}, rows={self.num_rows})"
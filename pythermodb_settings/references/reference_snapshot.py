@@ -0,0 +1,227 @@
+# import libs
+import logging
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+# locals
+from .reference_cache import file_digest
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: compiled reference file layout: header, then the serialized payload
+SNAPSHOT_MAGIC = b'PTDBREF\0'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.refc'
+
+# magic, format version, serializer, python major/minor, source mtime_ns,
+# source size, source blake2b digest (20 bytes), payload size
+SNAPSHOT_HEADER = struct.Struct('<8sHBBBxqq20sq')
+
+# NOTE: payload serializer; only marshal is written or read, so loading a
+# snapshot never runs code (serializer 1, pickle, is refused)
+SERIALIZER_MARSHAL = 0
+
+
+class SnapshotError(ValueError):
+    """Raised when a compiled reference file is missing, corrupt or incompatible."""
+    pass
+
+
+def compiled_path(src: Union[str, Path]) -> Path:
+    """Default location of a reference's compiled snapshot (next to the source)."""
+    src = Path(src)
+    return src.with_name(src.name + SNAPSHOT_SUFFIX)
+
+
+def write_snapshot(
+    dst: Union[str, Path],
+    reference: Dict[str, Any],
+    index_state: Dict[str, Any],
+    stamp: Tuple[int, int],
+    digest: str
+) -> Path:
+    """
+    Write a compiled snapshot of a parsed reference and its index state.
+
+    The file is written to a temporary name and renamed, so readers never see a
+    partial snapshot. The payload is serialized with marshal, which stores the
+    plain types YAML produces but not dates or timestamps.
+
+    Args:
+        dst: Snapshot file to write.
+        reference: Parsed reference.
+        index_state: ``ReferenceIndex.export_state()`` of the reference.
+        stamp: (mtime_ns, size) of the source file taken before it was read.
+        digest: Hex blake2b digest (``file_digest``) of the source bytes parsed.
+
+    Returns:
+        Path of the written snapshot.
+
+    Raises:
+        SnapshotError: The reference holds values marshal cannot store (e.g.
+            YAML dates); nothing is written.
+    """
+    dst = Path(dst)
+    try:
+        payload = marshal.dumps({'reference': reference, 'index': index_state})
+    except ValueError as e:
+        raise SnapshotError(f"Reference cannot be compiled to {dst}: {e}") from e
+
+    header = SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        SERIALIZER_MARSHAL,
+        sys.version_info[0],
+        sys.version_info[1],
+        stamp[0],
+        stamp[1],
+        bytes.fromhex(digest),
+        len(payload)
+    )
+
+    fd, tmp_name = tempfile.mkstemp(dir=dst.parent, prefix=f".{dst.name}.", suffix='.tmp')
+    tmp_path = Path(tmp_name)
+    try:
+        with open(fd, 'wb') as handle:
+            handle.write(header)
+            handle.write(payload)
+        os.replace(tmp_path, dst)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return dst
+
+
+def read_header(dst: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read and check the header of a compiled snapshot.
+
+    Raises:
+        SnapshotError: The file is not a snapshot of this format version or was
+            written by another Python version.
+    """
+    try:
+        with open(dst, 'rb') as handle:
+            raw = handle.read(SNAPSHOT_HEADER.size)
+    except OSError as e:
+        raise SnapshotError(f"Cannot read compiled reference {dst}: {e}") from e
+    return _unpack_header(raw, dst)
+
+
+def _unpack_header(raw: bytes, dst: Union[str, Path]) -> Dict[str, Any]:
+    """Decode a snapshot header."""
+    if len(raw) < SNAPSHOT_HEADER.size:
+        raise SnapshotError(f"Compiled reference {dst} is truncated.")
+
+    magic, version, serializer, major, minor, mtime_ns, size, digest, payload_size = \
+        SNAPSHOT_HEADER.unpack(raw[:SNAPSHOT_HEADER.size])
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"{dst} is not a compiled reference.")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"Compiled reference {dst} has format version {version}, expected {SNAPSHOT_VERSION}.")
+    if (major, minor) != sys.version_info[:2]:
+        raise SnapshotError(
+            f"Compiled reference {dst} was written by Python {major}.{minor}.")
+
+    return {
+        'serializer': serializer,
+        'mtime_ns': mtime_ns,
+        'size': size,
+        'digest': digest.hex(),
+        'payload_size': payload_size
+    }
+
+
+def read_snapshot(dst: Union[str, Path]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load a compiled snapshot written by ``write_snapshot``.
+
+    Only marshal payloads are accepted; a snapshot declaring any other
+    serializer is refused without decoding it.
+
+    Returns:
+        Tuple of (parsed reference, index state)
+
+    Raises:
+        SnapshotError: The file is missing, corrupt or incompatible.
+    """
+    try:
+        data = Path(dst).read_bytes()
+    except OSError as e:
+        raise SnapshotError(f"Cannot read compiled reference {dst}: {e}") from e
+
+    header = _unpack_header(data, dst)
+    payload = memoryview(data)[SNAPSHOT_HEADER.size:]
+    if len(payload) != header['payload_size']:
+        raise SnapshotError(f"Compiled reference {dst} is truncated.")
+
+    serializer = header['serializer']
+    if serializer != SERIALIZER_MARSHAL:
+        raise SnapshotError(
+            f"Compiled reference {dst} uses unsupported serializer {serializer}.")
+
+    try:
+        payload_obj = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError) as e:
+        raise SnapshotError(f"Compiled reference {dst} is corrupt: {e}") from e
+
+    if (
+        not isinstance(payload_obj, dict)
+        or not isinstance(payload_obj.get('reference'), dict)
+        or not isinstance(payload_obj.get('index'), dict)
+    ):
+        raise SnapshotError(f"Compiled reference {dst} does not hold a reference.")
+    return payload_obj['reference'], payload_obj['index']
+
+
+def is_fresh(src: Union[str, Path], dst: Union[str, Path]) -> bool:
+    """
+    Whether a snapshot matches its source file.
+
+    The source's modification time and size are compared first; when only the
+    modification time changed, the source bytes are hashed and compared, so a
+    touched but unchanged file keeps its snapshot. The snapshot header then
+    takes the new modification time, so later checks skip the hash again.
+    """
+    try:
+        header = read_header(dst)
+        stat = os.stat(src)
+    except (SnapshotError, OSError):
+        return False
+
+    if stat.st_size != header['size']:
+        return False
+    if stat.st_mtime_ns == header['mtime_ns']:
+        return True
+    if file_digest(src) != header['digest']:
+        return False
+
+    _restamp(dst, header, stat.st_mtime_ns)
+    return True
+
+
+def _restamp(dst: Union[str, Path], header: Dict[str, Any], mtime_ns: int) -> None:
+    """
+    Record a new source modification time in a snapshot header, in place.
+
+    The header is re-read from the open file and only rewritten if it is still
+    the one ``header`` describes, so a snapshot replaced in the meantime keeps
+    its own stamp. Failing to write (e.g. a read-only file) is not an error.
+    """
+    try:
+        with open(dst, 'r+b') as handle:
+            fields = list(SNAPSHOT_HEADER.unpack(handle.read(SNAPSHOT_HEADER.size)))
+            # mtime_ns, size and digest follow magic, version, serializer and python version
+            if (fields[5], fields[6], fields[7].hex()) != (header['mtime_ns'], header['size'], header['digest']):
+                return
+            fields[5] = mtime_ns
+            handle.seek(0)
+            handle.write(SNAPSHOT_HEADER.pack(*fields))
+    except (OSError, struct.error) as e:
+        logger.debug("Could not restamp compiled reference %s: %s", dst, e)
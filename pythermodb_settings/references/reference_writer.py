@@ -0,0 +1,158 @@
+# import libs
+import logging
+import os
+import tempfile
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Union
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: write buffer size of streamed outputs (bytes handed to the OS per write)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+@contextmanager
+def atomic_open(
+    path: Union[str, Path],
+    mode: str = 'w',
+    *,
+    fsync: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[IO[Any]]:
+    """
+    Open a temporary file next to ``path`` and rename it over ``path`` on success.
+
+    Writes go through a buffer of ``chunk_size`` bytes, so a dump streamed into
+    the handle reaches the disk in chunks. Readers never see a partial file; if
+    the block raises, the temporary file is removed and ``path`` is untouched.
+
+    Args:
+        path: Destination file.
+        mode: 'w' (text, UTF-8) or 'wb'.
+        fsync: Flush the file (and, on POSIX, its directory) to disk before
+            returning, so the new content survives a crash.
+        chunk_size: Write buffer size in bytes.
+
+    Raises:
+        ValueError: ``mode`` is not a write mode.
+    """
+    if mode not in ('w', 'wb'):
+        raise ValueError("mode must be 'w' or 'wb'")
+
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    tmp_path = Path(tmp_name)
+    encoding = 'utf-8' if mode == 'w' else None
+    try:
+        with open(fd, mode, buffering=chunk_size, encoding=encoding) as handle:
+            yield handle
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+        if fsync:
+            _fsync_dir(path.parent)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing its directory (not supported on Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(
+    path: Union[str, Path],
+    content: Union[str, bytes],
+    *,
+    fsync: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Path:
+    """Write text or bytes to ``path`` in chunks through ``atomic_open``."""
+    mode = 'wb' if isinstance(content, (bytes, bytearray)) else 'w'
+    with atomic_open(path, mode, fsync=fsync, chunk_size=chunk_size) as handle:
+        for start in range(0, len(content), chunk_size):
+            handle.write(content[start:start + chunk_size])
+    return Path(path)
+
+
+class LazyResult(MutableMapping):
+    """
+    Result mapping whose expensive fields are computed on first access.
+
+    Behaves like the plain result dicts returned elsewhere (keys iterate in
+    insertion order, ``dict(result)`` works), but fields registered with a
+    loader are only built when read and are then kept.
+    """
+
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        loaders: Optional[Dict[str, Callable[[], Any]]] = None
+    ):
+        """
+        Args:
+            values: Fields known up front.
+            loaders: Field name to zero-argument callable building its value.
+        """
+        self._keys: List[str] = []
+        self._values: Dict[str, Any] = {}
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        for key, loader in (loaders or {}).items():
+            self._keys.append(key)
+            self._loaders[key] = loader
+        for key, value in values.items():
+            self[key] = value
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether a field has a value without calling its loader."""
+        return key in self._values
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        loader = self._loaders.pop(key)
+        value = self._values[key] = loader()
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._values and key not in self._loaders:
+            self._keys.append(key)
+        self._loaders.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._values and key not in self._loaders:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        self._loaders.pop(key, None)
+        self._keys.remove(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._loaders
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{key!r}: {self._values[key]!r}" if key in self._values else f"{key!r}: <lazy>"
+            for key in self._keys
+        )
+        return f"LazyResult({{{fields}}})"
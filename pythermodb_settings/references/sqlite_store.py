@@ -0,0 +1,443 @@
+# import libs
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Literal, Optional, Set, Tuple, Union
+# locals
+from .reference_index import (
+    KEY_FIELDS,
+    Posting,
+    ReferenceIndex,
+    TableId,
+    build_key,
+    column_lookup,
+    row_fields,
+)
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: schema version written to the meta table
+SQLITE_STORE_VERSION = 1
+
+# NOTE: most bound parameters per IN (...) query
+SQLITE_MAX_PARAMS = 900
+
+# NOTE: key variants indexed by default: every ComponentKey, separator "-", both case
+# modes ('lower' keys are the None ones, see _index_case)
+DEFAULT_SQLITE_VARIANTS: Tuple[Tuple[str, str, Optional[str]], ...] = tuple(
+    (component_key, "-", case)
+    for component_key in KEY_FIELDS
+    for case in (None, 'upper')
+)
+
+SQLITE_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE ref_bodies (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE ref_tables (
+    table_id INTEGER PRIMARY KEY,
+    reference TEXT NOT NULL,
+    name TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    value_table TEXT NOT NULL,
+    num_rows INTEGER NOT NULL
+);
+CREATE TABLE component_keys (
+    variant TEXT NOT NULL,
+    key TEXT NOT NULL,
+    table_id INTEGER NOT NULL,
+    row_index INTEGER NOT NULL
+);
+"""
+
+
+def variant_name(component_key: str, sep: str, case_mode: Optional[str]) -> str:
+    """Name under which a (component key, separator, case) combination is stored."""
+    return f"{component_key}\x1f{sep}\x1f{case_mode or ''}"
+
+
+# NOTE: key marking a tagged value (dates and timestamps JSON has no type for)
+_TAG_KEY = "\x00"
+
+
+def _index_case(case_mode: Optional[str]) -> Optional[str]:
+    """Case mode keys are stored under: 'lower' builds the same keys as None."""
+    return None if case_mode == 'lower' else case_mode
+
+
+def _check_keys(value: Any) -> None:
+    """Reject mapping keys JSON would silently turn into strings (or that look like tags)."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str) or key == _TAG_KEY:
+                raise ValueError(f"Mapping key {key!r} cannot be stored in a reference store.")
+            _check_keys(item)
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)):
+                _check_keys(item)
+
+
+def _encode_tagged(value: Any) -> Dict[str, str]:
+    """``json.dumps`` hook: tag dates and timestamps, reject other types."""
+    if isinstance(value, datetime):
+        return {_TAG_KEY: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {_TAG_KEY: "date", "value": value.isoformat()}
+    raise ValueError(
+        f"Values of type {type(value).__name__} cannot be stored in a reference store.")
+
+
+def _decode_tagged(obj: Dict[str, Any]) -> Any:
+    """``json.loads`` hook restoring values tagged by ``_encode_tagged``."""
+    tag = obj.get(_TAG_KEY)
+    if tag == "datetime":
+        return datetime.fromisoformat(obj["value"])
+    if tag == "date":
+        return date.fromisoformat(obj["value"])
+    return obj
+
+
+def _dumps(value: Any) -> str:
+    """JSON-encode a YAML value, tagging dates and timestamps so they load back unchanged."""
+    _check_keys(value)
+    return json.dumps(value, ensure_ascii=False, default=_encode_tagged)
+
+
+def _loads(text: str) -> Any:
+    """Decode a value written by ``_dumps``."""
+    return json.loads(text, object_hook=_decode_tagged)
+
+
+def import_reference_to_sqlite(
+    reference: Dict[str, Any],
+    db_path: Union[str, Path],
+    *,
+    variants: Optional[Iterable[Tuple[str, str, Optional[str]]]] = None
+) -> Path:
+    """
+    Write a parsed reference into a new SQLite database.
+
+    Each table with VALUES rows gets its own ``values_<n>`` table (one JSON row
+    per VALUES row) and every row is entered in ``component_keys`` under each
+    key variant, indexed on (variant, key). Everything else (reference and
+    table metadata, STRUCTURE, EQUATIONS, ...) is kept as JSON with empty
+    VALUES placeholders; dates and timestamps are tagged so they load back as
+    the same types. The database is built under a temporary name and renamed,
+    so readers never open a partial file; on failure the connection is closed,
+    the partial file removed and an existing ``db_path`` left as it was.
+
+    Args:
+        reference: Parsed reference with a ``REFERENCES`` root.
+        db_path: Database file to create (replaced if it exists).
+        variants: (component key, separator, case) combinations to index;
+            defaults to ``DEFAULT_SQLITE_VARIANTS``.
+
+    Returns:
+        Path of the database.
+
+    Raises:
+        ValueError: The reference holds a value JSON cannot store faithfully
+            (a non-string mapping key, a set, binary data, ...).
+    """
+    db_path = Path(db_path)
+    variants = list(dict.fromkeys(
+        (component_key, sep, _index_case(case_mode))
+        for component_key, sep, case_mode in (
+            DEFAULT_SQLITE_VARIANTS if variants is None else variants)
+    ))
+    index = ReferenceIndex(reference)
+    indexed = set(index.tables)
+
+    fd, tmp_name = tempfile.mkstemp(dir=db_path.parent, prefix=f".{db_path.name}.", suffix='.tmp')
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+
+    try:
+        # the connection commits (or rolls back) the import and is always closed
+        with closing(sqlite3.connect(tmp_path)) as conn, conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+            document = {
+                key: (None if key == "REFERENCES" else value)
+                for key, value in reference.items()
+            }
+            meta = {
+                'version': str(SQLITE_STORE_VERSION),
+                'document': _dumps(document),
+                'variants': _dumps([list(variant) for variant in variants]),
+            }
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+
+            references = reference.get("REFERENCES", {}) or {}
+            for position, (ref_name, ref_body) in enumerate(references.items()):
+                body = ref_body
+                if isinstance(ref_body, dict) and isinstance(ref_body.get("TABLES"), dict):
+                    body = {
+                        **ref_body,
+                        "TABLES": {
+                            table_name: (
+                                {**table, "VALUES": []}
+                                if (ref_name, table_name) in indexed else table
+                            )
+                            for table_name, table in ref_body["TABLES"].items()
+                        }
+                    }
+                conn.execute(
+                    "INSERT INTO ref_bodies VALUES (?, ?, ?)",
+                    (position, ref_name, _dumps(body)))
+
+            table_ids: Dict[TableId, int] = {}
+            for table_num, table_id in enumerate(index.tables, start=1):
+                table_ids[table_id] = table_num
+                value_table = f"values_{table_num}"
+                values = index.values(table_id)
+                conn.execute(
+                    "INSERT INTO ref_tables VALUES (?, ?, ?, ?, ?, ?)",
+                    (table_num, table_id[0], table_id[1],
+                     _dumps(index.columns(table_id)), value_table, len(values)))
+                conn.execute(
+                    f'CREATE TABLE "{value_table}" '
+                    "(row_index INTEGER PRIMARY KEY, row TEXT NOT NULL)")
+                conn.executemany(
+                    f'INSERT INTO "{value_table}" VALUES (?, ?)',
+                    ((row_idx, _dumps(row)) for row_idx, row in enumerate(values)))
+
+            for component_key, sep, case_mode in variants:
+                name = variant_name(component_key, sep, case_mode)
+                postings = index.postings(component_key, sep, case_mode)
+                conn.executemany(
+                    "INSERT INTO component_keys VALUES (?, ?, ?, ?)",
+                    (
+                        (name, key, table_ids[(ref_name, table_name)], row_idx)
+                        for key, hits in postings.items()
+                        for ref_name, table_name, row_idx in hits
+                    )
+                )
+
+            conn.execute(
+                "CREATE INDEX component_keys_lookup "
+                "ON component_keys (variant, key, table_id, row_index)")
+        os.replace(tmp_path, db_path)
+    finally:
+        for path in (tmp_path, tmp_path.with_name(f"{tmp_path.name}-journal")):
+            if path.exists():
+                path.unlink()
+
+    return db_path
+
+
+class SQLiteReferenceStore:
+    """
+    Read-only reference backed by a database from ``import_reference_to_sqlite``.
+
+    It answers the same lookups as ``ReferenceIndex`` (``tables``, ``match``,
+    ``lookup``, ``rows``, ``row``, ``column_lookup``) with indexed queries, so
+    ``ComponentExtractor`` can filter it without loading the reference; only the
+    requested rows and the small table metadata are read. Each thread uses its
+    own read-only connection, and many processes can share one database file.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Args:
+            db_path: Database file written by ``import_reference_to_sqlite``.
+
+        Raises:
+            ValueError: The file is not a reference store of this version.
+        """
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Reference store not found: {self.db_path}")
+        self._local = threading.local()
+
+        conn = self._connection()
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"{self.db_path} is not a reference store: {e}") from e
+        if meta.get('version') != str(SQLITE_STORE_VERSION):
+            raise ValueError(
+                f"Reference store {self.db_path} has version {meta.get('version')}, "
+                f"expected {SQLITE_STORE_VERSION}.")
+
+        self._document = meta['document']
+        self.variants = [tuple(variant) for variant in _loads(meta['variants'])]
+
+        # table metadata is small and read once
+        self.tables: List[TableId] = []
+        self._table_nums: Dict[TableId, int] = {}
+        self._table_ids: Dict[int, TableId] = {}
+        self._value_tables: Dict[TableId, str] = {}
+        self._columns: Dict[TableId, List[Any]] = {}
+        self._lookups: Dict[TableId, Dict[str, int]] = {}
+        self.num_rows = 0
+        for table_num, ref_name, table_name, columns, value_table, num_rows in conn.execute(
+                "SELECT table_id, reference, name, columns, value_table, num_rows "
+                "FROM ref_tables ORDER BY table_id"):
+            table_id = (ref_name, table_name)
+            self.tables.append(table_id)
+            self._table_nums[table_id] = table_num
+            self._table_ids[table_num] = table_id
+            self._value_tables[table_id] = value_table
+            self._columns[table_id] = _loads(columns)
+            self._lookups[table_id] = column_lookup(self._columns[table_id])
+            self.num_rows += num_rows
+
+    def _connection(self) -> sqlite3.Connection:
+        """Read-only connection owned by the calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def skeleton(self) -> Dict[str, Any]:
+        """
+        Rebuild the reference with every indexed table's VALUES left empty.
+
+        Returns a new dict on every call, so callers may fill in VALUES.
+        """
+        document = _loads(self._document)
+        if "REFERENCES" in document:
+            document["REFERENCES"] = {
+                name: _loads(body)
+                for name, body in self._connection().execute(
+                    "SELECT name, body FROM ref_bodies ORDER BY position")
+            }
+        return document
+
+    def lookup(
+        self,
+        keys: Iterable[str],
+        component_key: str,
+        sep: str,
+        case_mode: Literal['lower', 'upper', None]
+    ) -> Dict[str, List[Posting]]:
+        """Postings (in document order) of the normalized keys that are present."""
+        keys = sorted(set(keys))
+        if not keys:
+            return {}
+
+        case_mode = _index_case(case_mode)
+        if (component_key, sep, case_mode) not in self.variants:
+            return self._scan(keys, component_key, sep, case_mode)
+
+        name = variant_name(component_key, sep, case_mode)
+        found: Dict[str, List[Posting]] = {}
+        conn = self._connection()
+        for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+            chunk = keys[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            for key, table_num, row_idx in conn.execute(
+                    "SELECT key, table_id, row_index FROM component_keys "
+                    f"WHERE variant = ? AND key IN ({placeholders}) "
+                    "ORDER BY table_id, row_index",
+                    (name, *chunk)):
+                found.setdefault(key, []).append((*self._table_ids[table_num], row_idx))
+        return found
+
+    def _scan(
+        self,
+        keys: List[str],
+        component_key: str,
+        sep: str,
+        case_mode: Literal['lower', 'upper', None]
+    ) -> Dict[str, List[Posting]]:
+        """Find keys of a variant that was not indexed by reading every row once."""
+        logger.debug(
+            "Key variant %s is not indexed in %s; scanning rows",
+            (component_key, sep, case_mode), self.db_path)
+        wanted = set(keys)
+        found: Dict[str, List[Posting]] = {}
+        conn = self._connection()
+        for table_id in self.tables:
+            lookup = self._lookups[table_id]
+            for row_idx, row in conn.execute(
+                    f'SELECT row_index, row FROM "{self._value_tables[table_id]}" '
+                    "ORDER BY row_index"):
+                key = build_key(row_fields(_loads(row), lookup), component_key, sep, case_mode)
+                if key in wanted:
+                    found.setdefault(key, []).append((*table_id, row_idx))
+        return found
+
+    def match(
+        self,
+        keys: Iterable[str],
+        component_key: str,
+        sep: str,
+        case_mode: Literal['lower', 'upper', None]
+    ) -> Tuple[Dict[TableId, List[int]], Set[str]]:
+        """
+        Look up normalized keys.
+
+        Returns:
+            Tuple of (sorted matching row indices per table, keys found).
+        """
+        rows: Dict[TableId, List[int]] = {}
+        postings = self.lookup(keys, component_key, sep, case_mode)
+        for hits in postings.values():
+            for ref_name, table_name, row_idx in hits:
+                rows.setdefault((ref_name, table_name), []).append(row_idx)
+
+        for indices in rows.values():
+            indices.sort()
+        return rows, set(postings)
+
+    def rows(self, table_id: TableId, indices: Iterable[int]) -> List[Any]:
+        """VALUES rows of a table at the given positions, in the order given."""
+        indices = list(indices)
+        if not indices:
+            return []
+
+        by_index: Dict[int, Any] = {}
+        conn = self._connection()
+        value_table = self._value_tables[table_id]
+        for start in range(0, len(indices), SQLITE_MAX_PARAMS):
+            chunk = indices[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            for row_idx, row in conn.execute(
+                    f'SELECT row_index, row FROM "{value_table}" '
+                    f"WHERE row_index IN ({placeholders})",
+                    chunk):
+                by_index[row_idx] = _loads(row)
+        return [by_index[idx] for idx in indices]
+
+    def row(self, posting: Posting) -> Any:
+        """Return the VALUES row a posting points to."""
+        ref_name, table_name, row_idx = posting
+        return self.rows((ref_name, table_name), [row_idx])[0]
+
+    def columns(self, table_id: TableId) -> List[Any]:
+        """COLUMNS of a stored table."""
+        return self._columns[table_id]
+
+    def column_lookup(self, table_id: TableId) -> Dict[str, int]:
+        """Lowercase column name to position map of a stored table."""
+        return self._lookups[table_id]
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __repr__(self) -> str:
+        return (
+            f"SQLiteReferenceStore({str(self.db_path)!r}, "
+            f"tables={len(self.tables)}, rows={self.num_rows})"
+        )
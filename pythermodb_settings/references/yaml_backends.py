@@ -0,0 +1,199 @@
+# import libs
+import logging
+import yaml
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type, Union
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: optional third-party parser (Rust yaml-rust based, YAML 1.2)
+try:
+    import ryaml
+except ImportError:  # pragma: no cover - optional dependency
+    ryaml = None
+
+
+class BackendParseError(yaml.YAMLError):
+    """Parse error raised by a non-PyYAML backend, normalized to ``yaml.YAMLError``."""
+    pass
+
+
+class YAMLBackend(ABC):
+    """
+    Base class for YAML parser backends used by ``YAMLExtractor``.
+
+    Backends raise ``yaml.YAMLError`` (or a subclass) on invalid input so the
+    extractor can handle every parser the same way.
+    """
+
+    name = "base"
+
+    # NOTE: PyYAML loader class the backend parses with (None for other parsers);
+    # budget checks that compose a text with it build the result from that composition
+    compose_loader: Optional[type] = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the backend can be used in this environment."""
+        return True
+
+    @abstractmethod
+    def load(self, text: str) -> Any:
+        """Parse a single YAML document."""
+
+    @abstractmethod
+    def load_all(self, text: str) -> List[Any]:
+        """Parse every YAML document in a stream."""
+
+    def load_any(self, text: str) -> Any:
+        """
+        Parse a stream in one pass: the document itself when there is one,
+        a list of documents when there are several, and None when empty.
+        """
+        documents = self.load_all(text)
+        if not documents:
+            return None
+        if len(documents) == 1:
+            return documents[0]
+        return documents
+
+    @abstractmethod
+    def capabilities(self) -> Dict[str, Any]:
+        """Describe the backend's parsing features and the cost of a failed parse."""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r})"
+
+
+class PyYAMLBackend(YAMLBackend):
+    """Pure-Python PyYAML ``SafeLoader``."""
+
+    name = "pyyaml"
+    compose_loader = yaml.SafeLoader
+
+    def load(self, text: str) -> Any:
+        return yaml.load(text, Loader=yaml.SafeLoader)
+
+    def load_all(self, text: str) -> List[Any]:
+        return list(yaml.load_all(text, Loader=yaml.SafeLoader))
+
+    def capabilities(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "native": False,
+            "yaml_spec": "1.1",
+            "pyyaml_compatible": True,
+            "multi_document": True,
+            "error_positions": True,
+            "error_cost": "pure-Python scan and composition up to the offending token; no objects constructed",
+        }
+
+
+class LibYAMLBackend(YAMLBackend):
+    """PyYAML ``CSafeLoader`` backed by the libyaml C library."""
+
+    name = "libyaml"
+    compose_loader = getattr(yaml, "CSafeLoader", None)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return bool(getattr(yaml, "__with_libyaml__", False))
+
+    def load(self, text: str) -> Any:
+        return yaml.load(text, Loader=yaml.CSafeLoader)
+
+    def load_all(self, text: str) -> List[Any]:
+        return list(yaml.load_all(text, Loader=yaml.CSafeLoader))
+
+    def capabilities(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "native": True,
+            "yaml_spec": "1.1",
+            "pyyaml_compatible": True,
+            "multi_document": True,
+            "error_positions": True,
+            "error_cost": "C scan and composition up to the offending token; no objects constructed",
+        }
+
+
+class RYAMLBackend(YAMLBackend):
+    """
+    Optional ``ryaml`` parser (Rust). Resolves scalars with YAML 1.2 rules, so
+    e.g. ``yes``/``no`` stay strings; it is never picked by ``'auto'``.
+    """
+
+    name = "ryaml"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return ryaml is not None
+
+    def load(self, text: str) -> Any:
+        try:
+            return ryaml.loads(text)
+        except ValueError as exc:
+            raise BackendParseError(str(exc)) from exc
+
+    def load_all(self, text: str) -> List[Any]:
+        try:
+            return list(ryaml.loads_all(text))
+        except ValueError as exc:
+            raise BackendParseError(str(exc)) from exc
+
+    def capabilities(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "native": True,
+            "yaml_spec": "1.2",
+            "pyyaml_compatible": False,
+            "multi_document": True,
+            "error_positions": True,
+            "error_cost": "native scan up to the offending token; no objects constructed",
+        }
+
+
+# NOTE: registry of known backends
+YAML_BACKENDS: Dict[str, Type[YAMLBackend]] = {
+    PyYAMLBackend.name: PyYAMLBackend,
+    LibYAMLBackend.name: LibYAMLBackend,
+    RYAMLBackend.name: RYAMLBackend,
+}
+
+# NOTE: 'auto' preference, fastest first; only PyYAML-compatible backends are
+# eligible so results do not change when an optional package gets installed
+AUTO_BACKEND_ORDER = (LibYAMLBackend.name, PyYAMLBackend.name)
+
+
+def available_backends() -> List[str]:
+    """Return the names of the backends usable in this environment."""
+    return [name for name, backend in YAML_BACKENDS.items() if backend.is_available()]
+
+
+def get_backend(backend: Optional[Union[str, YAMLBackend]] = "auto") -> YAMLBackend:
+    """
+    Resolve a backend name (or instance) to a backend instance.
+
+    Args:
+        backend: 'auto', a registered backend name, or a ``YAMLBackend`` instance.
+
+    Returns:
+        YAMLBackend instance
+    """
+    if isinstance(backend, YAMLBackend):
+        return backend
+
+    if backend is None or backend == "auto":
+        for name in AUTO_BACKEND_ORDER:
+            if YAML_BACKENDS[name].is_available():
+                return YAML_BACKENDS[name]()
+        return PyYAMLBackend()
+
+    backend_cls = YAML_BACKENDS.get(backend)
+    if backend_cls is None:
+        raise ValueError(
+            f"Unknown YAML backend '{backend}'. Available: {', '.join(YAML_BACKENDS)}")
+    if not backend_cls.is_available():
+        raise ValueError(f"YAML backend '{backend}' is not available in this environment.")
+    return backend_cls()
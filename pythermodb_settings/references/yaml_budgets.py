@@ -0,0 +1,461 @@
+# import libs
+import logging
+import math
+import re
+import time
+import yaml
+from typing import Any, List, Literal, Optional, Union
+
+# NOTE: logger
+logger = logging.getLogger(__name__)
+
+# NOTE: what to do when a budget is exceeded
+BudgetAction = Literal['raise', 'truncate']
+
+# NOTE: quoted scalars are skipped when counting flow brackets
+FLOW_TOKEN = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\n]|\'\')*\'|[\[\]{}]')
+
+# NOTE: alias tokens (*name) at the start of a node
+ALIAS_TOKEN = re.compile(r'(?:^|[\s\[{,:-])\*[^\s,\[\]{}]+', re.MULTILINE)
+
+# NOTE: composer used to measure alias expansion without constructing objects
+_COMPOSE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class BudgetExceededError(ValueError):
+    """Raised when extraction exceeds one of the configured ``ExtractionBudget`` limits."""
+
+    budget = 'budget'
+
+    def __init__(self, limit: Any, observed: Any):
+        self.limit = limit
+        self.observed = observed
+        super().__init__(
+            f"Extraction budget '{self.budget}' exceeded: {observed} > {limit}")
+
+
+class SectionTooLargeError(BudgetExceededError):
+    """A candidate section is larger than ``max_section_bytes``."""
+    budget = 'max_section_bytes'
+
+
+class NestingTooDeepError(BudgetExceededError):
+    """A candidate section nests deeper than ``max_depth``."""
+    budget = 'max_depth'
+
+
+class AliasLimitError(BudgetExceededError):
+    """A candidate section expands more aliases than ``max_aliases``."""
+    budget = 'max_aliases'
+
+
+class TimeBudgetExceededError(BudgetExceededError):
+    """An extraction call ran longer than ``time_budget`` seconds."""
+    budget = 'time_budget'
+
+
+class TooManySectionsError(BudgetExceededError):
+    """An extraction call found more than ``max_sections`` sections."""
+    budget = 'max_sections'
+
+
+def nesting_depth(text: str, limit: Optional[int] = None) -> int:
+    """
+    Estimate the nesting depth of a YAML text without parsing it.
+
+    Block depth is the number of open indentation levels, flow depth the number
+    of open ``[``/``{`` brackets outside quoted scalars; the result is their
+    largest sum. Scanning stops early once ``limit`` is exceeded.
+    """
+    scanner = _DepthScanner()
+    for line in text.split('\n'):
+        scanner.feed(line)
+        if limit is not None and scanner.deepest > limit:
+            break
+    return scanner.deepest
+
+
+class _DepthScanner:
+    """Line-by-line state of ``nesting_depth``."""
+
+    __slots__ = ('deepest', '_flow', '_indents')
+
+    def __init__(self):
+        self.deepest = 0
+        self._flow = 0
+        self._indents: List[int] = []
+
+    def feed(self, line: str) -> None:
+        """Account for one more line (without its newline)."""
+        stripped = line.lstrip(' ')
+        if not stripped or stripped.startswith('#'):
+            return
+
+        indents = self._indents
+        if self._flow == 0:
+            indent = len(line) - len(stripped)
+            while indents and indents[-1] >= indent:
+                indents.pop()
+            indents.append(indent)
+
+        depth = len(indents) + self._flow
+        if '[' in stripped or '{' in stripped or self._flow:
+            for token in FLOW_TOKEN.findall(stripped):
+                if token in '[{':
+                    self._flow += 1
+                    depth = max(depth, len(indents) + self._flow)
+                elif token in ']}':
+                    self._flow = max(0, self._flow - 1)
+
+        self.deepest = max(self.deepest, depth)
+
+
+def alias_expansions(text: str) -> Union[int, float]:
+    """
+    Count how many extra nodes alias references would add once expanded.
+
+    The text is only composed (no Python objects are built) and shared nodes are
+    sized with memoization, so an alias bomb is measured in time linear in its
+    source. Every document of a stream is counted. An alias to one of its own
+    enclosing nodes expands without end and counts as infinite. Returns 0 for
+    texts without aliases or that fail to compose.
+    """
+    if '*' not in text or not ALIAS_TOKEN.search(text):
+        return 0
+    composition = compose_documents(text, _COMPOSE_LOADER)
+    if composition.nodes is None:
+        return 0
+    return _node_expansions(composition.nodes)
+
+
+class Composition:
+    """Composed documents of a text, constructed on demand so the text is parsed once."""
+
+    __slots__ = ('loader', 'nodes')
+
+    def __init__(self, loader: Any, nodes: Optional[List[yaml.Node]]):
+        """
+        Args:
+            loader: PyYAML loader the nodes were composed by.
+            nodes: Root node of each document, or None when the text did not compose.
+        """
+        self.loader = loader
+        self.nodes = nodes
+
+    def construct(self) -> Optional[Any]:
+        """
+        Build the documents like ``YAMLBackend.load_any``: the document, a list
+        of documents, or None when empty or invalid.
+        """
+        if self.nodes is None:
+            return None
+        try:
+            documents = [self.loader.construct_document(node) for node in self.nodes]
+        except yaml.YAMLError:
+            return None
+        finally:
+            self.loader.dispose()
+        if not documents:
+            return None
+        if len(documents) == 1:
+            return documents[0]
+        return documents
+
+
+def compose_documents(text: str, loader: type) -> Composition:
+    """Compose every document of a YAML stream without constructing objects."""
+    instance = loader(text)
+    nodes = []
+    try:
+        while instance.check_node():
+            nodes.append(instance.get_node())
+    except yaml.YAMLError:
+        instance.dispose()
+        return Composition(None, None)
+    return Composition(instance, nodes)
+
+
+def _node_expansions(roots: List[yaml.Node]) -> Union[int, float]:
+    """Extra nodes the aliases under ``roots`` add once expanded (inf for a cycle)."""
+    # expanded size of each distinct node, computed bottom-up without recursion;
+    # nodes whose children are still being sized are open
+    sizes = {}
+    open_nodes = set()
+    expanded = 0
+    for root in roots:
+        stack = [(root, False)]
+        while stack:
+            node, ready = stack.pop()
+            key = id(node)
+            if key in sizes:
+                continue
+            children = _node_children(node)
+            if ready:
+                sizes[key] = 1 + sum(sizes[id(child)] for child in children)
+                open_nodes.discard(key)
+                continue
+            if any(id(child) in open_nodes or child is node for child in children):
+                return math.inf
+            open_nodes.add(key)
+            stack.append((node, True))
+            stack.extend((child, False) for child in children if id(child) not in sizes)
+        expanded += sizes[id(root)]
+
+    return expanded - len(sizes)
+
+
+def _node_children(node: yaml.Node) -> list:
+    """Direct children of a composed YAML node."""
+    if isinstance(node, yaml.SequenceNode):
+        return node.value
+    if isinstance(node, yaml.MappingNode):
+        return [item for pair in node.value for item in pair]
+    return []
+
+
+class ExtractionBudget:
+    """
+    Resource limits for a ``YAMLExtractor``.
+
+    Per-section limits (size, depth, aliases) are checked before a candidate is
+    handed to the parser; per-call limits (time, section count) are checked while
+    scanning. A limit of None disables that check.
+    """
+
+    def __init__(
+        self,
+        max_section_bytes: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_aliases: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        max_sections: Optional[int] = None,
+        on_exceed: BudgetAction = 'raise'
+    ):
+        """
+        Args:
+            max_section_bytes: Largest candidate section (UTF-8 bytes) that is parsed.
+            max_depth: Deepest block/flow nesting accepted in a candidate section.
+            max_aliases: Most extra nodes alias references may expand to per section.
+            time_budget: Wall-clock seconds allowed for one extraction call.
+            max_sections: Most sections returned by one extraction call.
+            on_exceed: 'raise' a ``BudgetExceededError`` subclass, or 'truncate':
+                skip offending sections and stop scanning once a per-call limit is hit.
+        """
+        if on_exceed not in ('raise', 'truncate'):
+            raise ValueError("on_exceed must be 'raise' or 'truncate'")
+
+        self.max_section_bytes = max_section_bytes
+        self.max_depth = max_depth
+        self.max_aliases = max_aliases
+        self.time_budget = time_budget
+        self.max_sections = max_sections
+        self.on_exceed = on_exceed
+
+    @property
+    def limits_sections(self) -> bool:
+        """Whether any per-section limit is set."""
+        return (
+            self.max_section_bytes is not None
+            or self.max_depth is not None
+            or self.max_aliases is not None
+        )
+
+    def check_section(self, text: str) -> None:
+        """
+        Check a candidate section against the per-section limits.
+
+        Raises:
+            SectionTooLargeError, NestingTooDeepError or AliasLimitError
+        """
+        self.check_size(text)
+
+        limit = self.max_depth
+        if limit is not None:
+            depth = nesting_depth(text, limit)
+            if depth > limit:
+                raise NestingTooDeepError(limit, depth)
+
+        limit = self.max_aliases
+        if limit is not None:
+            expansions = alias_expansions(text)
+            if expansions > limit:
+                raise AliasLimitError(limit, expansions)
+
+    def check_size(self, text: str) -> None:
+        """
+        Check a candidate section against ``max_section_bytes``.
+
+        Raises:
+            SectionTooLargeError
+        """
+        limit = self.max_section_bytes
+        if limit is not None and len(text) * 4 > limit:
+            # characters are a lower bound for the encoded size
+            size = len(text) if len(text) > limit else len(text.encode('utf-8', 'surrogatepass'))
+            if size > limit:
+                raise SectionTooLargeError(limit, size)
+
+    def start(self) -> 'BudgetTracker':
+        """Start tracking one extraction call."""
+        return BudgetTracker(self)
+
+
+class SectionCheck:
+    """
+    Per-section limits of a candidate block that grows by whole lines between parses.
+
+    ``check`` only scans the lines added since the previous call for depth and
+    alias tokens. Aliases are composed again only when new alias tokens
+    appeared: an alias refers to an anchored node that is already closed (or
+    to an enclosing one, which counts as infinite), so lines without aliases
+    cannot add expansions. When ``loader`` is the loader the text is parsed
+    with, that composition is kept in ``composition`` so the block is built
+    from it instead of being parsed a second time.
+    """
+
+    def __init__(self, budget: ExtractionBudget, lines: List[str], loader: Optional[type] = None):
+        """
+        Args:
+            budget: Limits to apply.
+            lines: Lines of the block (without newlines); the list is appended to
+                as the block grows.
+            loader: PyYAML loader class of the extractor's backend, or None when
+                the backend does not parse with PyYAML.
+        """
+        self.budget = budget
+        self.lines = lines
+        self.loader = loader
+        # composition of the text passed to the last check, when it was composed
+        self.composition: Optional[Composition] = None
+        self._seen = 0
+        self._depth = _DepthScanner()
+        self._alias_lines = 0
+        # alias lines seen by the last successful compose
+        self._composed_at: Optional[int] = None
+        self._expansions: Union[int, float] = 0
+
+    def check(self, text: str) -> None:
+        """
+        Check the block, given as its joined (right-stripped) text.
+
+        Raises:
+            SectionTooLargeError, NestingTooDeepError or AliasLimitError
+        """
+        budget = self.budget
+        self.composition = None
+        new_lines = self.lines[self._seen:]
+        self._seen = len(self.lines)
+
+        budget.check_size(text)
+
+        limit = budget.max_depth
+        if limit is not None:
+            for line in new_lines:
+                self._depth.feed(line)
+            if self._depth.deepest > limit:
+                raise NestingTooDeepError(limit, self._depth.deepest)
+
+        limit = budget.max_aliases
+        if limit is not None:
+            self._alias_lines += sum(
+                1 for line in new_lines if '*' in line and ALIAS_TOKEN.search(line))
+            if self._alias_lines and self._alias_lines != self._composed_at:
+                composition = compose_documents(text, self.loader or _COMPOSE_LOADER)
+                if composition.nodes is None:
+                    # the parser rejects it as well; compose again once it grows
+                    self._expansions = 0
+                else:
+                    self._expansions = _node_expansions(composition.nodes)
+                    self._composed_at = self._alias_lines
+                if self._expansions > limit:
+                    raise AliasLimitError(limit, self._expansions)
+                if self.loader is not None:
+                    self.composition = composition
+            elif self._expansions > limit:
+                raise AliasLimitError(limit, self._expansions)
+
+
+class BudgetTracker:
+    """Per-call budget state: deadline, section count and truncation reason."""
+
+    def __init__(self, budget: ExtractionBudget):
+        self.budget = budget
+        self.deadline = (
+            None if budget.time_budget is None
+            else time.monotonic() + budget.time_budget
+        )
+        self.sections = 0
+        self.skipped = 0
+        # name of the first budget that cut the result short in 'truncate' mode
+        self.truncated: Optional[str] = None
+        # set once a per-call limit was hit; scanning should stop
+        self.exhausted = False
+        # seconds left on the clock while paused
+        self._remaining: Optional[float] = None
+
+    def admit_text(self, text: str) -> bool:
+        """Check a candidate section; False when it must be skipped."""
+        if not self.budget.limits_sections:
+            return True
+        try:
+            self.budget.check_section(text)
+        except BudgetExceededError as exc:
+            self._breach(exc)
+            self.skipped += 1
+            return False
+        return True
+
+    def admit_block(self, check: SectionCheck, text: str) -> bool:
+        """Check a growing candidate block (see ``SectionCheck``); False when it must be skipped."""
+        if not self.budget.limits_sections:
+            return True
+        try:
+            check.check(text)
+        except BudgetExceededError as exc:
+            self._breach(exc)
+            self.skipped += 1
+            return False
+        return True
+
+    def check_time(self) -> bool:
+        """Check the deadline; False once scanning must stop."""
+        if self.exhausted:
+            return False
+        if self.deadline is None:
+            return True
+        now = time.monotonic()
+        if now <= self.deadline:
+            return True
+        self._breach(TimeBudgetExceededError(
+            self.budget.time_budget, round(now - self.deadline + self.budget.time_budget, 4)))
+        self.exhausted = True
+        return False
+
+    def pause(self) -> None:
+        """Stop the clock, e.g. while an incremental extraction waits for input."""
+        if self.deadline is not None and self._remaining is None:
+            self._remaining = self.deadline - time.monotonic()
+
+    def resume(self) -> None:
+        """Restart a paused clock with the time that was left."""
+        if self._remaining is not None:
+            self.deadline = time.monotonic() + self._remaining
+            self._remaining = None
+
+    def admit_section(self) -> bool:
+        """Count one emitted section; False when it exceeds ``max_sections``."""
+        limit = self.budget.max_sections
+        if limit is not None and self.sections >= limit:
+            self._breach(TooManySectionsError(limit, self.sections + 1))
+            self.exhausted = True
+            return False
+        self.sections += 1
+        return True
+
+    def _breach(self, exc: BudgetExceededError) -> None:
+        """Raise, or record the breach when truncating."""
+        if self.budget.on_exceed == 'raise':
+            raise exc
+        logger.warning("YAML extraction truncated: %s", exc)
+        if self.truncated is None:
+            self.truncated = exc.budget
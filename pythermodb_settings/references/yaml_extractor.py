@@ -1,89 +1,584 @@
 # import libs
 import logging
+import hashlib
+import io
+import mmap
+import os
 import yaml
 import re
-from typing import Optional, List, Dict, Any, Tuple
+from array import array
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple, Literal, Iterable, Iterator, IO, Union
 # local
 from ..utils import measure_time
+from .yaml_scanner import (
+    BlockScanner,
+    BLOCK_OPENERS,
+    classify_line,
+    classify_lines,
+    find_block_spans,
+    find_fences,
+    find_marker_spans,
+    line_offsets,
+    peek_root_keys,
+    root_key as line_root_key,
+    BLANK,
+    COMMENT,
+    DOC_START,
+    KEY,
+)
+from .yaml_backends import YAMLBackend, get_backend
+from .yaml_budgets import BudgetAction, BudgetTracker, ExtractionBudget, SectionCheck
+from .yaml_sections import LazyYAMLSection
+from .extraction_cache import ExtractionCache, freeze, estimate_size
+
+# NOTE: block extraction engines
+ExtractionEngine = Literal['heuristic', 'linear']
+
+# NOTE: trailing document end marker of a marker-delimited body
+DOC_END_SUFFIX = re.compile(r'\n\.\.\.$')
+
+# NOTE: fence info strings whose body is parsed as YAML without further checks
+YAML_FENCE_TAGS = frozenset({'yaml', 'yml'})
+
+# NOTE: below this many bytes of candidate blocks, parsing stays serial
+PARALLEL_MIN_BYTES = 1 << 20
 
 # NOTE: logger
 logger = logging.getLogger(__name__)
 
 
+def _parse_with_backend(backend: YAMLBackend, text: str) -> Optional[Any]:
+    """Parse a YAML stream with a backend, returning None when invalid (pool-safe)."""
+    if not text or not text.strip():
+        return None
+
+    try:
+        # One pass over the stream: a single document, or a list of documents
+        return backend.load_any(text)
+    except yaml.YAMLError:
+        return None
+
+
+# NOTE: extractor owned by an ``extract_many`` worker process
+_WORKER_EXTRACTOR: Optional['YAMLExtractor'] = None
+
+
+def _init_extract_worker(extractor: 'YAMLExtractor') -> None:
+    """Pool initializer: keep one extractor per worker process."""
+    global _WORKER_EXTRACTOR
+    _WORKER_EXTRACTOR = extractor
+
+
+def _extract_chunk(chunk: List[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+    """Run ``extract_and_validate`` over a chunk of documents in a worker."""
+    return [_WORKER_EXTRACTOR._extract_document(index, item) for index, item in chunk]
+
+
 class YAMLExtractor:
     """Extract and validate YAML content from mixed-format strings."""
 
-    def extract_yaml_sections(self, text: str) -> List[Dict[str, Any]]:
+    def __init__(
+        self,
+        engine: ExtractionEngine = 'heuristic',
+        fences: bool = True,
+        backend: Union[str, YAMLBackend] = 'auto',
+        parallel_min_bytes: int = PARALLEL_MIN_BYTES,
+        max_section_bytes: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_aliases: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        max_sections: Optional[int] = None,
+        on_budget_exceeded: BudgetAction = 'raise',
+        cache: Optional[ExtractionCache] = None
+    ):
+        """
+        Args:
+            engine: Block extraction engine, 'heuristic' (line-by-line re-parsing)
+                or 'linear' (single-pass line classification, one parse per block).
+            fences: Parse Markdown code fences tagged yaml/yml (and untagged fences
+                whose body is a mapping) directly, and run the marker and block
+                heuristics only on the text outside fences.
+            backend: YAML parser backend name ('auto', 'libyaml', 'pyyaml', 'ryaml')
+                or a ``YAMLBackend`` instance. 'auto' picks the fastest available
+                PyYAML-compatible backend.
+            parallel_min_bytes: Minimum total size of candidate blocks before a
+                ``workers=`` call hands them to a process pool.
+            max_section_bytes: Skip or reject candidate sections larger than this
+                many UTF-8 bytes before parsing them.
+            max_depth: Skip or reject candidate sections nested deeper than this.
+            max_aliases: Skip or reject candidate sections whose aliases expand to
+                more than this many extra nodes (alias bombs).
+            time_budget: Wall-clock seconds allowed per extraction call. It is
+                checked between lines and candidate parses, so a single parse is
+                bounded by ``max_section_bytes`` rather than interrupted.
+            max_sections: Most sections returned by one extraction call.
+            on_budget_exceeded: 'raise' a ``BudgetExceededError`` subclass naming
+                the budget, or 'truncate' to skip offending sections and return the
+                sections found before a per-call limit was hit.
+            cache: Memoize ``extract_yaml_sections`` results in this cache, keyed
+                by a digest of the text and the extraction options. Cached
+                sections are read-only (see ``extraction_cache.freeze``).
+        """
+        self.engine = engine
+        self.fences = fences
+        self.backend = get_backend(backend)
+        self.parallel_min_bytes = parallel_min_bytes
+        # NOTE: number of YAML parser invocations made by this extractor
+        self.parse_calls = 0
+        self.budget = ExtractionBudget(
+            max_section_bytes=max_section_bytes,
+            max_depth=max_depth,
+            max_aliases=max_aliases,
+            time_budget=time_budget,
+            max_sections=max_sections,
+            on_exceed=on_budget_exceeded
+        )
+        self.cache = cache
+
+    def extract_yaml_sections(
+        self,
+        text: str,
+        engine: Optional[ExtractionEngine] = None,
+        workers: Optional[int] = None,
+        lazy: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Extract all valid YAML sections from a mixed-format string.
 
         Args:
             text: String potentially containing YAML content
+            engine: Override the block extraction engine for this call
+            workers: Parse candidate blocks in a process pool of this size once
+                their total size reaches ``parallel_min_bytes``. Requires the
+                'linear' engine: the heuristic engine decides where a block ends
+                by parsing it while scanning, so its blocks cannot be handed out.
+            lazy: Return ``LazyYAMLSection`` objects for marker and line-scan
+                candidates that parse ``content`` only when it is accessed. Lazy
+                sections are deduplicated by their raw text and may turn out
+                invalid (``content`` None, ``valid`` False) once parsed. Lazy
+                calls bypass the cache.
 
         Returns:
-            List of dictionaries containing extracted YAML data and metadata
+            List of dictionaries containing extracted YAML data and metadata;
+            with a cache, the sections are read-only mappings whose content
+            uses ``MappingProxyType`` and tuples instead of dicts and lists
+
+        Raises:
+            ValueError: ``workers`` above 1 with the 'heuristic' engine or ``lazy``
+            BudgetExceededError: A configured budget was exceeded and
+                ``on_budget_exceeded`` is 'raise'
         """
+        self._check_workers(engine or self.engine, workers, lazy)
+        if self.cache is None or lazy:
+            return self._extract_sections(
+                text, self.budget.start(), engine=engine, workers=workers, lazy=lazy)
+
+        sections, _, _ = self._extract_cached(text, engine, workers)
+        return list(sections)
+
+    def _extract_cached(
+        self,
+        text: str,
+        engine: Optional[ExtractionEngine],
+        workers: Optional[int]
+    ) -> Tuple[Tuple[Any, ...], str, Optional[str]]:
+        """
+        Frozen sections of a text with their summary and the budget that
+        truncated them, served from ``cache`` when already extracted with the
+        same options (a hit is never truncated).
+        """
+        key = self.cache.make_key('sections', text, self._cache_options(engine))
+        cached = self.cache.get(key)
+        if cached is not None:
+            frozen, summary = cached
+            return frozen, summary, None
+
+        tracker = self.budget.start()
+        sections = self._extract_sections(
+            text, tracker, engine=engine, workers=workers)
+        # NOTE: summarized before freezing, so it reads as for an uncached call
+        entry = (tuple(freeze(section) for section in sections), self._generate_summary(sections))
+        # a truncated result depends on timing, so it is not reused
+        if tracker.truncated is None:
+            self.cache.put(key, entry, estimate_size(entry))
+        return entry[0], entry[1], tracker.truncated
+
+    def _cache_options(self, engine: Optional[ExtractionEngine]) -> Tuple[Any, ...]:
+        """Extractor options that change the sections found for a given text."""
+        budget = self.budget
+        return (
+            engine or self.engine,
+            self.fences,
+            self.backend.name,
+            budget.max_section_bytes,
+            budget.max_depth,
+            budget.max_aliases,
+            budget.max_sections,
+            budget.on_exceed
+        )
+
+    def _extract_sections(
+        self,
+        text: str,
+        tracker: BudgetTracker,
+        engine: Optional[ExtractionEngine] = None,
+        workers: Optional[int] = None,
+        lazy: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Run ``extract_yaml_sections`` under an already started budget tracker."""
         results = []
+        engine = engine or self.engine
+        self._check_workers(engine, workers, lazy)
+
+        if lazy:
+            sections = self._extract_lazy_sections(text)
+            return [section for section in sections if tracker.admit_section()]
 
-        # Method 1: Try to find explicit YAML document markers
-        yaml_docs = self._extract_by_markers(text)
+        if engine not in ('linear', 'heuristic'):
+            raise ValueError(f"Unknown extraction engine: {engine}")
 
-        # Method 2: Extract multiple YAML blocks throughout the text
-        yaml_blocks = self._extract_multiple_yaml_blocks(text)
+        # The document is partitioned once into non-overlapping regions; each
+        # method blanks the lines it claims so later methods never see them
+        lines = text.split('\n')
+
+        # Method 1: Markdown code fences
+        fenced_docs = self._extract_fenced_blocks(lines, tracker) if self.fences else []
+
+        # Method 2: Regions between explicit YAML document markers
+        kinds, indents = classify_lines(lines)
+        yaml_docs = self._extract_by_markers(
+            text, lines, kinds, workers=workers, tracker=tracker)
+
+        # Method 3: YAML blocks in the remaining lines
+        if engine == 'linear':
+            yaml_blocks = self._extract_linear_blocks(
+                lines, kinds, indents, workers=workers, tracker=tracker)
+        else:
+            yaml_blocks = self._extract_multiple_yaml_blocks('\n'.join(lines), tracker=tracker)
 
         # Combine results, avoiding duplicates
-        all_results = yaml_docs + yaml_blocks
+        all_results = fenced_docs + yaml_docs + yaml_blocks
 
-        # Remove duplicates based on content
-        seen_content = []
+        # Remove duplicates based on a canonical content fingerprint
+        seen_fingerprints = set()
         for result in all_results:
-            content_str = str(result['content'])
-            if content_str not in seen_content:
+            fingerprint = self.content_fingerprint(result['content'])
+            if fingerprint not in seen_fingerprints:
+                if not tracker.admit_section():
+                    break
+                result['fingerprint'] = fingerprint
                 results.append(result)
-                seen_content.append(content_str)
+                seen_fingerprints.add(fingerprint)
 
         return results
 
-    def _extract_by_markers(self, text: str) -> List[Dict[str, Any]]:
-        """Extract YAML content between document markers (--- and ...)."""
+    def _check_workers(self, engine: ExtractionEngine, workers: Optional[int], lazy: bool) -> None:
+        """Reject a process pool the extraction could not use."""
+        if not workers or workers < 2:
+            return
+        if lazy:
+            raise ValueError("workers= cannot be combined with lazy=True; lazy sections parse on access.")
+        if engine == 'heuristic':
+            raise ValueError(
+                "workers= needs engine='linear'; the heuristic engine parses "
+                "blocks while scanning and cannot hand them to a process pool.")
+
+    def content_fingerprint(self, content: Any) -> str:
+        """
+        Build a stable, order-aware digest of parsed YAML content.
+
+        The content is walked once and fed to the hash as a type-tagged canonical
+        serialization, so ``1`` and ``'1'`` or ``[a, b]`` and ``[b, a]`` differ while
+        equal structures always produce the same digest across runs.
+
+        Args:
+            content: Parsed YAML content
+
+        Returns:
+            Hex digest string
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        self._feed_canonical(digest, content)
+        return digest.hexdigest()
+
+    def _feed_canonical(self, digest: Any, value: Any) -> None:
+        """Feed a type-tagged canonical serialization of a value into a hash."""
+        if isinstance(value, dict):
+            digest.update(b'{%d:' % len(value))
+            for key, item in value.items():
+                self._feed_canonical(digest, key)
+                self._feed_canonical(digest, item)
+            digest.update(b'}')
+        elif isinstance(value, (list, tuple)):
+            digest.update(b'[%d:' % len(value))
+            for item in value:
+                self._feed_canonical(digest, item)
+            digest.update(b']')
+        elif isinstance(value, str):
+            encoded = value.encode('utf-8', 'surrogatepass')
+            digest.update(b's%d:' % len(encoded))
+            digest.update(encoded)
+        elif value is None or isinstance(value, (bool, int, float)):
+            # bool is tagged separately from int so True and 1 stay distinct
+            digest.update(b'%s:%s;' % (type(value).__name__.encode(), repr(value).encode()))
+        else:
+            text = repr(value).encode('utf-8', 'surrogatepass')
+            digest.update(b'%s:%d:' % (type(value).__name__.encode(), len(text)))
+            digest.update(text)
+
+    def _extract_lazy_sections(self, text: str) -> List[LazyYAMLSection]:
+        """Collect fenced, marker and line-scan candidates as unparsed lazy sections."""
         results = []
+        seen_bodies = set()
+
+        def add(body: str, section: LazyYAMLSection) -> None:
+            # compare bodies without surrounding whitespace or a trailing '...'
+            body = DOC_END_SUFFIX.sub('', body.strip())
+            digest = hashlib.blake2b(body.encode('utf-8', 'surrogatepass'),
+                                     digest_size=16).digest()
+            if digest not in seen_bodies:
+                seen_bodies.add(digest)
+                results.append(section)
+
+        lines = text.split('\n')
+
+        # Markdown code fences; their bodies are blanked for the scans below
+        if self.fences:
+            for open_idx, close_idx, tag, body_lines in self._take_fences(lines):
+                body = '\n'.join(body_lines).rstrip()
+                add(body, LazyYAMLSection(
+                    body,
+                    partial(self._parse_fenced_candidate, body, tag),
+                    self.content_fingerprint,
+                    self._peek_body_root_keys(body_lines),
+                    {
+                        'method': 'fenced',
+                        'language': tag,
+                        'start_line': open_idx + 1,
+                        'end_line': close_idx - 1
+                    }
+                ))
+
+        # Marker-delimited documents
+        kinds, indents = classify_lines(lines)
+        spans = find_marker_spans(kinds)
+        offsets = line_offsets(text) if spans else []
+        for start, end, closed in spans:
+            body_lines = lines[start + 1:end + 1]
+            body = '\n'.join(body_lines)
+            add(body, LazyYAMLSection(
+                f"---\n{body.strip()}" + ("\n..." if closed else ""),
+                partial(self._parse_marker_candidate, body),
+                self.content_fingerprint,
+                self._peek_body_root_keys(body_lines),
+                self._marker_fields(text, offsets, start, end + 1 if closed else end)
+            ))
+
+        # Line-scan blocks (marker lines close blocks, so a marker body that is
+        # one block shares its text with the marker candidate above)
+        for start, end, content_lines in find_block_spans(kinds, indents):
+            yaml_text = '\n'.join(lines[start:end + 1]).rstrip()
+            add(yaml_text, LazyYAMLSection(
+                yaml_text,
+                partial(self._parse_block_candidate, yaml_text, content_lines),
+                self.content_fingerprint,
+                peek_root_keys(lines, kinds, indents, start, end),
+                {
+                    'method': 'line_scan',
+                    'start_line': start,
+                    'end_line': end
+                }
+            ))
+
+        return results
 
-        # Pattern to find YAML documents with explicit markers
-        # Look for --- at start of line
-        pattern = r'^---\s*$(.+?)(?:^\.\.\.\s*$|\Z)'
-        matches = re.findall(pattern, text, re.MULTILINE | re.DOTALL)
+    def _peek_body_root_keys(self, body_lines: List[str]) -> Tuple[str, ...]:
+        """Top-level keys of a fence or marker body, found without parsing."""
+        kinds, indents = classify_lines(body_lines)
+        opener = next(
+            (idx for idx, kind in enumerate(kinds) if kind in BLOCK_OPENERS), None)
+        if opener is None:
+            return ()
+        return peek_root_keys(body_lines, kinds, indents, opener, len(body_lines) - 1)
 
-        for match in matches:
-            parsed = self._safe_yaml_parse(match)
-            if parsed is not None and not self._is_simple_string(parsed, match):
+    def _take_fences(self, lines: List[str]) -> List[Tuple[int, int, str, List[str]]]:
+        """
+        Find Markdown code fences, blank their bodies in ``lines`` and return the
+        ones that may hold YAML as (open line, close line, tag, body lines).
+
+        Blanked lines keep their place, so line numbers found in the remaining
+        lines still refer to the input; the fence lines themselves are kept so
+        they still separate the blocks around them.
+        """
+        candidates = []
+        for open_idx, close_idx, tag in find_fences(lines):
+            body_lines = lines[open_idx + 1:close_idx]
+            if self._is_fence_candidate(body_lines, tag):
+                candidates.append((open_idx, close_idx, tag, body_lines))
+            lines[open_idx + 1:close_idx] = [''] * len(body_lines)
+        return candidates
+
+    def _extract_fenced_blocks(
+        self,
+        lines: List[str],
+        tracker: Optional[BudgetTracker] = None
+    ) -> List[Dict[str, Any]]:
+        """Parse YAML Markdown code fences and blank every fence body in ``lines``."""
+        results = []
+        for open_idx, close_idx, tag, body_lines in self._take_fences(lines):
+            body = '\n'.join(body_lines).rstrip()
+            parsed = self._parse_fenced_candidate(body, tag, tracker)
+            if parsed is not None:
                 results.append({
                     'content': parsed,
-                    'raw': f"---\n{match.strip()}\n...",
-                    'method': 'markers',
+                    'raw': body,
+                    'method': 'fenced',
                     'valid': True,
-                    'start_pos': text.find(f"---\n{match.strip()}")
+                    'language': tag,
+                    'start_line': open_idx + 1,
+                    'end_line': close_idx - 1
                 })
+        return results
 
-        # Also try without end marker
-        pattern2 = r'^---\s*\n(.+?)(?=^---|\Z)'
-        matches2 = re.findall(pattern2, text, re.MULTILINE | re.DOTALL)
+    def _is_fence_candidate(self, body_lines: List[str], tag: str) -> bool:
+        """Whether a fence may hold YAML: tagged yaml/yml, or untagged with a top-level key."""
+        if tag in YAML_FENCE_TAGS:
+            return True
+        if tag:
+            return False
+        for line in body_lines:
+            kind, indent = classify_line(line)
+            if kind == BLANK or kind == COMMENT or kind == DOC_START:
+                continue
+            return kind == KEY and indent == 0
+        return False
 
-        for match in matches2:
-            if match not in [m for m in matches]:  # Avoid duplicates
-                parsed = self._safe_yaml_parse(match)
-                if parsed is not None and not self._is_simple_string(parsed, match):
-                    results.append({
-                        'content': parsed,
-                        'raw': f"---\n{match.strip()}",
-                        'method': 'markers',
-                        'valid': True,
-                        'start_pos': text.find(f"---\n{match.strip()}")
-                    })
+    def _parse_fenced_candidate(
+        self,
+        body: str,
+        tag: str,
+        tracker: Optional[BudgetTracker] = None
+    ) -> Optional[Any]:
+        """Parse a fence body; untagged fences must yield a mapping."""
+        parsed = self._safe_yaml_parse(body, tracker)
+        if parsed is None or self._is_simple_string(parsed, body):
+            return None
+        if not tag and not isinstance(parsed, dict):
+            return None
+        return parsed
 
-        return results
+    def _parse_marker_candidate(self, text: str) -> Optional[Any]:
+        """Parse a marker-delimited document; None if invalid or a bare string."""
+        parsed = self._safe_yaml_parse(text)
+        if parsed is None or self._is_simple_string(parsed, text):
+            return None
+        return parsed
+
+    def _parse_block_candidate(self, yaml_text: str, content_lines: int) -> Optional[Any]:
+        """Parse a line-scan block; None if invalid or rejected as prose."""
+        parsed = self._safe_yaml_parse(yaml_text)
+        if not self._is_block_content(parsed, yaml_text, content_lines):
+            return None
+        return parsed
+
+    def _extract_by_markers(
+        self,
+        text: str,
+        lines: List[str],
+        kinds: array,
+        workers: Optional[int] = None,
+        tracker: Optional[BudgetTracker] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract YAML documents between explicit markers (--- and ...).
 
-    def _extract_multiple_yaml_blocks(self, text: str) -> List[Dict[str, Any]]:
+        Regions come from the classified lines (see ``find_marker_spans``) and are
+        parsed once each. Regions that yield YAML are claimed: their body lines are
+        blanked in ``lines`` and ``kinds`` so block extraction skips them, while
+        regions that fail to parse are left for block extraction.
+
+        Regions running up to a ``...`` line (or the end of the input) form one
+        stream. When a stream holds several documents that all parse, it is also
+        returned as a list section, and its documents follow every stream.
+        """
+        results = []
+        spans = find_marker_spans(kinds)
+        if not spans:
+            return results
+
+        offsets = line_offsets(text)
+        bodies = ['\n'.join(lines[start + 1:end + 1]) for start, end, _ in spans]
+        parsed_blocks = self._parse_blocks(bodies, workers, tracker)
+
+        streams = []
+        stream: List[int] = []
+        for pos, (_, _, closed) in enumerate(spans):
+            stream.append(pos)
+            if closed or pos == len(spans) - 1:
+                streams.append(stream)
+                stream = []
+
+        documents = []
+        for stream in streams:
+            first, (_, last, closed) = spans[stream[0]][0], spans[stream[-1]]
+            if len(stream) > 1 and all(parsed_blocks[pos] is not None for pos in stream):
+                results.append({
+                    'content': [parsed_blocks[pos] for pos in stream],
+                    'raw': "---\n" + '\n'.join(lines[first + 1:last + 1]).strip() + ("\n..." if closed else ""),
+                    'valid': True,
+                    **self._marker_fields(text, offsets, first, last + 1 if closed else last)
+                })
+
+            for pos in stream:
+                (start, end, closed), body, parsed = spans[pos], bodies[pos], parsed_blocks[pos]
+                if parsed is None or self._is_simple_string(parsed, body):
+                    continue
+
+                (results if len(stream) == 1 else documents).append({
+                    'content': parsed,
+                    'raw': f"---\n{body.strip()}" + ("\n..." if closed else ""),
+                    'valid': True,
+                    **self._marker_fields(text, offsets, start, end + 1 if closed else end)
+                })
+                for idx in range(start + 1, end + 1):
+                    lines[idx] = ''
+                    kinds[idx] = BLANK
+
+        return results + documents
+
+    def _marker_fields(self, text: str, offsets: List[int], first: int, last: int) -> Dict[str, Any]:
+        """
+        Method and offsets of a marker region spanning lines ``first``..``last``.
+
+        ``start_pos`` is a character offset into ``text``; ``start``/``end`` are
+        UTF-8 byte offsets (end exclusive), like the spans of
+        ``iter_file_sections``, so they can be handed to ``load_file_span``.
+        """
+        start_pos = offsets[first]
+        end_pos = offsets[last + 1] - 1 if last + 1 < len(offsets) else len(text)
+        start, end = start_pos, end_pos
+        if not text.isascii():
+            start = len(text[:start_pos].encode('utf-8', 'surrogatepass'))
+            end = start + len(text[start_pos:end_pos].encode('utf-8', 'surrogatepass'))
+        return {
+            'method': 'markers',
+            'start_pos': start_pos,
+            'start': start,
+            'end': end
+        }
+
+    def _extract_multiple_yaml_blocks(
+        self,
+        text: str,
+        tracker: Optional[BudgetTracker] = None
+    ) -> List[Dict[str, Any]]:
         """Extract multiple YAML blocks from text, even if separated by non-YAML content."""
+        tracker = tracker or self.budget.start()
         results = []
         lines = text.split('\n')
         current_block = []
@@ -92,8 +587,14 @@ class YAMLExtractor:
         block_start_idx = 0
         consecutive_non_yaml = 0
         max_non_yaml_lines = 2  # Allow up to 2 non-YAML lines before considering block ended
+        # budget checks of the open block, carried across its re-parses
+        block_check: Optional[SectionCheck] = None
 
         for i, line in enumerate(lines):
+            if not tracker.check_time():
+                # out of time: drop the open block and keep what was found
+                yaml_started = False
+                break
             stripped = line.strip()
 
             if not yaml_started:
@@ -139,7 +640,17 @@ class YAMLExtractor:
                     # This might not be YAML
                     # Try parsing what we have so far
                     yaml_text = '\n'.join(current_block).rstrip()
-                    parsed = self._safe_yaml_parse(yaml_text)
+                    if block_check is None or block_check.lines is not current_block:
+                        block_check = SectionCheck(
+                            self.budget, current_block, self.backend.compose_loader)
+                    if not tracker.admit_block(block_check, yaml_text):
+                        # over budget: abandon the block instead of re-parsing it as it grows
+                        yaml_started = False
+                        current_block = []
+                        indent_stack = []
+                        consecutive_non_yaml = 0
+                        continue
+                    parsed = self._parse_checked(block_check, yaml_text)
 
                     if parsed is not None and not self._is_simple_string(parsed, yaml_text):
                         # We have valid YAML, but current line doesn't continue it
@@ -187,7 +698,12 @@ class YAMLExtractor:
         # Check last block
         if yaml_started and current_block:
             yaml_text = '\n'.join(current_block).rstrip()
-            parsed = self._safe_yaml_parse(yaml_text)
+            if block_check is None or block_check.lines is not current_block:
+                block_check = SectionCheck(self.budget, current_block, self.backend.compose_loader)
+            parsed = (
+                self._parse_checked(block_check, yaml_text)
+                if tracker.admit_block(block_check, yaml_text) else None
+            )
             if parsed is not None and not self._is_simple_string(parsed, yaml_text):
                 if len(current_block) > 1 or self._is_structured_yaml(parsed):
                     results.append({
@@ -201,6 +717,322 @@ class YAMLExtractor:
 
         return results
 
+    def _extract_linear_blocks(
+        self,
+        lines: List[str],
+        kinds: array,
+        indents: array,
+        workers: Optional[int] = None,
+        tracker: Optional[BudgetTracker] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract YAML blocks from lines classified in a single pass.
+
+        Block boundaries are found in linear time from the classification and
+        each candidate block is parsed exactly once.
+        """
+        results = []
+        spans = find_block_spans(kinds, indents)
+        block_texts = [
+            '\n'.join(lines[start:end + 1]).rstrip() for start, end, _ in spans
+        ]
+
+        parsed_blocks = self._parse_blocks(block_texts, workers, tracker)
+        for (start, end, content_lines), yaml_text, parsed in zip(spans, block_texts, parsed_blocks):
+            section = self._build_block_section(
+                yaml_text, parsed, start, end, content_lines)
+            if section is not None:
+                results.append(section)
+
+        return results
+
+    def _parse_blocks(
+        self,
+        texts: List[str],
+        workers: Optional[int] = None,
+        tracker: Optional[BudgetTracker] = None
+    ) -> List[Optional[Any]]:
+        """
+        Parse independent candidate blocks, in a process pool when worthwhile.
+
+        Results are returned in input order; blocks rejected by the budget, or
+        left unparsed once the time budget ran out, come back as None. Parsing
+        stays serial for a single block, ``workers`` below 2, or less than
+        ``parallel_min_bytes`` in total.
+        """
+        tracker = tracker or self.budget.start()
+        if (
+            not workers or workers < 2 or len(texts) < 2
+            or sum(len(text) for text in texts) < self.parallel_min_bytes
+        ):
+            return [
+                self._safe_yaml_parse(text, tracker) if tracker.check_time() else None
+                for text in texts
+            ]
+
+        admitted = [index for index, text in enumerate(texts) if tracker.admit_text(text)]
+        results: List[Optional[Any]] = [None] * len(texts)
+        if not admitted or not tracker.check_time():
+            return results
+
+        self.parse_calls += len(admitted)
+        chunksize = max(1, len(admitted) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(admitted))) as pool:
+            parsed = pool.map(
+                partial(_parse_with_backend, self.backend),
+                [texts[index] for index in admitted],
+                chunksize=chunksize
+            )
+            for index, content in zip(admitted, parsed):
+                results[index] = content
+        tracker.check_time()
+        return results
+
+    def _build_block_section(
+        self,
+        yaml_text: str,
+        parsed: Optional[Any],
+        start: int,
+        end: int,
+        content_lines: int
+    ) -> Optional[Dict[str, Any]]:
+        """Build a section from a parsed candidate block, or None if rejected."""
+        if not self._is_block_content(parsed, yaml_text, content_lines):
+            return None
+
+        return {
+            'content': parsed,
+            'raw': yaml_text,
+            'method': 'line_scan',
+            'valid': True,
+            'start_line': start,
+            'end_line': end
+        }
+
+    def iter_yaml_sections(
+        self,
+        stream: Union[IO[str], Iterable[str], str],
+        deduplicate: bool = True,
+        root_key: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily extract YAML sections from a file object or any iterable of lines.
+
+        Lines are classified as they arrive with the 'linear' engine rules and each
+        section is yielded as soon as the line that closes it has been read, so
+        memory stays bounded by the largest section rather than the input size.
+        Document markers (``---``/``...``) act as block boundaries.
+
+        Args:
+            stream: Text file object, iterable of lines (with or without newlines),
+                or a string (iterated line by line without splitting it up front)
+            deduplicate: Skip sections whose content fingerprint was already yielded
+            root_key: Only parse and yield blocks whose top-level mapping has this
+                key; other blocks are skipped on a textual check without parsing
+
+        Yields:
+            Section dictionaries with the same keys as ``extract_yaml_sections``
+        """
+        if isinstance(stream, str):
+            stream = io.StringIO(stream)
+
+        tracker = self.budget.start()
+        assembler = SectionAssembler(
+            self, deduplicate=deduplicate, root_key=root_key, tracker=tracker)
+        for line in stream:
+            section = assembler.push(line.rstrip('\n').rstrip('\r'))
+            if section is not None:
+                yield section
+            if tracker.exhausted or not tracker.check_time():
+                return
+
+        section = assembler.finish()
+        if section is not None:
+            yield section
+
+    def find_section(
+        self,
+        text: Union[str, IO[str], Iterable[str]],
+        root_key: str = "REFERENCES"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the first YAML section whose top-level mapping contains ``root_key``.
+
+        Lines are scanned lazily with the 'linear' rules and only blocks that
+        carry ``root_key`` at their top level are parsed; scanning stops at the
+        first match, so a reference block near the top of a long document is
+        found without reading the rest.
+
+        Args:
+            text: String, text file object, or iterable of lines
+            root_key: Top-level key to look for
+
+        Returns:
+            The matching section dictionary, or None if no section has the key
+        """
+        sections = self.iter_yaml_sections(text, deduplicate=False, root_key=root_key)
+        try:
+            return next(sections, None)
+        finally:
+            sections.close()
+
+    def _claim_fingerprint(
+        self,
+        section: Dict[str, Any],
+        seen_fingerprints: set,
+        deduplicate: bool
+    ) -> bool:
+        """Attach the content fingerprint; return False if it was already seen."""
+        fingerprint = self.content_fingerprint(section['content'])
+        if deduplicate:
+            if fingerprint in seen_fingerprints:
+                return False
+            seen_fingerprints.add(fingerprint)
+        section['fingerprint'] = fingerprint
+        return True
+
+    def iter_file_spans(self, path: Union[str, Path]) -> Iterator[Dict[str, int]]:
+        """
+        Scan a memory-mapped file for YAML block boundaries without parsing them.
+
+        Lines are located in the mapped buffer and decoded one at a time for
+        classification, so the file is never decoded into a single string.
+
+        Args:
+            path: Path to a UTF-8 text file
+
+        Yields:
+            Span dictionaries with byte offsets ``start``/``end`` (end exclusive),
+            ``start_line``/``end_line`` and ``content_lines``
+        """
+        with open(path, 'rb') as handle:
+            if not handle.seek(0, 2):
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield from self._scan_buffer_spans(buffer)
+
+    def _scan_buffer_spans(self, buffer: Any) -> Iterator[Dict[str, int]]:
+        """Run the block scanner over a bytes-like buffer, tracking byte offsets."""
+        scanner = BlockScanner()
+        size = len(buffer)
+        block_start = 0
+        block_end = 0
+        pos = 0
+        idx = 0
+
+        def span(closed: Tuple[int, int, int]) -> Dict[str, int]:
+            return {
+                'start': block_start,
+                'end': block_end,
+                'start_line': closed[0],
+                'end_line': closed[1],
+                'content_lines': closed[2]
+            }
+
+        while pos < size:
+            newline = buffer.find(b'\n', pos)
+            line_end = size if newline < 0 else newline
+            content_end = line_end
+            if content_end > pos and buffer[content_end - 1] == 0x0D:
+                content_end -= 1
+
+            line = buffer[pos:content_end].decode('utf-8', errors='replace')
+            kind, indent = classify_line(line)
+            closed = scanner.step(idx, kind, indent)
+            if closed is not None:
+                yield span(closed)
+
+            if scanner.is_open:
+                if scanner.start == idx:
+                    block_start = pos
+                if scanner.last == idx:
+                    block_end = content_end
+
+            pos = line_end + 1
+            idx += 1
+
+        closed = scanner.finish()
+        if closed is not None:
+            yield span(closed)
+
+    def iter_file_sections(
+        self,
+        path: Union[str, Path],
+        deduplicate: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Extract YAML sections from a memory-mapped file.
+
+        Only the bytes of each candidate block are decoded and parsed. Sections
+        carry the same keys as ``iter_yaml_sections`` plus exact byte offsets
+        ``start``/``end`` that can be handed to ``load_file_span`` later.
+
+        Args:
+            path: Path to a UTF-8 text file
+            deduplicate: Skip sections whose content fingerprint was already yielded
+
+        Yields:
+            Section dictionaries in document order
+        """
+        seen_fingerprints = set()
+        tracker = self.budget.start()
+        with open(path, 'rb') as handle:
+            if not handle.seek(0, 2):
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for span in self._scan_buffer_spans(buffer):
+                    if not tracker.check_time():
+                        return
+                    yaml_text = buffer[span['start']:span['end']].decode('utf-8').rstrip()
+                    section = self._build_block_section(
+                        yaml_text,
+                        self._safe_yaml_parse(yaml_text, tracker),
+                        span['start_line'],
+                        span['end_line'],
+                        span['content_lines']
+                    )
+                    if section is None:
+                        continue
+                    if not self._claim_fingerprint(section, seen_fingerprints, deduplicate):
+                        continue
+                    if not tracker.admit_section():
+                        return
+                    section['start'] = span['start']
+                    section['end'] = span['end']
+                    yield section
+
+    def load_file_span(self, path: Union[str, Path], start: int, end: int) -> Optional[Any]:
+        """
+        Decode and parse only the byte range ``[start, end)`` of a file.
+
+        Args:
+            path: Path to a UTF-8 text file
+            start: Byte offset of the region start
+            end: Byte offset of the region end (exclusive)
+
+        Returns:
+            Parsed YAML content, or None if the region is not valid YAML
+        """
+        with open(path, 'rb') as handle:
+            handle.seek(start)
+            data = handle.read(end - start)
+        return self._safe_yaml_parse(data.decode('utf-8'))
+
+    def _is_block_content(self, parsed: Any, yaml_text: str, content_lines: int) -> bool:
+        """Check if a parsed candidate block should be reported as a YAML section."""
+        if parsed is None or self._is_simple_string(parsed, yaml_text):
+            return False
+
+        if content_lines > 1:
+            return self._is_structured_yaml(parsed)
+
+        # A single line such as "Note: see below" is usually prose; keep it only
+        # when it carries a nested collection (e.g. "COLUMNS: [a, b]").
+        if not isinstance(parsed, (dict, list)):
+            return False
+        values = parsed.values() if isinstance(parsed, dict) else parsed
+        return any(isinstance(value, (dict, list)) for value in values)
+
     def _looks_like_yaml_start(
             self,
             line: str,
@@ -411,27 +1243,27 @@ class YAMLExtractor:
             return True  # Multi-line string
         return False
 
-    def _safe_yaml_parse(self, text: str) -> Optional[Any]:
-        """Safely parse YAML content."""
-        if not text or not text.strip():
-            return None
-
-        try:
-            # Try to load as YAML
-            result = yaml.safe_load(text)
-            return result
-        except yaml.YAMLError:
-            # Try with safe_load_all for multiple documents
-            try:
-                documents = list(yaml.safe_load_all(text))
-                if len(documents) == 1:
-                    return documents[0]
-                elif len(documents) > 1:
-                    return documents
-            except yaml.YAMLError:
-                pass
-
-        return None
+    def _safe_yaml_parse(self, text: str, tracker: Optional[BudgetTracker] = None) -> Optional[Any]:
+        """Safely parse YAML content, skipping it when it exceeds a per-section budget."""
+        if self.budget.limits_sections:
+            tracker = tracker or self.budget.start()
+            check = SectionCheck(self.budget, text.split('\n'), self.backend.compose_loader)
+            if not tracker.admit_block(check, text):
+                return None
+            return self._parse_checked(check, text)
+        return self._parse_admitted(text)
+
+    def _parse_admitted(self, text: str) -> Optional[Any]:
+        """Parse text that already passed the budget checks, counting the call."""
+        self.parse_calls += 1
+        return _parse_with_backend(self.backend, text)
+
+    def _parse_checked(self, check: SectionCheck, text: str) -> Optional[Any]:
+        """Parse text that passed ``check``, reusing the composition its alias check made."""
+        if check.composition is None:
+            return self._parse_admitted(text)
+        self.parse_calls += 1
+        return check.composition.construct()
 
     def validate_yaml(self, text: str) -> Tuple[bool, Optional[str]]:
         """
@@ -443,8 +1275,9 @@ class YAMLExtractor:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        self.parse_calls += 1
         try:
-            yaml.safe_load(text)
+            self.backend.load(text)
             return True, None
         except yaml.YAMLError as e:
             return False, str(e)
@@ -453,6 +1286,7 @@ class YAMLExtractor:
     def extract_and_validate(
         self,
         text: str,
+        workers: Optional[int] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         """
@@ -460,18 +1294,161 @@ class YAMLExtractor:
 
         Args:
             text: String potentially containing YAML
+            workers: Process pool size for parsing candidate blocks; needs the
+                'linear' engine (see extract_yaml_sections)
             kwargs: mode, Literal['silent', 'log', 'attach'], optional
 
         Returns:
-            Dictionary with extraction results and validation status
+            Dictionary with extraction results and validation status; ``truncated``
+            names the budget that cut the result short ('truncate' mode), else None.
+            With a cache, ``sections`` are read-only as in extract_yaml_sections.
         """
-        sections = self.extract_yaml_sections(text)
+        if self.cache is None:
+            tracker = self.budget.start()
+            sections = self._extract_sections(text, tracker, workers=workers)
+            summary, truncated = self._generate_summary(sections), tracker.truncated
+        else:
+            frozen, summary, truncated = self._extract_cached(text, None, workers)
+            sections = list(frozen)
 
         return {
             'found_yaml': len(sections) > 0,
             'num_sections': len(sections),
             'sections': sections,
-            'summary': self._generate_summary(sections)
+            'summary': summary,
+            'truncated': truncated
+        }
+
+    def extract_many(
+        self,
+        documents: Iterable[Union[str, os.PathLike]],
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        ordered: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run ``extract_and_validate`` over many documents, optionally in a process pool.
+
+        Each worker process receives a copy of this extractor once, at start-up,
+        and reuses it for every document. Documents are read lazily and only a
+        few chunks per worker are in flight at a time.
+
+        Args:
+            documents: Texts (``str``) or file paths (``pathlib.Path`` / ``os.PathLike``,
+                read as UTF-8 in the worker)
+            workers: Process pool size; ``None`` or below 2 runs in this process
+            chunksize: Documents sent to a worker per task
+            ordered: Yield results in input order, or as soon as each chunk completes
+
+        Yields:
+            ``extract_and_validate`` results with ``index`` (input position),
+            ``source`` (file path or None) and ``error`` (message if the document
+            could not be read or processed, else None)
+        """
+        indexed = enumerate(documents)
+
+        if not workers or workers < 2:
+            for index, item in indexed:
+                yield self._extract_document(index, item)
+            return
+
+        chunks = iter(lambda: list(islice(indexed, max(1, chunksize))), [])
+        window = workers * 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_extract_worker,
+            initargs=(self,)
+        ) as pool:
+            pending = deque(
+                pool.submit(_extract_chunk, chunk) for chunk in islice(chunks, window))
+            try:
+                while pending:
+                    if ordered:
+                        done = [pending.popleft()]
+                    else:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        done = [future for future in pending if future in finished]
+                        pending = deque(future for future in pending if future not in finished)
+
+                    for future in done:
+                        yield from future.result()
+                    for chunk in islice(chunks, window - len(pending)):
+                        pending.append(pool.submit(_extract_chunk, chunk))
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _extract_document(self, index: int, document: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """Extract one ``extract_many`` document, recording errors instead of raising."""
+        source = os.fspath(document) if isinstance(document, os.PathLike) else None
+        try:
+            text = Path(source).read_text(encoding='utf-8') if source is not None else document
+            result = self.extract_and_validate(text)
+            result['error'] = None
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            result = {
+                'found_yaml': False,
+                'num_sections': 0,
+                'sections': [],
+                'summary': self._generate_summary([]),
+                'truncated': None,
+                'error': str(e)
+            }
+        result['index'] = index
+        result['source'] = source
+        return result
+
+    def summarize_many(self, results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aggregate ``extract_many`` results into batch statistics.
+
+        Args:
+            results: Results yielded by ``extract_many`` (consumed once)
+
+        Returns:
+            Dictionary with document/section counts, sections per method and
+            content type, failed and truncated document indices, and a text summary
+        """
+        documents = 0
+        with_yaml = 0
+        total_sections = 0
+        methods = Counter()
+        content_types = Counter()
+        errors = []
+        truncated = []
+
+        for result in results:
+            documents += 1
+            if result.get('error'):
+                errors.append(result['index'])
+                continue
+            if result.get('truncated'):
+                truncated.append(result['index'])
+            if result['found_yaml']:
+                with_yaml += 1
+            total_sections += result['num_sections']
+            for section in result['sections']:
+                methods[section['method']] += 1
+                content_types[type(section['content']).__name__] += 1
+
+        summary = (
+            f"Processed {documents} document(s): {with_yaml} with YAML, "
+            f"{total_sections} section(s), {len(errors)} failed\n"
+        )
+        for method, count in methods.most_common():
+            summary += f"  Method {method}: {count}\n"
+        for content_type, count in content_types.most_common():
+            summary += f"  Type {content_type}: {count}\n"
+
+        return {
+            'num_documents': documents,
+            'documents_with_yaml': with_yaml,
+            'num_sections': total_sections,
+            'sections_by_method': dict(methods),
+            'sections_by_type': dict(content_types),
+            'errors': errors,
+            'truncated': truncated,
+            'summary': summary
         }
 
     def _generate_summary(self, sections: List[Dict[str, Any]]) -> str:
@@ -505,3 +1482,104 @@ class YAMLExtractor:
                 summary += f"     Location: Lines {section['start_line']}-{section['end_line']}\n"
 
         return summary
+
+
+class SectionAssembler:
+    """
+    Push-based assembler that turns lines into YAML sections one line at a time.
+
+    It keeps only the lines of the currently open block, so callers can feed it
+    from files, iterators or network chunks without holding the whole text.
+    """
+
+    def __init__(
+        self,
+        extractor: YAMLExtractor,
+        deduplicate: bool = True,
+        root_key: Optional[str] = None,
+        tracker: Optional[BudgetTracker] = None
+    ):
+        """
+        Args:
+            extractor: Extractor used to parse and validate closed blocks.
+            deduplicate: Skip sections whose content fingerprint was already emitted.
+            root_key: Only parse and emit blocks whose top-level mapping has this key.
+            tracker: Budget tracker shared by the whole input; defaults to a new
+                one from the extractor's budget.
+        """
+        self.extractor = extractor
+        self.tracker = tracker or extractor.budget.start()
+        self.deduplicate = deduplicate
+        self.root_key = root_key
+        self.line_count = 0
+        self._scanner = BlockScanner()
+        self._seen_fingerprints = set()
+        # lines from the start of the open block up to the current line
+        self._buffer: List[str] = []
+        self._buffer_start = 0
+        # whether the open block has root_key among its top-level keys
+        self._has_root_key = False
+
+    def push(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Classify one line (without its newline) and advance the scanner.
+
+        Returns:
+            The section closed by this line, if any.
+        """
+        idx = self.line_count
+        self.line_count += 1
+
+        scanner = self._scanner
+        kind, indent = classify_line(line)
+        closed = scanner.step(idx, kind, indent)
+
+        section = None
+        if closed is not None:
+            section = self._emit(closed)
+            self._buffer = []
+
+        if scanner.is_open:
+            if not self._buffer:
+                self._buffer_start = scanner.start
+                self._has_root_key = False
+            self._buffer.append(line)
+            if (
+                self.root_key is not None and not self._has_root_key
+                and kind == KEY and indent == scanner.base_indent
+            ):
+                self._has_root_key = line_root_key(line) == self.root_key
+
+        return section
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Close the block left open at the end of the input, if any."""
+        closed = self._scanner.finish()
+        if closed is None:
+            return None
+        section = self._emit(closed)
+        self._buffer = []
+        return section
+
+    def _emit(self, span: Tuple[int, int, int]) -> Optional[Dict[str, Any]]:
+        """Parse a closed block and build its section, or None if rejected."""
+        if self.root_key is not None and not self._has_root_key:
+            return None
+
+        extractor = self.extractor
+        start, end, content_lines = span
+        yaml_text = '\n'.join(
+            self._buffer[start - self._buffer_start:end - self._buffer_start + 1]).rstrip()
+        section = extractor._build_block_section(
+            yaml_text, extractor._safe_yaml_parse(yaml_text, self.tracker),
+            start, end, content_lines)
+        if section is None:
+            return None
+        if self.root_key is not None and not (
+                isinstance(section['content'], dict) and self.root_key in section['content']):
+            return None
+        if not extractor._claim_fingerprint(section, self._seen_fingerprints, self.deduplicate):
+            return None
+        if not self.tracker.admit_section():
+            return None
+        return section
@@ -0,0 +1,318 @@
+# import libs
+import re
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+# NOTE: line kinds (stored as unsigned bytes in the classification array)
+BLANK = 0
+COMMENT = 1
+KEY = 2
+LIST_ITEM = 3
+PROSE = 4
+DOC_START = 5
+DOC_END = 6
+CONTINUATION = 7
+
+# NOTE: kinds that may open a YAML block
+BLOCK_OPENERS = (KEY, LIST_ITEM)
+
+# NOTE: a mapping key followed by ': ' or ':' at end of line (plain or quoted key)
+KEY_PATTERN = re.compile(
+    r'(?:([A-Za-z_][\w\-]*)|"([^"\n]*)"|\'([^\'\n]*)\')[ \t]*:(?:[ \t]|$)'
+)
+
+# NOTE: first characters that keep a non-indented line inside an open block
+FLOW_STARTS = ('"', "'", '{', '[', ']', '}', '|', '>')
+
+# Span = (first line index, last content line index, number of content lines)
+BlockSpan = Tuple[int, int, int]
+
+# NOTE: opening line of a Markdown code fence and its info string
+FENCE_PATTERN = re.compile(r' {0,3}(`{3,}|~{3,})[ \t]*([^\s`{]*)')
+
+# NOTE: document marker kinds as bytes, for scanning the classification array
+MARKER_KINDS = re.compile(bytes([ord('['), DOC_START, DOC_END, ord(']')]))
+
+# NOTE: line breaks, for computing line offsets
+NEWLINE = re.compile(r'\n')
+
+# Fence = (opening line index, closing line index or len(lines), lowercase tag)
+FenceSpan = Tuple[int, int, str]
+
+
+def classify_line(line: str) -> Tuple[int, int]:
+    """
+    Classify a single line of text.
+
+    Args:
+        line: Line without its trailing newline.
+
+    Returns:
+        Tuple of (kind, indent) where kind is one of the module line kinds.
+    """
+    stripped = line.strip()
+    if not stripped:
+        return BLANK, 0
+
+    indent = len(line) - len(line.lstrip())
+    first = stripped[0]
+
+    if first == '#':
+        return COMMENT, indent
+
+    if indent == 0:
+        if stripped == '---':
+            return DOC_START, 0
+        if stripped == '...':
+            return DOC_END, 0
+
+    if first == '-' and (len(stripped) == 1 or stripped[1] in ' \t'):
+        return LIST_ITEM, indent
+
+    match = KEY_PATTERN.match(stripped)
+    if match:
+        key = match.group(1)
+        # single letter plain keys at the top level are usually prose ("A: ...")
+        if key is None or len(key) > 1 or indent > 0:
+            return KEY, indent
+
+    if indent > 0 or first in FLOW_STARTS:
+        return CONTINUATION, indent
+
+    return PROSE, 0
+
+
+def root_key(line: str) -> Optional[str]:
+    """Return the mapping key of a key line (without quotes), or None."""
+    match = KEY_PATTERN.match(line.strip())
+    if not match:
+        return None
+    return next(group for group in match.groups() if group is not None)
+
+
+def peek_root_keys(
+    lines: List[str],
+    kinds: array,
+    indents: array,
+    start: int,
+    end: int
+) -> Tuple[str, ...]:
+    """
+    Collect the top-level mapping keys of a block without parsing it.
+
+    Only key lines at the block's opening indent are inspected.
+    """
+    base_indent = indents[start]
+    keys = []
+    for idx in range(start, end + 1):
+        if kinds[idx] == KEY and indents[idx] == base_indent:
+            key = root_key(lines[idx])
+            if key is not None:
+                keys.append(key)
+    return tuple(keys)
+
+
+def classify_lines(lines: Iterable[str]) -> Tuple[array, array]:
+    """
+    Classify every line once into compact kind/indent arrays.
+
+    Args:
+        lines: Lines of the document without trailing newlines.
+
+    Returns:
+        Tuple of (kinds, indents) arrays aligned with the input lines.
+    """
+    kinds = array('B')
+    indents = array('I')
+    for line in lines:
+        kind, indent = classify_line(line)
+        kinds.append(kind)
+        indents.append(indent)
+    return kinds, indents
+
+
+class BlockScanner:
+    """
+    Incremental state machine that finds YAML block boundaries from classified lines.
+
+    A block opens on a key or list item, keeps every indented line, key, list item,
+    comment and blank line, and closes on top-level prose, a document marker, a
+    dedent below the indentation it opened at, or a switch between mapping and
+    sequence at that indentation which YAML cannot continue (a key after list
+    items, or list items after a blank line). Each line is visited exactly once.
+    """
+
+    def __init__(self):
+        self.start = -1
+        self.last = -1
+        self.base_indent = 0
+        self.base_kind = BLANK
+        self.content_lines = 0
+        self.gap = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a block is currently being accumulated."""
+        return self.start >= 0
+
+    def step(self, idx: int, kind: int, indent: int) -> Optional[BlockSpan]:
+        """
+        Advance the machine by one classified line.
+
+        Returns:
+            The span of the block closed by this line, if any.
+        """
+        if not self.is_open:
+            if kind in BLOCK_OPENERS:
+                self._open(idx, kind, indent)
+            return None
+
+        if kind == BLANK:
+            self.gap = True
+            return None
+
+        if kind == COMMENT:
+            return None
+
+        if kind in BLOCK_OPENERS:
+            if indent < self.base_indent or self._switches_shape(kind, indent):
+                closed = self._close()
+                self._open(idx, kind, indent)
+                return closed
+            self._extend(idx)
+            return None
+
+        if kind == CONTINUATION:
+            self._extend(idx)
+            return None
+
+        # prose or a document marker ends the block
+        return self._close()
+
+    def finish(self) -> Optional[BlockSpan]:
+        """Close the block left open at the end of the input, if any."""
+        if not self.is_open:
+            return None
+        return self._close()
+
+    def _switches_shape(self, kind: int, indent: int) -> bool:
+        """Check if a line at the base indent starts a different collection."""
+        if indent != self.base_indent or kind == self.base_kind:
+            return False
+        # "key:" followed by "- item" at the same indent is valid YAML
+        return kind == KEY or self.gap
+
+    def _open(self, idx: int, kind: int, indent: int) -> None:
+        self.start = idx
+        self.last = idx
+        self.base_indent = indent
+        self.base_kind = kind
+        self.content_lines = 1
+        self.gap = False
+
+    def _extend(self, idx: int) -> None:
+        self.last = idx
+        self.content_lines += 1
+        self.gap = False
+
+    def _close(self) -> BlockSpan:
+        span = (self.start, self.last, self.content_lines)
+        self.start = -1
+        self.last = -1
+        self.base_indent = 0
+        self.base_kind = BLANK
+        self.content_lines = 0
+        self.gap = False
+        return span
+
+
+def find_block_spans(kinds: array, indents: array) -> List[BlockSpan]:
+    """
+    Find YAML block boundaries in a single linear pass over classified lines.
+
+    Args:
+        kinds: Line kinds produced by ``classify_lines``.
+        indents: Line indents produced by ``classify_lines``.
+
+    Returns:
+        List of (start_line, end_line, content_lines) spans in document order.
+    """
+    scanner = BlockScanner()
+    spans: List[BlockSpan] = []
+    for idx in range(len(kinds)):
+        closed = scanner.step(idx, kinds[idx], indents[idx])
+        if closed is not None:
+            spans.append(closed)
+
+    closed = scanner.finish()
+    if closed is not None:
+        spans.append(closed)
+    return spans
+
+
+def find_fences(lines: List[str]) -> List[FenceSpan]:
+    """
+    Find Markdown code fences (``` or ~~~) in one pass over the lines.
+
+    A fence closes on a line made only of the same fence character, at least as
+    long as the opening run; an unclosed fence runs to the end of the input.
+
+    Returns:
+        List of (open line, close line, tag) where tag is the lowercased first
+        word of the info string ('' for untagged fences)
+    """
+    fences = []
+    open_idx = None
+    marker = ''
+    tag = ''
+    for idx, line in enumerate(lines):
+        stripped = line.lstrip(' ')
+        if stripped[:3] not in ('```', '~~~'):
+            continue
+
+        if open_idx is None:
+            match = FENCE_PATTERN.match(line)
+            if match:
+                open_idx, marker, tag = idx, match.group(1), match.group(2).lower()
+            continue
+
+        closing = stripped.rstrip()
+        if len(closing) >= len(marker) and closing == marker[0] * len(closing):
+            fences.append((open_idx, idx, tag))
+            open_idx = None
+
+    if open_idx is not None:
+        fences.append((open_idx, len(lines), tag))
+    return fences
+
+
+def find_marker_spans(kinds: array) -> List[Tuple[int, int, bool]]:
+    """
+    Find marker-delimited document regions in classified lines.
+
+    A region opens at a ``---`` line and runs to the next ``...`` line, the
+    next ``---`` line or the end of the input. Regions never overlap.
+
+    Returns:
+        List of (``---`` line, last body line, closed by ``...``)
+    """
+    spans = []
+    open_idx = None
+    for found in MARKER_KINDS.finditer(kinds.tobytes()):
+        idx = found.start()
+        if kinds[idx] == DOC_START:
+            if open_idx is not None:
+                spans.append((open_idx, idx - 1, False))
+            open_idx = idx
+        elif open_idx is not None:
+            spans.append((open_idx, idx - 1, True))
+            open_idx = None
+
+    if open_idx is not None:
+        spans.append((open_idx, len(kinds) - 1, False))
+    return spans
+
+
+def line_offsets(text: str) -> List[int]:
+    """Character offset of the start of every line of ``text``."""
+    return [0] + [found.end() for found in NEWLINE.finditer(text)]
@@ -0,0 +1,76 @@
+# import libs
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# NOTE: sentinel for content that has not been parsed yet
+_UNPARSED = object()
+
+
+class LazyYAMLSection(Mapping):
+    """
+    Read-only YAML section that parses its ``content`` on first access.
+
+    It behaves like the section dictionaries returned by ``YAMLExtractor`` but
+    only holds the raw block text and a cheap textual peek at its top-level keys
+    until ``content``, ``valid`` or ``fingerprint`` is read.
+    """
+
+    def __init__(
+        self,
+        raw: str,
+        parse: Callable[[], Optional[Any]],
+        fingerprint: Callable[[Any], str],
+        root_keys: Tuple[str, ...],
+        fields: Dict[str, Any]
+    ):
+        """
+        Args:
+            raw: Raw YAML text of the section.
+            parse: Callable returning the parsed content, or None when rejected.
+            fingerprint: Callable building the content fingerprint.
+            root_keys: Top-level mapping keys found without parsing.
+            fields: Remaining section metadata (method, line/byte positions).
+        """
+        self._parse = parse
+        self._fingerprint = fingerprint
+        self._content = _UNPARSED
+        self._fingerprint_value: Optional[str] = None
+        self.root_keys = root_keys
+        self._fields = {'raw': raw, **fields}
+        self._keys = ('content', 'valid', 'fingerprint', *self._fields)
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the content has already been parsed."""
+        return self._content is not _UNPARSED
+
+    def materialize(self) -> Optional[Any]:
+        """Parse the section (once) and return its content."""
+        if self._content is _UNPARSED:
+            self._content = self._parse()
+            self._parse = None
+        return self._content
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'content':
+            return self.materialize()
+        if key == 'valid':
+            return self.materialize() is not None
+        if key == 'fingerprint':
+            if self._fingerprint_value is None:
+                self._fingerprint_value = self._fingerprint(self.materialize())
+            return self._fingerprint_value
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        state = 'parsed' if self.is_materialized else 'unparsed'
+        return (
+            f"LazyYAMLSection(method={self._fields.get('method')!r}, "
+            f"root_keys={self.root_keys!r}, {state})"
+        )
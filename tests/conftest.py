@@ -0,0 +1,116 @@
+# import libs
+import json
+import pytest
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# NOTE: reference text shared by the tests (two tables, one with equations)
+REFERENCE_TEXT = """\
+REFERENCES:
+  CUSTOM-REF-1:
+    DATABOOK-ID: 1
+    TABLES:
+      general-data:
+        TABLE-ID: 1
+        DESCRIPTION:
+          General data of a few components.
+        STRUCTURE:
+          COLUMNS: [No.,Name,Formula,State,MW,Tc]
+          SYMBOL: [None,None,None,None,MW,Tc]
+          UNIT: [None,None,None,None,g/mol,K]
+          CONVERSION: [None,None,None,None,1,1]
+        VALUES:
+          - [1,'carbon dioxide','CO2','g',44.01,304.21]
+          - [2,'methane','CH4','g',16.04,190.56]
+          - [3,'water','H2O','l',18.015,647.1]
+          - [4,'nitrogen','N2','g',28.014,126.2]
+          - [5,'ethanol','C2H5OH','l',46.07,513.9]
+      vapor-pressure:
+        TABLE-ID: 2
+        DESCRIPTION:
+          Vapor pressure equation.
+        EQUATIONS:
+          EQ-1:
+            BODY:
+              - parms['A'] = args['A']/1
+              - res['vapor-pressure | VaPr | Pa'] = math.exp(parms['A'] - args['B']/args['T'])
+            BODY-INTEGRAL:
+              None
+            ARGS:
+              T: {name: temperature, symbol: T, unit: K}
+            RETURNS:
+              VaPr: {name: vapor-pressure, symbol: VaPr, unit: Pa}
+        STRUCTURE:
+          COLUMNS: [No.,Name,Formula,State,A,B,Eq]
+          SYMBOL: [None,None,None,None,A,B,VaPr]
+          UNIT: [None,None,None,None,1,1,Pa]
+          CONVERSION: [None,None,None,None,1,1,1]
+        VALUES:
+          - [1,'carbon dioxide','CO2','g',22.5,3103.4,1]
+          - [2,'methane','CH4','g',20.2,1011.5,1]
+          - [3,'water','H2O','l',23.2,3816.4,1]
+          - [4,'nitrogen','N2','g',19.8,588.7,1]
+          - [5,'ethanol','C2H5OH','l',23.8,3803.9,1]
+"""
+
+# NOTE: mixed-format documents given to the extractors
+DOCUMENTS: Dict[str, str] = {
+    "plain": REFERENCE_TEXT,
+    "prose": f"Here is the reference data we use.\n\n{REFERENCE_TEXT}\nThat is all of it for now.\n",
+    "fenced": f"Intro text.\n\n```yaml\n{REFERENCE_TEXT}```\n\nOutro text.\n",
+    "markers": (
+        "Intro text here.\n---\nname: test\nvalues: [1, 2]\n...\n"
+        "More prose in between here.\n---\nfoo: bar\nbaz:\n  - 1\n  - 2\n"
+    ),
+    "mixed": (
+        "Here is config:\nserver:\n  host: localhost\n  port: 8080\n"
+        "That was the server config and now database.\n"
+        "database:\n  name: db\n  user: admin\n# comment\nEnd of document text goes here.\n"
+    ),
+    "list": "Items follow:\n- apple\n- banana\n- cherry\n\nDone listing the fruits now okay.\n",
+    "none": "Just a sentence without any structure at all.\nAnd another one.\n",
+}
+
+# NOTE: (component key, keys) filters whose baseline output is recorded in data/baseline.json
+FILTERS: List[Tuple[str, List[str]]] = [
+    ("Name-State", ["carbon dioxide-g"]),
+    ("Name-State", ["methane-g", "water-l"]),
+    ("Name-State", ["nitrogen-g", "ethanol-l", "argon-g"]),
+    ("Formula", ["CO2", "h2o"]),
+    ("Name-Formula-State", ["water-H2O-l"]),
+]
+
+# NOTE: outputs of the code before the performance work, for the inputs above
+BASELINE_PATH = Path(__file__).parent / "data" / "baseline.json"
+
+# NOTE: component sets filtered in the tests, as Name-State keys
+QUERIES: List[List[str]] = [
+    ["carbon dioxide-g"],
+    ["methane-g", "water-l"],
+    ["nitrogen-g", "ethanol-l", "argon-g"],
+]
+
+
+def filter_id(component_key: str, keys: List[str], case: Any) -> str:
+    """Key of a filter result in data/baseline.json."""
+    return f"{component_key}|{case}|{','.join(keys)}"
+
+
+@pytest.fixture(scope="session")
+def baseline() -> Dict[str, Any]:
+    """Recorded baseline outputs (see BASELINE_PATH)."""
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def reference_text() -> str:
+    """Reference YAML document."""
+    return REFERENCE_TEXT
+
+
+@pytest.fixture
+def reference_file(tmp_path: Path) -> Path:
+    """Reference YAML document written to a temporary file."""
+    path = tmp_path / "reference.yml"
+    path.write_text(REFERENCE_TEXT, encoding="utf-8")
+    return path
@@ -0,0 +1,131 @@
+# import libs
+import copy as copy_module
+import pytest
+import yaml
+from pathlib import Path
+# locals
+from pythermodb_settings.references import component_extractor
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_cache import ReferenceCache
+from pythermodb_settings.references.sqlite_store import SQLiteReferenceStore, import_reference_to_sqlite
+from conftest import FILTERS, QUERIES, REFERENCE_TEXT, filter_id
+
+
+def _containers(value) -> dict:
+    """Every dict and list in a nested value, by id."""
+    found = {}
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (dict, list)):
+            found[id(item)] = item
+            stack.extend(item.values() if isinstance(item, dict) else item)
+    return found
+
+
+def _entry_points(reference_file: Path):
+    """Callables filtering the reference through each public entry point."""
+    def from_text(keys, **kwargs):
+        return ComponentExtractor().filter_components(REFERENCE_TEXT, keys, **kwargs)
+
+    def from_file(keys, **kwargs):
+        return ComponentExtractor().filter_components_from_file(reference_file, keys, **kwargs)
+
+    def from_stream(keys, **kwargs):
+        return ComponentExtractor().filter_components_from_file(
+            reference_file, keys, stream=True, **kwargs)
+
+    def from_cached_file(keys, **kwargs):
+        return ComponentExtractor(reference_cache=ReferenceCache()).filter_components_from_file(
+            reference_file, keys, **kwargs)
+
+    def from_loaded(keys, **kwargs):
+        extractor = ComponentExtractor()
+        extractor.load_ref(str(reference_file))
+        return extractor.filter_components_from_data(None, keys, **kwargs)
+
+    return [from_text, from_file, from_stream, from_cached_file, from_loaded]
+
+
+@pytest.mark.parametrize("case", [None, "upper"])
+@pytest.mark.parametrize("component_key, keys", FILTERS)
+def test_filter_matches_baseline(
+        baseline: dict, reference_file: Path, component_key: str, keys: list, case):
+    expected = baseline["filter_components"][filter_id(component_key, keys, case)]
+    for entry_point in _entry_points(reference_file):
+        for copy in (True, False):
+            result = entry_point(keys, component_key=component_key, case=case, copy=copy)
+            assert result["yaml"] == expected, entry_point.__name__
+            assert result["data"] == yaml.safe_load(expected), entry_point.__name__
+
+
+def test_copy_only_shared_references(monkeypatch, reference_file: Path):
+    copied = []
+    deepcopy = component_extractor.deepcopy
+
+    def record(value):
+        copied.append(value)
+        return deepcopy(value)
+
+    monkeypatch.setattr(component_extractor, "deepcopy", record)
+    for entry_point in _entry_points(reference_file):
+        del copied[:]
+        result = entry_point(["water-l"], component_key="Name-State")
+        # references parsed in the call are handed out as is
+        shared = entry_point.__name__ in ("from_cached_file", "from_loaded")
+        assert copied == ([result["data"]] if shared else []), entry_point.__name__
+
+    del copied[:]
+    ComponentExtractor().filter_components_from_data(REFERENCE_TEXT, ["water-l"], component_key="Name-State")
+    assert copied == []
+
+
+@pytest.mark.parametrize("renumber", [True, False])
+def test_copy_is_independent(reference_text: str, renumber: bool):
+    reference = yaml.safe_load(reference_text)
+    result = ComponentExtractor().filter_components_from_data(
+        reference, ["water-l", "ethanol-l"], component_key="Name-State", renumber=renumber)
+    assert not set(_containers(result["data"])) & set(_containers(reference))
+
+
+@pytest.mark.parametrize("renumber", [True, False])
+def test_shared_filter_leaves_reference_unchanged(reference_text: str, renumber: bool):
+    reference = yaml.safe_load(reference_text)
+    original = copy_module.deepcopy(reference)
+    result = ComponentExtractor().filter_components_from_data(
+        reference, ["water-l", "ethanol-l"], component_key="Name-State",
+        renumber=renumber, copy=False)
+    assert reference == original
+
+    tables = result["data"]["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]
+    source = reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]
+    # untouched subtrees are shared; the containers that were filtered are new
+    assert tables["general-data"]["STRUCTURE"] is source["general-data"]["STRUCTURE"]
+    assert tables["vapor-pressure"]["EQUATIONS"] is source["vapor-pressure"]["EQUATIONS"]
+    assert tables["general-data"]["VALUES"] is not source["general-data"]["VALUES"]
+    assert [row[:2] for row in tables["general-data"]["VALUES"]] == [[3, "water"], [5, "ethanol"]]
+
+
+@pytest.mark.parametrize("copy", [True, False])
+@pytest.mark.parametrize("case", [None, "upper"])
+def test_batch_matches_single_filters(reference_text: str, tmp_path: Path, copy: bool, case):
+    reference = yaml.safe_load(reference_text)
+    queries = QUERIES + [QUERIES[0]]
+    extractor = ComponentExtractor()
+    expected = [
+        extractor.filter_components_from_data(
+            reference, keys, component_key="Name-State", case=case, copy=copy)
+        for keys in queries
+    ]
+
+    store = SQLiteReferenceStore(import_reference_to_sqlite(reference, tmp_path / "reference.db"))
+    try:
+        for source in (reference, store):
+            results = ComponentExtractor().filter_components_batch(
+                source, queries, component_key="Name-State", case=case, copy=copy)
+            assert len(results) == len(expected)
+            for result, single in zip(results, expected):
+                for field in ("yaml", "data", "matched", "missing"):
+                    assert result[field] == single[field], field
+    finally:
+        store.close()
@@ -0,0 +1,104 @@
+# import libs
+import pytest
+from types import MappingProxyType
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.extraction_cache import ExtractionCache, freeze, thaw
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+from conftest import DOCUMENTS, FILTERS, filter_id
+
+
+def test_freeze_and_thaw_round_trip():
+    value = {"a": [1, {"b": [2, 3]}], "c": None}
+    frozen = freeze(value)
+    assert isinstance(frozen, MappingProxyType)
+    assert frozen["a"] == (1, MappingProxyType({"b": (2, 3)}))
+    with pytest.raises(TypeError):
+        frozen["c"] = 1
+    assert thaw(frozen) == value
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_cached_sections_match_baseline(baseline: dict, name: str):
+    extractor = YAMLExtractor(cache=ExtractionCache())
+    expected = YAMLExtractor().extract_yaml_sections(DOCUMENTS[name])
+    for _ in range(2):
+        sections = extractor.extract_yaml_sections(DOCUMENTS[name])
+        assert [thaw(section["content"]) for section in sections] == baseline["extract_yaml_sections"][name]
+        assert [thaw(section) for section in sections] == expected
+    assert extractor.cache.stats()["hits"] == 1
+
+
+def test_cached_sections_are_read_only():
+    extractor = YAMLExtractor(cache=ExtractionCache())
+    extractor.extract_yaml_sections(DOCUMENTS["plain"])
+    section = extractor.extract_yaml_sections(DOCUMENTS["plain"])[0]
+    with pytest.raises(TypeError):
+        section["content"] = None
+    with pytest.raises(TypeError):
+        section["content"]["REFERENCES"] = {}
+    assert extractor.extract_yaml_sections(DOCUMENTS["plain"])[0] == section
+
+
+def test_eviction_by_bytes():
+    cache = ExtractionCache(max_bytes=250)
+    keys = [cache.make_key("test", str(i)) for i in range(3)]
+    for key in keys:
+        assert cache.put(key, "x", size=100)
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) == "x" and cache.get(keys[2]) == "x"
+
+    # a hit makes an entry recent: the other one is evicted next
+    cache.get(keys[1])
+    cache.put(cache.make_key("test", "3"), "x", size=100)
+    assert cache.get(keys[1]) == "x" and cache.get(keys[2]) is None
+    assert not cache.put(cache.make_key("test", "big"), "x", size=251)
+    assert cache.stats()["bytes"] == 200
+
+
+@pytest.mark.parametrize("case", [None, "upper"])
+@pytest.mark.parametrize("component_key, keys", FILTERS)
+def test_cached_filter_matches_baseline(
+        baseline: dict, reference_text: str, component_key: str, keys: list, case):
+    expected = ComponentExtractor().filter_components(
+        reference_text, keys, component_key=component_key, case=case)
+    extractor = ComponentExtractor(cache=ExtractionCache())
+    for _ in range(2):
+        result = extractor.filter_components(
+            reference_text, keys, component_key=component_key, case=case)
+        assert result["yaml"] == baseline["filter_components"][filter_id(component_key, keys, case)]
+        assert result["data"] == expected["data"]
+        assert result["matched"] == expected["matched"]
+        assert result["missing"] == expected["missing"]
+        # copies are the caller's: mutating one leaves the cached entry intact
+        result["data"]["REFERENCES"].clear()
+
+
+def test_filter_cache_is_keyed_by_extractor_options(reference_text: str):
+    cache = ExtractionCache()
+    truncating = ComponentExtractor(
+        extractor=YAMLExtractor(max_section_bytes=100, on_budget_exceeded="truncate"), cache=cache)
+    default = ComponentExtractor(cache=cache)
+    with pytest.raises(ValueError):
+        truncating.filter_components(reference_text, ["water-l"], component_key="Name-State")
+
+    expected = ComponentExtractor().filter_components(reference_text, ["water-l"], component_key="Name-State")
+    assert default.filter_components(reference_text, ["water-l"], component_key="Name-State")["yaml"] == expected["yaml"]
+    # the entry the default extractor stored is not served to the truncating one
+    with pytest.raises(ValueError):
+        truncating.filter_components(reference_text, ["water-l"], component_key="Name-State")
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_cached_extract_and_validate(name: str):
+    expected = YAMLExtractor().extract_and_validate(DOCUMENTS[name])
+    extractor = YAMLExtractor(cache=ExtractionCache())
+    for _ in range(2):
+        result = extractor.extract_and_validate(DOCUMENTS[name])
+        assert [thaw(section) for section in result["sections"]] == expected["sections"]
+        assert {field: result[field] for field in ("found_yaml", "num_sections", "summary", "truncated")} == {
+            field: expected[field] for field in ("found_yaml", "num_sections", "summary", "truncated")}
+    assert extractor.cache.stats()["hits"] == 1
+    # extract_yaml_sections shares the entry
+    assert extractor.extract_yaml_sections(DOCUMENTS[name]) == result["sections"]
+    assert extractor.cache.stats()["hits"] == 2
@@ -0,0 +1,127 @@
+# import libs
+import asyncio
+import logging
+import pytest
+# locals
+from pythermodb_settings.references import yaml_budgets
+from pythermodb_settings.references.incremental_extractor import IncrementalYAMLExtractor
+from pythermodb_settings.references.yaml_budgets import ExtractionBudget, TimeBudgetExceededError
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+
+
+def _document(reference_text: str) -> str:
+    return f"Intro line for the data.\n\n{reference_text}\nSome closing prose here.\n\nkey: value\nother: 2\n"
+
+
+def _chunks(text: str, size: int) -> list:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+def test_chunks_match_whole_text(reference_text: str, size: int):
+    text = _document(reference_text)
+    expected = list(YAMLExtractor().iter_yaml_sections(text))
+    sections = IncrementalYAMLExtractor().feed_all(_chunks(text, size))
+    assert [s["content"] for s in sections] == [s["content"] for s in expected]
+    assert len(sections) == 2
+
+
+@pytest.mark.parametrize("size", [5, 37, 200])
+def test_stream_yields_sections_as_they_close(reference_text: str, size: int):
+    text = _document(reference_text) + "Trailing prose after the data goes on here.\n" * 20
+    chunks = _chunks(text, size)
+    # chunk boundaries fall inside lines and inside the reference block
+    assert any(not chunk.endswith("\n") for chunk in chunks[:-1])
+    assert len(reference_text) > size
+
+    expected = []
+    feeder = IncrementalYAMLExtractor()
+    for count, chunk in enumerate(chunks, 1):
+        expected.extend((section["content"], count) for section in feeder.feed(chunk))
+    expected.extend((section["content"], len(chunks)) for section in feeder.close())
+
+    consumed = []
+
+    async def source():
+        for chunk in chunks:
+            consumed.append(chunk)
+            await asyncio.sleep(0)
+            yield chunk
+
+    async def collect():
+        return [(section["content"], len(consumed)) async for section in IncrementalYAMLExtractor().stream(source())]
+
+    streamed = asyncio.run(collect())
+    assert streamed == expected
+    assert [content for content, _ in streamed] == [s["content"] for s in IncrementalYAMLExtractor().feed_all(chunks)]
+    # each block is yielded before the source is exhausted
+    assert len(streamed) == 2 and streamed[-1][1] < len(chunks)
+
+
+class _Clock:
+    """Stand-in for ``time.monotonic`` that only moves when told to."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(yaml_budgets.time, "monotonic", clock)
+    return clock
+
+
+def _slow_lines(extractor: IncrementalYAMLExtractor, clock: _Clock, seconds: float) -> None:
+    """Make every processed line take ``seconds`` on the fake clock."""
+    push = extractor._assembler.push
+
+    def timed_push(line):
+        clock.now += seconds
+        return push(line)
+
+    extractor._assembler.push = timed_push
+
+
+def test_idle_time_does_not_count(reference_text: str, clock: _Clock):
+    extractor = IncrementalYAMLExtractor(YAMLExtractor(time_budget=1.0))
+    _slow_lines(extractor, clock, 0.001)
+    clock.now += 10
+    sections = []
+    for chunk in _chunks(_document(reference_text), 400):
+        sections.extend(extractor.feed(chunk))
+        clock.now += 10
+    sections.extend(extractor.close())
+    assert len(sections) == 2
+    assert extractor.truncated is None
+
+
+def test_processing_time_is_limited(reference_text: str, clock: _Clock, caplog):
+    extractor = IncrementalYAMLExtractor(
+        YAMLExtractor(time_budget=1.0, on_budget_exceeded="truncate"))
+    _slow_lines(extractor, clock, 0.6)
+    with caplog.at_level(logging.WARNING):
+        assert extractor.feed_all(_chunks(_document(reference_text), 64)) == []
+    assert extractor.truncated == "time_budget"
+    assert extractor.line_count == 2
+    assert "YAML extraction truncated: " in caplog.text
+
+    extractor = IncrementalYAMLExtractor(YAMLExtractor(time_budget=1.0))
+    _slow_lines(extractor, clock, 0.6)
+    with pytest.raises(TimeBudgetExceededError):
+        extractor.feed("a: 1\nb: 2\nc: 3\n")
+
+
+def test_paused_tracker_keeps_remaining_time(clock: _Clock):
+    tracker = ExtractionBudget(time_budget=1.0).start()
+    clock.now += 0.5
+    tracker.pause()
+    clock.now += 100
+    tracker.resume()
+    assert tracker.check_time()
+    clock.now += 0.6
+    with pytest.raises(TimeBudgetExceededError):
+        tracker.check_time()
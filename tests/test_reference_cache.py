@@ -0,0 +1,89 @@
+# import libs
+import gc
+import os
+import pytest
+from pathlib import Path
+# locals
+from pythermodb_settings.models import Component
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.main import extract_reference_components
+from pythermodb_settings.references.reference_cache import ReferenceCache
+from conftest import QUERIES
+
+
+def _columns(result: dict) -> list:
+    return result["data"]["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["general-data"]["STRUCTURE"]["COLUMNS"]
+
+
+@pytest.mark.parametrize("keys", QUERIES)
+def test_cached_file_matches_uncached(reference_file: Path, keys: list):
+    baseline = ComponentExtractor().filter_components_from_file(
+        reference_file, keys, component_key="Name-State")
+    cached = ComponentExtractor(reference_cache=ReferenceCache())
+    for _ in range(2):
+        result = cached.filter_components_from_file(
+            reference_file, keys, component_key="Name-State")
+        assert result["yaml"] == baseline["yaml"]
+        assert result["data"] == baseline["data"]
+        assert result["matched"] == baseline["matched"]
+
+
+@pytest.mark.parametrize("copy", [True, False])
+def test_cached_reference_cannot_be_poisoned(reference_file: Path, copy: bool):
+    cache = ReferenceCache()
+    extractor = ComponentExtractor(reference_cache=cache)
+    first = extractor.filter_components_from_file(
+        reference_file, ["water-l"], component_key="Name-State", copy=copy)
+    _columns(first).append("POISON")
+    first["data"]["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["general-data"]["VALUES"][0][1] = "POISON"
+
+    second = ComponentExtractor(reference_cache=cache).filter_components_from_file(
+        reference_file, ["water-l"], component_key="Name-State", copy=copy, renumber=False)
+    assert cache.stats()["hits"] == 1
+    assert _columns(second) == ["No.", "Name", "Formula", "State", "MW", "Tc"]
+    assert "POISON" not in second["yaml"]
+
+
+def test_shared_cache_cannot_be_poisoned_through_main(reference_file: Path):
+    water = Component(name="water", formula="H2O", state="l")
+    first = extract_reference_components(reference_file, [water], component_key="Name-State")
+    _columns(first).append("POISON")
+
+    second = extract_reference_components(reference_file, [water], component_key="Name-State")
+    assert "POISON" not in _columns(second)
+
+
+def test_changed_file_is_reloaded(reference_file: Path):
+    cache = ReferenceCache()
+    extractor = ComponentExtractor(reference_cache=cache)
+    assert extractor.filter_components_from_file(
+        reference_file, ["argon-g"], component_key="Name-State")["missing"]
+
+    text = reference_file.read_text(encoding="utf-8")
+    reference_file.write_text(
+        text.replace("'nitrogen','N2'", "'argon','Ar'"), encoding="utf-8")
+    stat = os.stat(reference_file)
+    os.utime(reference_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    result = extractor.filter_components_from_file(
+        reference_file, ["argon-g"], component_key="Name-State")
+    assert not result["missing"]
+    assert cache.stats()["reloads"] == 1
+
+
+def test_eviction_and_key_locks_are_bounded(tmp_path: Path, reference_text: str):
+    paths = []
+    for i in range(50):
+        paths.append(tmp_path / f"reference-{i}.yml")
+        paths[-1].write_text(reference_text, encoding="utf-8")
+
+    # budget of exactly two entries
+    probe = ReferenceCache()
+    probe.get(paths[0], lambda _: {"REFERENCES": {}})
+    cache = ReferenceCache(max_bytes=2 * probe.stats()["bytes"])
+    for path in paths:
+        cache.get(path, lambda _: {"REFERENCES": {}})
+    gc.collect()
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 48
+    assert len(cache._key_locks) == 0
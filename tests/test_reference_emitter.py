@@ -0,0 +1,94 @@
+# import libs
+import datetime
+import io
+import pytest
+import yaml
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_emitter import YAML_WIDTH, ReferenceEmitter, UnsupportedLayout
+from conftest import FILTERS, filter_id
+
+# NOTE: cells the emitter must quote (or hand to the dumper) exactly like the dumper does
+TRICKY_SCALARS = [
+    "yes", "No", "on", "1e3", "0x1F", "1_000", "12:30", "null", "~", "", " ", "a: b", "#x", "x #y",
+    "- a", "[a]", "{a}", "*ref", "&a", "!tag", "@at", "`b", "%p", "'single'", '"double"',
+    "back\\slash", "tab\there", "trailing ", " leading", "naïve", "水", "emoji 😀", "a,b",
+    "multi\nline", "x" * (YAML_WIDTH + 10), 1, -2, 3.5, 1e20, 1e-7, float("inf"), float("-inf"),
+    float("nan"), True, False, None, datetime.date(2024, 1, 2),
+    datetime.datetime(2024, 1, 2, 3, 4, 5),
+]
+
+
+def _reference(cells: list) -> dict:
+    """Reference with one table whose rows and metadata hold ``cells``."""
+    return {
+        "REFERENCES": {
+            "CUSTOM-REF-1": {
+                "DATABOOK-ID": 1,
+                "TABLES": {
+                    "tricky": {
+                        "TABLE-ID": 1,
+                        "DESCRIPTION": cells[0],
+                        "NOTES": list(cells),
+                        "STRUCTURE": {"COLUMNS": ["No.", "Name", "Formula", "State", "X"]},
+                        "VALUES": [[idx, cell, cell, cell, cell] for idx, cell in enumerate(cells, 1)],
+                    }
+                }
+            }
+        }
+    }
+
+
+def _dump_both(reference: dict) -> tuple:
+    return ComponentExtractor()._dump_yaml(reference), ComponentExtractor(fast_emitter=False)._dump_yaml(reference)
+
+
+@pytest.mark.parametrize("case", [None, "upper"])
+@pytest.mark.parametrize("component_key, keys", FILTERS)
+def test_emitter_matches_golden_output(
+        baseline: dict, reference_text: str, component_key: str, keys: list, case):
+    data = ComponentExtractor(fast_emitter=False).filter_components(
+        reference_text, keys, component_key=component_key, case=case)["data"]
+    expected = baseline["filter_components"][filter_id(component_key, keys, case)]
+    emitter = ComponentExtractor()._emitter
+    assert emitter.emit(data) == expected
+    assert _dump_both(data) == (expected, expected)
+
+
+@pytest.mark.parametrize("cell", TRICKY_SCALARS, ids=repr)
+def test_tricky_scalar_matches_dumper(cell):
+    fast, legacy = _dump_both(_reference([cell]))
+    assert fast == legacy
+
+
+def test_tricky_keys_match_dumper():
+    reference = _reference(["x"])
+    table = reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["tricky"]
+    for idx, key in enumerate(["yes", "a: b", "#x", "", "1e3", "k" * 200, 7, None, True]):
+        table[key] = idx
+    fast, legacy = _dump_both(reference)
+    assert fast == legacy
+
+
+def test_shared_containers_match_dumper():
+    reference = _reference(["x"])
+    table = reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["tricky"]
+    table["SHARED"] = table["STRUCTURE"]
+    fast, legacy = _dump_both(reference)
+    assert fast == legacy
+    assert "&id" in fast
+
+
+@pytest.mark.parametrize("layout", ["shared", "multiline", "long", "type"])
+def test_unsupported_layout_writes_nothing(layout: str):
+    reference = _reference(["x"])
+    table = reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["tricky"]
+    table["VALUES"].append(
+        {"shared": table["STRUCTURE"], "multiline": "a\nb", "long": "y" * (YAML_WIDTH + 1),
+         "type": {1, 2}}[layout])
+
+    emitter = ReferenceEmitter(ComponentExtractor()._yaml_dumper)
+    stream = io.StringIO()
+    with pytest.raises(UnsupportedLayout):
+        emitter.emit(reference, stream)
+    assert stream.getvalue() == ""
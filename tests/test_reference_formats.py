@@ -0,0 +1,96 @@
+# import libs
+import datetime
+import marshal
+import pickle
+import pytest
+import yaml
+from pathlib import Path
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_formats import (
+    BINARY_HEADER, BINARY_MAGIC, OUTPUT_FORMATS, check_output_format, dump_binary,
+    load_binary, load_jsonl, load_reference_output, read_reference_output
+)
+from conftest import FILTERS, filter_id
+
+# NOTE: set by _Payload when unpickled
+_UNPICKLED = []
+
+
+class _Payload:
+    def __reduce__(self):
+        return (_UNPICKLED.append, ("ran",))
+
+
+@pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+@pytest.mark.parametrize("component_key, keys", FILTERS)
+def test_output_loads_back(
+        baseline: dict, reference_text: str, component_key: str, keys: list, output_format: str):
+    result = ComponentExtractor().filter_components(
+        reference_text, keys, component_key=component_key, output_format=output_format)
+    output = result["yaml" if output_format == "yaml" else "output"]
+    expected = yaml.safe_load(baseline["filter_components"][filter_id(component_key, keys, None)])
+    assert result["data"] == expected
+    assert load_reference_output(output, output_format) == expected
+
+
+@pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+def test_saved_output_reads_back_by_suffix(reference_file: Path, output_format: str):
+    result = ComponentExtractor().filter_components_from_file(
+        reference_file, ["water-l"], component_key="Name-State",
+        save_reference=True, output_format=output_format)
+    assert result["saved_to"] is not None
+    assert read_reference_output(result["saved_to"]) == result["data"]
+
+
+def test_read_rejects_unknown_suffix(tmp_path: Path):
+    path = tmp_path / "reference.txt"
+    path.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_reference_output(path)
+
+
+@pytest.mark.parametrize("content", [
+    b"",
+    b"NOTAREF\0" + dump_binary({"REFERENCES": {}})[BINARY_HEADER.size:],
+    BINARY_HEADER.pack(BINARY_MAGIC, 99, marshal.version, 0) + dump_binary({"REFERENCES": {}})[BINARY_HEADER.size:],
+    BINARY_HEADER.pack(BINARY_MAGIC, 2, 99, 0) + dump_binary({"REFERENCES": {}})[BINARY_HEADER.size:],
+    dump_binary({"REFERENCES": {}})[:-3],
+    BINARY_HEADER.pack(BINARY_MAGIC, 2, marshal.version, 0) + marshal.dumps(["not", "a", "mapping"]),
+])
+def test_load_binary_rejects_bad_content(content: bytes):
+    with pytest.raises(ValueError):
+        load_binary(content)
+
+
+def test_binary_keeps_dates():
+    reference = {
+        "UPDATED": datetime.date(2024, 1, 31),
+        "REFERENCES": {"R": {"TABLES": {}, "AT": datetime.datetime(2024, 1, 31, 12, 30)}},
+        datetime.date(2024, 2, 1): ["x", datetime.date(2024, 2, 2)],
+    }
+    assert load_binary(dump_binary(reference)) == reference
+    assert load_binary(dump_binary({"REFERENCES": {"R": [1, 2.5, None, True]}})) == {"REFERENCES": {"R": [1, 2.5, None, True]}}
+
+
+@pytest.mark.parametrize("header", [b"", b"PTDBOUT\0\x01\x00"])
+def test_pickle_payload_is_never_loaded(tmp_path: Path, header: bytes):
+    path = tmp_path / "reference.refb"
+    path.write_bytes(header + pickle.dumps({"REFERENCES": _Payload()}))
+    with pytest.raises(ValueError):
+        read_reference_output(path)
+    with pytest.raises(ValueError):
+        load_reference_output(path.read_bytes(), "binary")
+    assert _UNPICKLED == []
+
+
+def test_load_jsonl_rejects_row_before_table():
+    lines = ['{"kind": "reference", "name": "R", "body": {}}', '[1, "water"]']
+    with pytest.raises(ValueError):
+        load_jsonl(iter(lines))
+
+
+def test_check_output_format_rejects_unknown():
+    assert check_output_format("jsonl") == "jsonl"
+    with pytest.raises(ValueError):
+        check_output_format("xml")
@@ -0,0 +1,51 @@
+# import libs
+import pytest
+import yaml
+# locals
+from pythermodb_settings.references.reference_index import KEY_FIELDS, ReferenceIndex, normalize_key
+from conftest import REFERENCE_TEXT
+
+# NOTE: keys probed in every variant (present, absent, and with stray spaces/case)
+PROBES = ["CO2", "water", "h2o-l", "carbon dioxide-g", "water-H2O-l", " Water - l ", "argon-g", ""]
+
+
+def _scan(reference: dict, component_key: str, sep: str, case_mode) -> dict:
+    """Postings of every row key, by reading each row the slow way."""
+    postings = {}
+    for ref_name, ref_body in reference["REFERENCES"].items():
+        for table_name, table in ref_body["TABLES"].items():
+            columns = [str(col).lower() for col in table["STRUCTURE"]["COLUMNS"]]
+            for row_idx, row in enumerate(table.get("VALUES") or []):
+                cells = [str(row[columns.index(name)]) for name in ("name", "formula", "state")]
+                parts = [cells[pos] for pos in KEY_FIELDS[component_key]]
+                key = normalize_key(sep.join(parts), sep, case_mode)
+                postings.setdefault(key, []).append((ref_name, table_name, row_idx))
+    return postings
+
+
+@pytest.mark.parametrize("case_mode", [None, "lower", "upper"])
+@pytest.mark.parametrize("component_key", KEY_FIELDS)
+def test_lookup_matches_scan(component_key: str, case_mode):
+    reference = yaml.safe_load(REFERENCE_TEXT)
+    index = ReferenceIndex(reference)
+    expected = _scan(reference, component_key, "-", case_mode)
+    assert index.postings(component_key, "-", case_mode) == expected
+
+    keys = [normalize_key(probe, "-", case_mode) for probe in PROBES] + list(expected)
+    assert index.lookup(keys, component_key, "-", case_mode) == expected
+
+    rows, found = index.match(keys, component_key, "-", case_mode)
+    assert found == set(expected)
+    for (ref_name, table_name), indices in rows.items():
+        assert indices == sorted(
+            posting[2] for postings in expected.values() for posting in postings
+            if posting[:2] == (ref_name, table_name))
+
+
+def test_restored_index_matches(reference_text: str):
+    reference = yaml.safe_load(reference_text)
+    index = ReferenceIndex(reference)
+    restored = ReferenceIndex.from_state(reference, index.export_state())
+    for component_key in KEY_FIELDS:
+        assert restored.postings(component_key, "-", None) == index.postings(component_key, "-", None)
+    assert restored.num_rows == index.num_rows == 10
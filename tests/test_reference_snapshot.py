@@ -0,0 +1,150 @@
+# import libs
+import os
+import pickle
+import threading
+import pytest
+import yaml
+from pathlib import Path
+# locals
+from pythermodb_settings.references import reference_snapshot
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_snapshot import (
+    SNAPSHOT_HEADER,
+    SnapshotError,
+    compiled_path,
+    is_fresh,
+    read_header,
+    read_snapshot,
+    write_snapshot,
+)
+from conftest import QUERIES
+
+# NOTE: set by _Payload when unpickled
+_UNPICKLED = []
+
+
+class _Payload:
+    def __reduce__(self):
+        return (_UNPICKLED.append, ("ran",))
+
+
+def _touch(path: Path, delta_ns: int = 1_000_000) -> None:
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + delta_ns))
+
+
+def test_snapshot_round_trip(reference_file: Path, reference_text: str):
+    dst = ComponentExtractor().compile_reference(reference_file)
+    assert dst == compiled_path(reference_file)
+    assert is_fresh(reference_file, dst)
+
+    reference, state = read_snapshot(dst)
+    assert reference == yaml.safe_load(reference_text)
+    assert state["tables"]
+
+    baseline = ComponentExtractor()
+    compiled = ComponentExtractor()
+    assert compiled.load_ref(reference_file) == reference
+    for keys in QUERIES:
+        expected = baseline.filter_components(reference_text, keys, component_key="Name-State")
+        result = compiled.filter_components_from_data(None, keys, component_key="Name-State")
+        assert result["yaml"] == expected["yaml"]
+        assert result["matched"] == expected["matched"]
+    # no temporary files are left next to the snapshot
+    assert sorted(p.name for p in reference_file.parent.iterdir()) == sorted([reference_file.name, dst.name])
+
+
+def test_snapshot_staleness(reference_file: Path):
+    extractor = ComponentExtractor()
+    dst = extractor.compile_reference(reference_file)
+
+    # touched but unchanged: the digest keeps the snapshot
+    _touch(reference_file)
+    assert is_fresh(reference_file, dst)
+
+    text = reference_file.read_text(encoding="utf-8")
+    reference_file.write_text(text.replace("'nitrogen','N2'", "'argon','Ar'"), encoding="utf-8")
+    assert not is_fresh(reference_file, dst)
+    with pytest.raises(SnapshotError):
+        extractor.load_compiled_reference(reference_file, rebuild=False)
+
+    extractor.load_ref(reference_file)
+    assert is_fresh(reference_file, dst)
+    result = extractor.filter_components_from_data(None, ["argon-g"], component_key="Name-State")
+    assert result["matched"] == ["argon-g"]
+
+
+def test_touched_source_is_restamped(monkeypatch, reference_file: Path):
+    dst = ComponentExtractor().compile_reference(reference_file)
+    reference = read_snapshot(dst)
+    _touch(reference_file)
+    assert read_header(dst)["mtime_ns"] != os.stat(reference_file).st_mtime_ns
+    assert is_fresh(reference_file, dst)
+    assert read_header(dst)["mtime_ns"] == os.stat(reference_file).st_mtime_ns
+    assert read_snapshot(dst) == reference
+
+    # the stamp matches again, so the source is not hashed a second time
+    def no_digest(path):
+        raise AssertionError(f"{path} was hashed")
+
+    monkeypatch.setattr(reference_snapshot, "file_digest", no_digest)
+    assert is_fresh(reference_file, dst)
+
+
+def test_pickle_snapshot_is_never_loaded(reference_file: Path):
+    dst = ComponentExtractor().compile_reference(reference_file)
+    header = bytearray(dst.read_bytes()[:SNAPSHOT_HEADER.size])
+    payload = pickle.dumps({"reference": _Payload(), "index": {}})
+    fields = list(SNAPSHOT_HEADER.unpack(bytes(header)))
+    fields[2] = 1
+    fields[-1] = len(payload)
+    dst.write_bytes(SNAPSHOT_HEADER.pack(*fields) + payload)
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(dst)
+    with pytest.raises(SnapshotError):
+        ComponentExtractor().load_compiled_reference(reference_file, rebuild=False)
+
+    # auto-loading rebuilds the snapshot from the YAML instead
+    reference = ComponentExtractor().load_ref(reference_file)
+    assert "REFERENCES" in reference
+    assert read_snapshot(dst)[0] == reference
+    assert _UNPICKLED == []
+
+
+def test_unmarshallable_reference(tmp_path: Path, reference_text: str):
+    src = tmp_path / "dated.yml"
+    dated = reference_text.replace("DATABOOK-ID: 1", "DATABOOK-ID: 1\n    UPDATED: 2024-01-31")
+    src.write_text(dated, encoding="utf-8")
+    extractor = ComponentExtractor()
+    with pytest.raises(SnapshotError):
+        extractor.compile_reference(src)
+    assert not compiled_path(src).exists()
+
+    reference = extractor.load_compiled_reference(src)
+    assert str(reference["REFERENCES"]["CUSTOM-REF-1"]["UPDATED"]) == "2024-01-31"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dated.yml"]
+
+
+def test_concurrent_snapshot_writes(tmp_path: Path):
+    dst = tmp_path / "reference.refc"
+    references = [{"REFERENCES": {f"REF-{i}": {"TABLES": {}}}} for i in range(8)]
+    state = {"tables": [], "fields": [], "postings": {}}
+    errors = []
+
+    def write(reference):
+        try:
+            for _ in range(20):
+                write_snapshot(dst, reference, state, (0, 0), "00" * 20)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(reference,)) for reference in references]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert read_snapshot(dst)[0] in references
+    assert [p.name for p in tmp_path.iterdir()] == ["reference.refc"]
@@ -0,0 +1,122 @@
+# import libs
+import threading
+import pytest
+from pathlib import Path
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_writer import LazyResult, atomic_open, write_atomic
+from conftest import QUERIES
+
+
+def test_atomic_open_replaces_file(tmp_path: Path):
+    path = tmp_path / "out.yaml"
+    path.write_text("old", encoding="utf-8")
+    with atomic_open(path, fsync=True, chunk_size=4) as handle:
+        handle.write("new content")
+        # readers see the old file until the block succeeds
+        assert path.read_text(encoding="utf-8") == "old"
+    assert path.read_text(encoding="utf-8") == "new content"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.yaml"]
+
+
+def test_atomic_open_failure_keeps_file(tmp_path: Path):
+    path = tmp_path / "out.yaml"
+    path.write_text("old", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as handle:
+            handle.write("partial")
+            raise RuntimeError("crash")
+    assert path.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.yaml"]
+
+
+def test_atomic_open_concurrent_writers(tmp_path: Path):
+    path = tmp_path / "out.bin"
+    contents = [bytes([i]) * 100_000 for i in range(8)]
+    errors = []
+
+    def write(content: bytes):
+        try:
+            for _ in range(10):
+                write_atomic(path, content, chunk_size=4096)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(content,)) for content in contents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert path.read_bytes() in contents
+    assert [p.name for p in tmp_path.iterdir()] == ["out.bin"]
+
+
+def test_atomic_open_rejects_read_modes(tmp_path: Path):
+    with pytest.raises(ValueError):
+        with atomic_open(tmp_path / "out.yaml", "r"):
+            pass
+
+
+def test_lazy_result_loads_once():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return "value"
+
+    result = LazyResult({"a": 1}, {"lazy": load, "unused": load})
+    assert list(result) == ["lazy", "unused", "a"]
+    assert not result.is_loaded("lazy")
+    assert "lazy" in result and len(result) == 3
+    assert result["lazy"] == "value" and result["lazy"] == "value"
+    assert calls == [1] and result.is_loaded("lazy")
+
+    result["unused"] = "set"
+    del result["a"]
+    assert dict(result) == {"lazy": "value", "unused": "set"}
+    assert calls == [1]
+    with pytest.raises(KeyError):
+        del result["a"]
+
+
+@pytest.mark.parametrize("keys", QUERIES)
+@pytest.mark.parametrize("output_format", ["yaml", "json", "jsonl", "binary"])
+def test_stream_output_matches_in_memory(tmp_path: Path, reference_text: str, keys: list, output_format: str):
+    extractor = ComponentExtractor()
+    path = tmp_path / "filtered.out"
+    baseline = extractor.filter_components(
+        reference_text, keys, component_key="Name-State", output_format=output_format)
+    result = extractor.filter_components(
+        reference_text, keys, component_key="Name-State", output_format=output_format,
+        stream_output=True, output_path=path)
+
+    field = "yaml" if output_format == "yaml" else "output"
+    assert isinstance(result, LazyResult)
+    assert not result.is_loaded(field) and not result.is_loaded("data")
+    expected = baseline[field]
+    assert (path.read_bytes() if output_format == "binary" else path.read_text(encoding="utf-8")) == expected
+    assert result[field] == expected
+    assert result["data"] == baseline["data"]
+    assert result["matched"] == baseline["matched"]
+
+
+def test_stream_output_crash_keeps_previous_file(tmp_path: Path, reference_text: str, monkeypatch):
+    extractor = ComponentExtractor()
+    path = tmp_path / "filtered.yaml"
+    extractor.filter_components(
+        reference_text, ["water-l"], component_key="Name-State", stream_output=True, output_path=path)
+    previous = path.read_text(encoding="utf-8")
+
+    def crash(reference, stream=None, format_memo=None):
+        stream.write("REFERENCES:\n")
+        raise RuntimeError("crash")
+
+    monkeypatch.setattr(extractor, "_dump_yaml", crash)
+    with pytest.raises(RuntimeError):
+        extractor.filter_components(
+            reference_text, ["methane-g"], component_key="Name-State",
+            stream_output=True, output_path=path)
+    assert path.read_text(encoding="utf-8") == previous
+    assert [p.name for p in tmp_path.iterdir()] == ["filtered.yaml"]
@@ -0,0 +1,113 @@
+# import libs
+import datetime
+import pytest
+import sqlite3
+import yaml
+from pathlib import Path
+# locals
+from pythermodb_settings.references import sqlite_store
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references.reference_index import KEY_FIELDS, ReferenceIndex, normalize_key
+from pythermodb_settings.references.sqlite_store import SQLiteReferenceStore, import_reference_to_sqlite
+from conftest import QUERIES
+
+# NOTE: raw keys looked up under every key variant
+RAW_KEYS = [
+    "carbon dioxide", "CO2", "Water-l", "H2O-L", "methane-CH4", "nitrogen-N2-g",
+    "C2H5OH-ethanol-l", "argon", "", "co2 | carbon dioxide | g",
+]
+
+
+@pytest.fixture
+def reference(reference_text: str) -> dict:
+    return yaml.safe_load(reference_text)
+
+
+@pytest.fixture
+def store(reference: dict, tmp_path: Path) -> SQLiteReferenceStore:
+    store = SQLiteReferenceStore(import_reference_to_sqlite(reference, tmp_path / "reference.db"))
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("case", [None, "lower", "upper"])
+@pytest.mark.parametrize("component_key", list(KEY_FIELDS))
+def test_lookup_matches_index(reference: dict, store: SQLiteReferenceStore, component_key: str, case):
+    index = ReferenceIndex(reference)
+    keys = [normalize_key(key, "-", case) for key in RAW_KEYS]
+    assert store.lookup(keys, component_key, "-", case) == index.lookup(keys, component_key, "-", case)
+    assert store.match(keys, component_key, "-", case) == index.match(keys, component_key, "-", case)
+
+
+def test_lower_case_uses_the_index(store: SQLiteReferenceStore, monkeypatch):
+    def scan(*args):
+        raise AssertionError("lookup scanned the rows")
+
+    monkeypatch.setattr(store, "_scan", scan)
+    assert store.lookup(["water-l"], "Name-State", "-", "lower") == {
+        "water-l": [("CUSTOM-REF-1", "general-data", 2), ("CUSTOM-REF-1", "vapor-pressure", 2)]
+    }
+
+
+def test_unindexed_variant_is_scanned(reference: dict, tmp_path: Path):
+    store = SQLiteReferenceStore(import_reference_to_sqlite(
+        reference, tmp_path / "names.db", variants=[("Name", "-", "lower")]))
+    assert store.variants == [("Name", "-", None)]
+    index = ReferenceIndex(reference)
+    keys = [normalize_key(key, "-", None) for key in RAW_KEYS]
+    assert store.lookup(keys, "Formula-State", "-", None) == \
+        index.lookup(keys, "Formula-State", "-", None)
+    store.close()
+
+
+@pytest.mark.parametrize("keys", QUERIES)
+@pytest.mark.parametrize("case", [None, "lower", "upper"])
+def test_filter_matches_in_memory(reference: dict, store: SQLiteReferenceStore, keys: list, case):
+    extractor = ComponentExtractor()
+    expected = extractor.filter_components_from_data(reference, keys, component_key="Name-State", case=case)
+    result = extractor.filter_components_from_data(store, keys, component_key="Name-State", case=case)
+    assert result["yaml"] == expected["yaml"]
+    assert result["data"] == expected["data"]
+    assert result["matched"] == expected["matched"]
+    assert result["missing"] == expected["missing"]
+
+
+def test_dates_round_trip(reference: dict, tmp_path: Path):
+    reference["UPDATED"] = datetime.date(2024, 1, 31)
+    reference["REFERENCES"]["CUSTOM-REF-1"]["COMPILED"] = datetime.datetime(2024, 1, 31, 12, 30)
+    store = SQLiteReferenceStore(import_reference_to_sqlite(reference, tmp_path / "dated.db"))
+    skeleton = store.skeleton()
+    assert skeleton["UPDATED"] == datetime.date(2024, 1, 31)
+    assert skeleton["REFERENCES"]["CUSTOM-REF-1"]["COMPILED"] == datetime.datetime(2024, 1, 31, 12, 30)
+    store.close()
+
+
+@pytest.mark.parametrize("value", [{1: "int key"}, {"\x00": "tag"}, {"a", "b"}, b"binary"])
+def test_unsupported_values_are_rejected(reference: dict, tmp_path: Path, value):
+    reference["REFERENCES"]["CUSTOM-REF-1"]["EXTRA"] = value
+    with pytest.raises(ValueError):
+        import_reference_to_sqlite(reference, tmp_path / "reference.db")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_import_closes_and_cleans_up(reference: dict, tmp_path: Path, monkeypatch):
+    db_path = import_reference_to_sqlite(reference, tmp_path / "reference.db")
+    content = db_path.read_bytes()
+    connections = []
+    connect = sqlite3.connect
+
+    def record(*args, **kwargs):
+        connections.append(connect(*args, **kwargs))
+        return connections[-1]
+
+    monkeypatch.setattr(sqlite_store.sqlite3, "connect", record)
+    # fails while the VALUES rows are written, after the metadata is in
+    reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["general-data"]["VALUES"][-1].append({"a", "b"})
+    with pytest.raises(ValueError):
+        import_reference_to_sqlite(reference, db_path)
+
+    assert len(connections) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+    assert [p.name for p in tmp_path.iterdir()] == ["reference.db"]
+    assert db_path.read_bytes() == content
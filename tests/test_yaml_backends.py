@@ -0,0 +1,60 @@
+# import libs
+import pytest
+import yaml
+# locals
+from pythermodb_settings.references.yaml_backends import YAMLBackend, available_backends, get_backend
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+from conftest import DOCUMENTS
+
+# NOTE: backends with PyYAML's YAML 1.1 scalar rules (ryaml resolves with YAML 1.2)
+PYYAML_BACKENDS = ["pyyaml", "libyaml"]
+
+
+def _backend(name: str):
+    if name not in available_backends():
+        pytest.skip(f"{name} backend is not available")
+    return get_backend(name)
+
+
+@pytest.mark.parametrize("name", PYYAML_BACKENDS)
+def test_backend_loads_like_safe_load(reference_text: str, name: str):
+    backend = _backend(name)
+    assert backend.load(reference_text) == yaml.safe_load(reference_text)
+    assert backend.load_any("a: 1\n---\nb: 2\n") == [{"a": 1}, {"b": 2}]
+    assert backend.load_any("") is None
+    with pytest.raises(yaml.YAMLError):
+        backend.load("a: [1, 2\n")
+
+
+@pytest.mark.parametrize("document", list(DOCUMENTS))
+@pytest.mark.parametrize("name", PYYAML_BACKENDS)
+def test_backend_sections_match_baseline(baseline: dict, name: str, document: str):
+    extractor = YAMLExtractor(backend=_backend(name))
+    sections = extractor.extract_yaml_sections(DOCUMENTS[document])
+    assert [s["content"] for s in sections] == baseline["extract_yaml_sections"][document]
+
+
+def test_ryaml_reads_references(reference_text: str):
+    backend = _backend("ryaml")
+    reference = backend.load(reference_text)
+    assert reference["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["general-data"]["VALUES"] == \
+        yaml.safe_load(reference_text)["REFERENCES"]["CUSTOM-REF-1"]["TABLES"]["general-data"]["VALUES"]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("no-such-backend")
+    assert get_backend("auto").name in available_backends()
+
+
+def test_backend_must_implement_parsing():
+    class Partial(YAMLBackend):
+        name = "partial"
+
+        def load(self, text):
+            return yaml.safe_load(text)
+
+    with pytest.raises(TypeError):
+        Partial()
+    with pytest.raises(TypeError):
+        YAMLBackend()
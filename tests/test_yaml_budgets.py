@@ -0,0 +1,134 @@
+# import libs
+import pytest
+import yaml
+# locals
+from pythermodb_settings.references.yaml_budgets import (
+    AliasLimitError,
+    NestingTooDeepError,
+    SectionTooLargeError,
+    TooManySectionsError,
+    alias_expansions,
+    nesting_depth,
+)
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+from conftest import DOCUMENTS
+
+# NOTE: small marker section every truncated extraction must still return
+SMALL = "---\nname: test\nvalues: [1, 2]\n...\n"
+
+# NOTE: billion laughs: nine levels of nine aliases, about 4.4e9 nodes once expanded
+BOMB = "\n".join(
+    ['lol0: &l0 ["lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol"]']
+    + [f"lol{i}: &l{i} [{', '.join([f'*l{i - 1}'] * 9)}]" for i in range(1, 10)]
+)
+
+ENGINES = ["heuristic", "linear"]
+
+
+def _in_markers(payload: str) -> str:
+    """Document with ``payload`` in a marker region, followed by SMALL."""
+    return f"Intro text here.\n---\n{payload}\n...\nMiddle text here.\n{SMALL}"
+
+
+@pytest.fixture
+def constructed(monkeypatch) -> list:
+    """Root keys of every mapping document PyYAML constructs."""
+    roots = []
+    construct_document = yaml.constructor.BaseConstructor.construct_document
+
+    def record(self, node):
+        if isinstance(node, yaml.MappingNode) and node.value:
+            roots.append(node.value[0][0].value)
+        return construct_document(self, node)
+
+    monkeypatch.setattr(yaml.constructor.BaseConstructor, "construct_document", record)
+    return roots
+
+
+def _truncated(text: str, engine: str, **limits) -> dict:
+    result = YAMLExtractor(engine=engine, on_budget_exceeded="truncate", **limits).extract_and_validate(text)
+    assert [section["content"] for section in result["sections"]] == [{"name": "test", "values": [1, 2]}]
+    return result
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("text", [
+    f"Intro text here.\n{BOMB}\nOutro text here for the end.\n{SMALL}",
+    _in_markers(BOMB),
+    _in_markers("a: &a [1, *a]\nb: 2"),
+], ids=["prose", "markers", "recursive"])
+def test_alias_bomb_is_never_built(constructed: list, engine: str, text: str):
+    with pytest.raises(AliasLimitError):
+        YAMLExtractor(engine=engine, max_aliases=1000).extract_and_validate(text)
+    assert _truncated(text, engine, max_aliases=1000)["truncated"] == "max_aliases"
+    assert set(constructed) <= {"name"}
+
+
+def test_alias_bomb_in_a_later_document_is_counted(constructed: list):
+    text = f"---\nx: 1\n---\n{BOMB}\n"
+    assert alias_expansions(text) > 4 * 10 ** 9
+    with pytest.raises(AliasLimitError):
+        YAMLExtractor(max_aliases=1000).extract_yaml_sections(text)
+    assert "lol0" not in constructed
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("text", [
+    _in_markers("deep: " + "[" * 40 + "1" + "]" * 40),
+    f"Intro text here.\n{chr(10).join('  ' * i + f'k{i}:' for i in range(40))} 1\nOutro text here for the end.\n{SMALL}",
+], ids=["flow", "block"])
+def test_deep_nesting(engine: str, text: str):
+    with pytest.raises(NestingTooDeepError):
+        YAMLExtractor(engine=engine, max_depth=20).extract_and_validate(text)
+    assert _truncated(text, engine, max_depth=20)["truncated"] == "max_depth"
+
+
+def test_nesting_depth():
+    assert nesting_depth("a: 1\nb:\n  c: [1, {d: '[x'}]") == 4
+    # scanning stops at the first line past the limit
+    assert nesting_depth("\n".join("  " * i + "k:" for i in range(50)), limit=3) == 4
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_oversized_section(engine: str):
+    text = DOCUMENTS["prose"] + SMALL
+    with pytest.raises(SectionTooLargeError):
+        YAMLExtractor(engine=engine, max_section_bytes=500).extract_and_validate(text)
+    assert _truncated(text, engine, max_section_bytes=500)["truncated"] == "max_section_bytes"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_too_many_sections(baseline: dict, engine: str):
+    text = DOCUMENTS["markers"]
+    with pytest.raises(TooManySectionsError):
+        YAMLExtractor(engine=engine, max_sections=1).extract_and_validate(text)
+
+    result = YAMLExtractor(engine=engine, max_sections=1, on_budget_exceeded="truncate").extract_and_validate(text)
+    assert result["truncated"] == "max_sections"
+    assert [section["content"] for section in result["sections"]] == baseline["extract_yaml_sections"]["markers"][:1]
+
+
+def test_alias_check_does_not_parse_twice(monkeypatch):
+    # the flow row only closes on the last line, so the block is re-parsed as it grows
+    text = (
+        "Intro line of text.\nbase: &b {x: 1, y: 2}\ncopy: *b\nrows: [0,\n"
+        + "".join(f"{i},\n" for i in range(1, 21))
+        + "21]\nThe end of it all, really okay now.\n"
+    )
+    passes = []
+    for loader in {yaml.SafeLoader, getattr(yaml, "CSafeLoader", yaml.SafeLoader)}:
+        def counted(self, stream, init=loader.__init__):
+            passes.append(1)
+            init(self, stream)
+        monkeypatch.setattr(loader, "__init__", counted)
+
+    results = []
+    for limits in ({}, {"max_aliases": 100, "max_depth": 20}):
+        del passes[:]
+        extractor = YAMLExtractor(backend="pyyaml", **limits)
+        results.append((extractor.extract_yaml_sections(text), len(passes), extractor.parse_calls))
+
+    (expected, plain_passes, plain_calls), (sections, checked_passes, checked_calls) = results
+    assert sections == expected and expected[0]["content"]["copy"] == {"x": 1, "y": 2}
+    assert plain_calls > 10
+    assert checked_passes == plain_passes == checked_calls == plain_calls
@@ -0,0 +1,261 @@
+# import libs
+import io
+import os
+import pytest
+import subprocess
+import sys
+import yaml
+from pathlib import Path
+# locals
+from pythermodb_settings.references.component_extractor import ComponentExtractor
+from pythermodb_settings.references import yaml_extractor
+from pythermodb_settings.references.yaml_extractor import YAMLExtractor
+from conftest import DOCUMENTS
+
+# NOTE: prose with multi-byte characters around two marker documents
+MARKER_TEXT = (
+    "Intro – über ñ text here.\n"
+    "---\n"
+    "name: tést\n"
+    "values: [1, 2]\n"
+    "...\n"
+    "More prose – in between here.\n"
+    "---\n"
+    "foo: bär\n"
+    "baz:\n"
+    "  - 1\n"
+    "  - 2\n"
+)
+
+# NOTE: three marker regions (two in one multi-document stream) between bare blocks
+MIXED_MARKER_TEXT = (
+    "Intro text here.\n---\nname: test\nvalues: [1, 2]\n...\n"
+    "Some prose between the sections.\nserver:\n  host: localhost\n  port: 8080\n"
+    "More prose in between here, okay.\n---\nfoo: bar\n---\nbaz: [1, 2]\n...\n"
+    "Closing prose for the document.\ndatabase:\n  name: db\n"
+)
+
+
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+@pytest.mark.parametrize("engine", ["heuristic", "linear"])
+def test_sections_match_baseline(baseline: dict, name: str, engine: str):
+    extractor = YAMLExtractor(engine=engine)
+    sections = extractor.extract_yaml_sections(DOCUMENTS[name])
+    assert [s["content"] for s in sections] == baseline["extract_yaml_sections"][name]
+    assert len({s["fingerprint"] for s in sections}) == len(sections)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_marker_offsets_are_bytes(tmp_path: Path, lazy: bool):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(MARKER_TEXT.encode("utf-8"))
+    extractor = YAMLExtractor()
+
+    sections = [
+        section for section in extractor.extract_yaml_sections(MARKER_TEXT, lazy=lazy)
+        if section["method"] == "markers"
+    ]
+    assert len(sections) == 2
+    for section in sections:
+        assert MARKER_TEXT[section["start_pos"]:].startswith("---\n")
+        assert extractor.load_file_span(path, section["start"], section["end"]) == section["content"]
+
+
+def test_find_section_parses_once(reference_text: str):
+    extractor = YAMLExtractor()
+    section = extractor.find_section(reference_text)
+    assert section["content"] == yaml.safe_load(reference_text)
+    assert section["fingerprint"] == extractor.content_fingerprint(section["content"])
+    assert extractor.parse_calls == 1
+
+
+def test_find_section_scans_mixed_text(reference_text: str):
+    text = f"Some notes before the data.\n\n{reference_text}\nClosing remarks here.\n"
+    section = YAMLExtractor().find_section(text)
+    assert section["content"] == yaml.safe_load(reference_text)
+
+
+def test_filter_components_matches_full_extraction(reference_text: str):
+    text = f"Reference data:\n\n{reference_text}"
+    extractor = ComponentExtractor()
+    expected = extractor.filter_components_from_data(
+        yaml.safe_load(reference_text), ["water-l", "methane-g"], component_key="Name-State")
+    for document in (reference_text, text):
+        result = extractor.filter_components(document, ["water-l", "methane-g"], component_key="Name-State")
+        assert result["yaml"] == expected["yaml"]
+
+
+@pytest.mark.parametrize("options", [{}, {"engine": "heuristic"}, {"engine": "linear", "lazy": True}])
+def test_workers_rejected_when_unused(options: dict):
+    with pytest.raises(ValueError):
+        YAMLExtractor().extract_yaml_sections(MARKER_TEXT, workers=2, **options)
+
+
+def test_workers_rejected_by_extract_and_validate():
+    with pytest.raises(ValueError):
+        YAMLExtractor().extract_and_validate(MARKER_TEXT, workers=2)
+    result = YAMLExtractor(engine="linear").extract_and_validate(MARKER_TEXT, workers=2)
+    assert result["num_sections"] == 2
+
+
+def test_workers_match_serial_parse(reference_text: str):
+    text = "\n".join(f"Block {i} follows.\n---\n{reference_text}...\n" for i in range(4))
+    extractor = YAMLExtractor(engine="linear", parallel_min_bytes=0)
+    serial = extractor.extract_yaml_sections(text)
+    parallel = extractor.extract_yaml_sections(text, workers=2)
+    assert [s["content"] for s in parallel] == [s["content"] for s in serial]
+    assert [s["start"] for s in parallel] == [s["start"] for s in serial]
+
+
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+def test_stream_sources_match_baseline(baseline: dict, tmp_path: Path, name: str):
+    text = DOCUMENTS[name]
+    path = tmp_path / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+    extractor = YAMLExtractor()
+
+    with open(path, "r", encoding="utf-8") as handle:
+        sources = [text, io.StringIO(text), text.splitlines(), text.splitlines(True), handle]
+        for source in sources:
+            sections = list(extractor.iter_yaml_sections(source))
+            assert [s["content"] for s in sections] == baseline["extract_yaml_sections"][name]
+
+
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+def test_file_sections_match_baseline(baseline: dict, tmp_path: Path, name: str):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(DOCUMENTS[name].encode("utf-8"))
+    extractor = YAMLExtractor()
+
+    sections = list(extractor.iter_file_sections(path))
+    assert [s["content"] for s in sections] == baseline["extract_yaml_sections"][name]
+    for section in sections:
+        assert extractor.load_file_span(path, section["start"], section["end"]) == section["content"]
+
+
+@pytest.mark.parametrize("name", ["plain", "prose", "fenced"])
+def test_load_ref_mmap_matches_text(reference_text: str, tmp_path: Path, name: str):
+    path = tmp_path / "doc.txt"
+    path.write_text(DOCUMENTS[name], encoding="utf-8")
+    reference = ComponentExtractor().load_ref(path, use_mmap=True)
+    assert reference == yaml.safe_load(reference_text)
+
+
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+def test_lazy_sections_match_baseline(baseline: dict, name: str):
+    extractor = YAMLExtractor()
+    sections = extractor.extract_yaml_sections(DOCUMENTS[name], lazy=True)
+    assert extractor.parse_calls == 0
+    assert not any(section.is_materialized for section in sections)
+
+    contents = [section["content"] for section in sections if section["valid"]]
+    assert contents == baseline["extract_yaml_sections"][name]
+    assert extractor.parse_calls == len(sections)
+
+
+def test_lazy_sections_peek_root_keys():
+    extractor = YAMLExtractor()
+    sections = extractor.extract_yaml_sections(DOCUMENTS["mixed"], lazy=True)
+    assert [section.root_keys for section in sections] == [("server",), ("database",)]
+    assert sections[1]["content"] == {"database": {"name": "db", "user": "admin"}}
+    assert [section.is_materialized for section in sections] == [False, True]
+
+
+@pytest.mark.parametrize("workers, ordered", [(None, True), (2, True), (2, False)])
+def test_extract_many_matches_baseline(baseline: dict, tmp_path: Path, workers, ordered: bool):
+    names = list(DOCUMENTS)
+    path = tmp_path / "doc.txt"
+    path.write_text(DOCUMENTS["prose"], encoding="utf-8")
+    documents = [DOCUMENTS[name] for name in names] + [path, tmp_path / "missing.txt"]
+    expected = [baseline["extract_yaml_sections"][name] for name in names]
+    expected.append(baseline["extract_yaml_sections"]["prose"])
+
+    results = list(YAMLExtractor().extract_many(documents, workers=workers, chunksize=2, ordered=ordered))
+    if ordered:
+        assert [result["index"] for result in results] == list(range(len(documents)))
+    results.sort(key=lambda result: result["index"])
+    assert [[s["content"] for s in result["sections"]] for result in results[:-1]] == expected
+    assert results[-2]["source"] == str(path)
+    assert results[-1]["error"] and not results[-1]["found_yaml"]
+
+
+@pytest.mark.parametrize("engine", ["heuristic", "linear"])
+def test_each_region_is_parsed_once(monkeypatch, engine: str):
+    parsed = []
+    parse = yaml_extractor._parse_with_backend
+
+    def record(backend, text):
+        parsed.append(text)
+        return parse(backend, text)
+
+    monkeypatch.setattr(yaml_extractor, "_parse_with_backend", record)
+    extractor = YAMLExtractor(engine=engine)
+    sections = extractor.extract_yaml_sections(MIXED_MARKER_TEXT)
+    assert extractor.parse_calls == len(parsed) == len(set(parsed))
+    for body in ("name: test\nvalues: [1, 2]", "foo: bar", "baz: [1, 2]"):
+        assert sum(body in text for text in parsed) == 1
+    if engine == "linear":
+        # three marker regions and the two bare blocks
+        assert extractor.parse_calls == 5
+        assert [s["content"] for s in sections[-2:]] == [
+            {"server": {"host": "localhost", "port": 8080}}, {"database": {"name": "db"}}]
+
+
+@pytest.mark.parametrize("engine", ["heuristic", "linear"])
+def test_multi_document_stream_is_also_a_list(engine: str):
+    text = "Intro text.\n---\na: 1\n---\nb: [2]\n...\n---\nc: 3\n...\n"
+    sections = YAMLExtractor(engine=engine).extract_yaml_sections(text)
+    # same sections, in the same order, as the regex marker scan did
+    assert [s["content"] for s in sections] == [[{"a": 1}, {"b": [2]}], {"c": 3}, {"a": 1}, {"b": [2]}]
+    assert sections[0]["raw"] == "---\na: 1\n---\nb: [2]\n..."
+    assert text[sections[0]["start_pos"]:].startswith("---\na: 1")
+
+
+@pytest.mark.parametrize("engine", ["heuristic", "linear"])
+def test_plain_reference_is_parsed_once(reference_text: str, engine: str):
+    extractor = YAMLExtractor(engine=engine)
+    sections = extractor.extract_yaml_sections(reference_text)
+    assert [s["content"] for s in sections] == [yaml.safe_load(reference_text)]
+    assert extractor.parse_calls == 1
+
+
+# NOTE: nested content whose fingerprint is compared between interpreter runs
+FINGERPRINT_CONTENT = {"b": [1, "1", True, None, 1.5], "a": {"x": ["y", {"z": "ü"}]}}
+
+
+def test_fingerprint_is_stable_across_runs():
+    code = (
+        "from pythermodb_settings.references.yaml_extractor import YAMLExtractor\n"
+        f"print(YAMLExtractor().content_fingerprint({FINGERPRINT_CONTENT!r}))"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parents[1], env={**os.environ, "PYTHONHASHSEED": seed}).stdout.strip()
+        for seed in ("0", "1", "random")
+    }
+    assert digests == {YAMLExtractor().content_fingerprint(FINGERPRINT_CONTENT)}
+
+
+def test_fingerprint_tells_values_apart():
+    fingerprint = YAMLExtractor().content_fingerprint
+    scalars = [1, "1", True, 1.0, None, "null", "True", 0, False, ""]
+    assert len({fingerprint(value) for value in scalars}) == len(scalars)
+    assert fingerprint([1, 2]) != fingerprint([2, 1])
+    assert fingerprint([[1], 2]) != fingerprint([1, [2]])
+    assert fingerprint({"a": 1}) != fingerprint([["a", 1]])
+    # key order is part of the content, as it was for the str() comparison
+    assert fingerprint({"a": 1, "b": 2}) != fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": [1, {"b": "c"}]}) == fingerprint({"a": [1, {"b": "c"}]})
+
+
+@pytest.mark.parametrize("engine", ["heuristic", "linear"])
+def test_equal_content_is_deduplicated(engine: str):
+    text = (
+        "Intro text here.\n---\na: 1\nb: [x, y]\n...\nProse here between the two.\n"
+        "```yaml\na: 1\nb: [x, y]\n```\nMore prose here in between.\n"
+        "a: 1\nb: [x, y]\nClosing prose of the text.\n"
+    )
+    for fences in (True, False):
+        sections = YAMLExtractor(engine=engine, fences=fences).extract_yaml_sections(text)
+        assert [s["content"] for s in sections] == [{"a": 1, "b": ["x", "y"]}]